@@ -0,0 +1,260 @@
+"""ILI9341 benchmark suite.
+
+Times every Display primitive and prints one JSON object per case:
+
+    {"name": "fill_hrect 200x20", "pixels": 4000, "us": 1234,
+     "pixels_per_s": 3241491, "spi_bytes": 8022, "spi_bytes_per_s": 6500810,
+     "spi_transfers": 6, "peak_heap": 0}
+
+pixels is the nominal number of pixels the primitive covers, so the
+rates stay comparable between driver versions.  spi_bytes counts
+command and data bytes and spi_transfers the SPI writes they took (from
+Display.profile), and peak_heap the bytes
+allocated by a single call (MicroPython: with the collector paused,
+CPython: tracemalloc peak).
+
+Save a run to a file and pass it back as a baseline to get a speedup
+figure per case (new pixels/s over baseline pixels/s).
+
+On the board (baseline read from BASELINE_PATH if the file exists):
+    mpremote run apps/benchmark.py > baseline.json
+On the host, against the simulator in host/:
+    python3 apps/benchmark.py [--baseline FILE] [--save FILE] [--repeat N]
+"""
+from sys import implementation, path, argv
+from math import pi
+import gc
+import json
+
+if implementation.name != 'micropython':  # Host run: use the simulator
+    from os.path import abspath, dirname, join
+    _root = dirname(dirname(abspath(__file__)))
+    path[:0] = [join(_root, 'host'), join(_root, 'drivers')]
+
+from machine import Pin, SPI  # type: ignore # noqa: E402
+from micropython import const  # type: ignore # noqa: E402
+from ili9341 import Display, color565, ticks_us, ticks_diff  # noqa: E402
+
+DISPLAY_WIDTH = const(240)
+DISPLAY_HEIGHT = const(320)
+ROTATION = const(0)
+
+SPI1_BAUD_RATE = const(40000000)
+SPI1_SCK_PIN = const(14)
+SPI1_MOSI_PIN = const(13)
+DISPLAY_DC_PIN = const(2)
+DISPLAY_CS_PIN = const(15)
+DISPLAY_RST_PIN = const(0)
+
+BASELINE_PATH = 'bench_baseline.json'
+IMAGE_PATH = 'bench_image.raw'
+IMAGE_SIZE = const(120)
+REPEAT = const(3)
+
+TEXT = 'Benchmark 0123'
+
+
+def heap_start():
+    """Begin measuring allocations; returns a token for heap_peak."""
+    gc.collect()
+    if implementation.name == 'micropython':
+        gc.disable()
+        return gc.mem_alloc()
+    import tracemalloc
+    tracemalloc.start()
+    return 0
+
+
+def heap_peak(start):
+    """Return bytes allocated since heap_start."""
+    if implementation.name == 'micropython':
+        used = gc.mem_alloc() - start
+        gc.enable()
+        return used
+    import tracemalloc
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def cases(display):
+    """Return the benchmark cases as (name, pixels, function) tuples."""
+    w, h = display.width, display.height
+    cx, cy = w // 2, h // 2
+    red, green, blue = color565(255, 0, 0), color565(0, 255, 0), \
+        color565(0, 0, 255)
+    result = []
+
+    result.append(('clear', w * h, lambda: display.clear(blue)))
+
+    for rw, rh in ((200, 20), (20, 200), (100, 100), (w, 1), (1, h)):
+        result.append(('fill_hrect %dx%d' % (rw, rh), rw * rh,
+                       lambda rw=rw, rh=rh: display.fill_hrect(
+                           0, 0, rw, rh, red)))
+        result.append(('fill_vrect %dx%d' % (rw, rh), rw * rh,
+                       lambda rw=rw, rh=rh: display.fill_vrect(
+                           0, 0, rw, rh, green)))
+
+    reach = min(cx, cy) - 1
+    for octant, (dx, dy) in enumerate(((2, 1), (1, 2), (-1, 2), (-2, 1),
+                                       (-2, -1), (-1, -2), (1, -2), (2, -1))):
+        x2 = cx + dx * reach // 2
+        y2 = cy + dy * reach // 2
+        result.append(('draw_line octant=%d' % octant,
+                       max(abs(x2 - cx), abs(y2 - cy)) + 1,
+                       lambda x2=x2, y2=y2: display.draw_line(
+                           cx, cy, x2, y2, red)))
+
+    r = 50
+    result.append(('draw_circle r=%d' % r, int(2 * pi * r),
+                   lambda: display.draw_circle(cx, cy, r, green)))
+    result.append(('fill_circle r=%d' % r, int(pi * r * r),
+                   lambda: display.fill_circle(cx, cy, r, green)))
+    a, b = 80, 40
+    result.append(('draw_ellipse %dx%d' % (a, b), int(pi * (a + b)),
+                   lambda: display.draw_ellipse(cx, cy, a, b, blue)))
+    result.append(('fill_ellipse %dx%d' % (a, b), int(pi * a * b),
+                   lambda: display.fill_ellipse(cx, cy, a, b, blue)))
+    result.append(('fill_polygon sides=6 r=60', int(2.598 * 60 * 60),
+                   lambda: display.fill_polygon(6, cx, cy, 60, red)))
+    result.append(('fill_round_rectangle 200x100 r=20',
+                   200 * 100 - int((4 - pi) * 20 * 20),
+                   lambda: display.fill_round_rectangle(cx - 100, cy - 50,
+                                                        200, 100, 20, red)))
+    result.append(('fill_triangle 200x150', 200 * 150 // 2,
+                   lambda: display.fill_triangle(cx - 100, cy + 75, cx,
+                                                 cy - 75, cx + 100, cy + 75,
+                                                 green)))
+
+    for rotate in (0, 90, 180, 270):
+        result.append(('draw_text8x8 rotate=%d' % rotate, len(TEXT) * 64,
+                       lambda rotate=rotate: display.draw_text8x8(
+                           8, 8, TEXT, color565(255, 255, 255), blue,
+                           rotate)))
+
+    result.append(('draw_image %dx%d' % (IMAGE_SIZE, IMAGE_SIZE),
+                   IMAGE_SIZE * IMAGE_SIZE,
+                   lambda: display.draw_image(IMAGE_PATH, 0, 0,
+                                              IMAGE_SIZE, IMAGE_SIZE)))
+    sprite = bytearray(32 * 32 * 2)
+    for i in range(0, len(sprite), 2):
+        sprite[i] = i & 0xFF
+    result.append(('draw_sprite 32x32', 32 * 32,
+                   lambda: display.draw_sprite(sprite, cx, cy, 32, 32)))
+    return result
+
+
+def write_image():
+    """Create the raw RGB565 test image used by draw_image."""
+    row = bytearray(IMAGE_SIZE * 2)
+    with open(IMAGE_PATH, 'wb') as f:
+        for y in range(IMAGE_SIZE):
+            for x in range(IMAGE_SIZE):
+                c = color565(x * 2, y * 2, 128)
+                row[x * 2] = c >> 8
+                row[x * 2 + 1] = c & 0xFF
+            f.write(row)
+
+
+def load_baseline(filename):
+    """Read a saved run into a dict of name: record."""
+    baseline = {}
+    try:
+        with open(filename) as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith('{'):
+                    record = json.loads(line)
+                    baseline[record['name']] = record
+    except OSError:
+        pass
+    return baseline
+
+
+def run(display, repeat=REPEAT, baseline=None, out=None):
+    """Run every case and print (and optionally save) one JSON line each.
+
+    Args:
+        display (Display): Display to benchmark.
+        repeat (int): Timed calls per case; the fastest is reported.
+        baseline (dict): Previous results from load_baseline.
+        out (file): Also write the JSON lines here.
+    """
+    write_image()
+    for name, pixels, func in cases(display):
+        record = {'name': name, 'pixels': pixels}
+        try:
+            best = None
+            for _ in range(repeat):
+                gc.collect()
+                start = ticks_us()
+                func()
+                elapsed = ticks_diff(ticks_us(), start)
+                if best is None or elapsed < best:
+                    best = elapsed
+            display.profile()
+            heap = heap_start()
+            try:
+                func()
+            finally:
+                record['peak_heap'] = heap_peak(heap)
+            stats = display.stats()
+            display.profile(False)
+            spi_bytes = stats['commands'] + stats['data_bytes']
+            best = max(best, 1)
+            record['us'] = best
+            record['pixels_per_s'] = pixels * 1000000 // best
+            record['spi_bytes'] = spi_bytes
+            record['spi_bytes_per_s'] = spi_bytes * 1000000 // best
+            record['spi_transfers'] = stats['transfers']
+            if baseline and name in baseline and \
+                    baseline[name].get('pixels_per_s'):
+                record['speedup'] = round(record['pixels_per_s'] /
+                                          baseline[name]['pixels_per_s'], 3)
+        except MemoryError:
+            display.profile(False)
+            record['error'] = 'MemoryError'
+        line = json.dumps(record)
+        print(line)
+        if out is not None:
+            out.write(line + '\n')
+    try:
+        import os
+        os.remove(IMAGE_PATH)
+    except OSError:
+        pass
+
+
+def main():
+    """Set up the display (or the host simulator) and run the suite."""
+    baseline_path = BASELINE_PATH
+    save_path = None
+    repeat = REPEAT
+    args = argv[1:]
+    while args:
+        option = args.pop(0)
+        if option == '--baseline':
+            baseline_path = args.pop(0)
+        elif option == '--save':
+            save_path = args.pop(0)
+        elif option == '--repeat':
+            repeat = int(args.pop(0))
+    spi = SPI(1, baudrate=SPI1_BAUD_RATE, sck=Pin(SPI1_SCK_PIN),
+              mosi=Pin(SPI1_MOSI_PIN))
+    if implementation.name != 'micropython':
+        from ili9341_sim import Ili9341Sim
+        Ili9341Sim(spi, cs=Pin(DISPLAY_CS_PIN), dc=Pin(DISPLAY_DC_PIN),
+                   rst=Pin(DISPLAY_RST_PIN))
+    display = Display(spi, dc=Pin(DISPLAY_DC_PIN), cs=Pin(DISPLAY_CS_PIN),
+                      rst=Pin(DISPLAY_RST_PIN), width=DISPLAY_WIDTH,
+                      height=DISPLAY_HEIGHT, rotation=ROTATION)
+    out = open(save_path, 'w') if save_path else None
+    try:
+        run(display, repeat, load_baseline(baseline_path), out)
+    finally:
+        if out is not None:
+            out.close()
+    display.cleanup()
+
+
+main()
@@ -26,8 +26,8 @@ colors = {
 # bl_pin.on()
 # spi2 = SPI(2, baudrate=1000000, sck=Pin(25), mosi=Pin(32), miso=Pin(39))
 
-DISPLAY_WIDTH = const(240)
-DISPLAY_HEIGHT = const(320)
+DISPLAY_WIDTH = const(320)  # Landscape: rotation 90/270 swaps the sides
+DISPLAY_HEIGHT = const(240)
 ROTATION = const(90)
 
 SPI1_BAUD_RATE = const(40000000)
@@ -48,20 +48,6 @@ def test():
     spi = SPI(1, baudrate=SPI1_BAUD_RATE, sck=Pin(SPI1_SCK_PIN), mosi=Pin(SPI1_MOSI_PIN))
     display = Display(spi, dc=Pin(DISPLAY_DC_PIN), cs=Pin(DISPLAY_CS_PIN), rst=Pin(DISPLAY_RST_PIN), width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT, rotation=ROTATION)
 
-    # Calculate valid hlines parameters for display clear method
-    valid_hlines = []
-    for i in range(1, display.height):
-        if display.height % i == 0:
-            valid_hlines.append(i)
-    # Ensure only 13 entries, truncate or repeat the last one
-    valid_hlines = valid_hlines[:13]
-    if len(valid_hlines) < 13:
-        valid_hlines += [valid_hlines[-1]] * (13 - len(valid_hlines))
-    # Ensure only 13 entries, truncate or repeat the last one
-    valid_hlines = valid_hlines[:13]
-    if len(valid_hlines) < 13:
-        valid_hlines += [valid_hlines[-1]] * (13 - len(valid_hlines))
-
     print('Clearing to black...')
     start = ticks_ms()
     display.clear()
@@ -76,17 +62,24 @@ def test():
     print(f'Display cleared in {end - start} ms.')
     sleep(2)
 
-    for hlines, (color, rgb) in zip(valid_hlines, colors.items()):
+    display.profile()
+    for color, rgb in colors.items():
         gc.collect()
-        print(f'Clearing display to {color}, hlines={hlines}...')
+        print(f'Clearing display to {color}...')
         try:
             start = ticks_ms()
-            display.clear(hlines=hlines, color=color565(*rgb))
+            display.clear(color565(*rgb))
             end = ticks_ms()
             print(f'Display cleared in {end - start} ms.')
+            stats = display.stats()['primitives']['clear']
+            print(f"  {stats['commands']} commands, "
+                  f"{stats['data_bytes']} data bytes, "
+                  f"{stats['cs_toggles']} CS toggles, "
+                  f"{stats['alloc_bytes']} bytes allocated")
         except Exception as e:
             print(e)
         sleep(1)
+    display.profile(False)
 
     sleep(5)
     display.cleanup()
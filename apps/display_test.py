@@ -4,8 +4,8 @@ from xpt2046 import Touch
 from machine import idle, Pin, SPI
 
 # Display configuration
-DISPLAY_WIDTH = const(240)
-DISPLAY_HEIGHT = const(320)
+DISPLAY_WIDTH = const(320)  # Landscape: rotation 90/270 swaps the sides
+DISPLAY_HEIGHT = const(240)
 ROTATION = const(270)  # Matches your working example
 
 SPI1_BAUD_RATE = const(40000000)
@@ -31,15 +31,12 @@ class Demo:
 
     def touchscreen_press(self, x, y):
         print("Touch at: {},{}".format(x, y))  # Confirm touch in console
-        
-        # Flip Y-coordinates if necessary to match orientation
-        y_flipped = (self.display.height - 1) - y
 
         # Clear a small rectangle before updating text (slightly larger for visibility)
         self.display.fill_rectangle(0, 0, self.display.width, 20, color565(0, 0, 0))
 
         # Draw touch coordinates on the screen
-        self.display.draw_text8x8(10, 5, "X:{:03d} Y:{:03d}".format(x, y_flipped), color565(255, 255, 255))
+        self.display.draw_text8x8(10, 5, "X:{:03d} Y:{:03d}".format(x, y), color565(255, 255, 255))
 
 def test():
     # Set up SPI for display
@@ -71,17 +68,17 @@ def test():
         demo.touchscreen_press(x, y)
     
     # Create Touch instance
-    touch = Touch(spi_touch, cs=Pin(TOUCH_CS_PIN), int_pin=Pin(TOUCH_INT_PIN), int_handler=touchscreen_press)
+    touch = Touch(spi_touch, cs=Pin(TOUCH_CS_PIN), int_pin=Pin(TOUCH_INT_PIN), int_handler=touchscreen_press,
+                  width=display.width, height=display.height, rotation=ROTATION, calibration='touch_cal.json')
     
     # Create Demo instance
     global demo
     demo = Demo(display, touch)
     
-    # Poll for touch events
+    # Wait for touch events
     try:
         while True:
-            touch.get_touch()
-            idle()
+            idle()  # Touches arrive through the interrupt handler
     except KeyboardInterrupt:
         print("\nCtrl-C pressed. Cleaning up and exiting...")
     finally:
@@ -5,8 +5,8 @@ import os
 from ili9341 import Display, color565
 from xpt2046 import Touch
 
-DISPLAY_WIDTH = const(240)
-DISPLAY_HEIGHT = const(320)
+DISPLAY_WIDTH = const(320)  # Landscape: rotation 90/270 swaps the sides
+DISPLAY_HEIGHT = const(240)
 ROTATION = const(90)
 
 SPI1_BAUD_RATE = const(40000000)
@@ -76,17 +76,19 @@ print(lightsensor.read_uv())
 
 
 # Read touch screen
-touch_spi = SPI(1, baudrate=1000000, sck=Pin(25), mosi=Pin(32), miso=Pin(39))
+# Touch has its own pins, so it needs its own bus: SPI(1) is the display's
+touch_spi = SPI(2, baudrate=SPI2_BAUD_RATE, sck=Pin(SPI2_SCK_PIN), mosi=Pin(SPI2_MOSI_PIN), miso=Pin(SPI2_MISO_PIN))
 
 def touchscreen_press(x, y):
     print("Touch at " + str(x) + "," + str(y))
 
-touch = Touch(touch_spi, cs=Pin(33), int_pin=Pin(36), int_handler=touchscreen_press)
+touch = Touch(touch_spi, cs=Pin(33), int_pin=Pin(36), int_handler=touchscreen_press,
+              width=display.width, height=display.height, rotation=ROTATION, calibration='touch_cal.json')
 
 # loop to wait for touchscreen test
 try:
     while True:
-        touch.get_touch()
+        idle()  # Touches arrive through the interrupt handler
 
 except KeyboardInterrupt:
     print("\nCtrl-C pressed.  Cleaning up and exiting...")
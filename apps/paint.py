@@ -4,9 +4,10 @@ import time
 # https://github.com/rdagger/micropython-ili9341
 from ili9341 import Display, color565
 from xpt2046 import Touch
+from gestures import StrokeTracker, HOLD
 
-DISPLAY_WIDTH = const(240)
-DISPLAY_HEIGHT = const(320)
+DISPLAY_WIDTH = const(320)  # Landscape: rotation 90/270 swaps the sides
+DISPLAY_HEIGHT = const(240)
 ROTATION = const(90)
 
 SPI1_BAUD_RATE = const(40000000)
@@ -43,96 +44,77 @@ touch_spi = SPI(2, baudrate=SPI2_BAUD_RATE, sck=Pin(SPI2_SCK_PIN), mosi=Pin(SPI2
 background_color = color565(0, 0, 0)
 foreground_color = color565(255, 255, 255)
 
+PALETTE = [
+    color565(255, 0, 0),    # Red
+    color565(0, 255, 0),    # Green
+    color565(0, 0, 255),    # Blue
+    color565(255, 255, 0),  # Yellow
+    color565(255, 0, 255),  # Magenta
+    color565(0, 255, 255),  # Cyan
+    color565(255, 255, 255),  # White
+    color565(0, 0, 0),  # Black (eraser)
+]
+SWATCH_SIZE = 20
+SWATCH_GAP = 5
+
+
 class Paint:
     def __init__(self, display, touch_spi):
         self.display = display
-        self.touch = Touch(touch_spi, cs=Pin(33), int_pin=Pin(36), int_handler=self.touchscreen_press)
-        self.color = color565(255, 0, 0)  # Default color: Red
+        self.touch = Touch(touch_spi, cs=Pin(33), width=display.width, height=display.height,
+                           rotation=ROTATION, calibration='touch_cal.json')
+        # Strokes come in as segments, each drawn as one thick line
+        self.tracker = StrokeTracker(self.touch, on_move=self.touchscreen_move, on_down=self.touchscreen_press,
+                                     on_gesture=self.touchscreen_gesture, interval_ms=15)
+        self.color = PALETTE[0]  # Default color: Red
         self.brush_size = 5
-        # self.clear_screen()
-        # self.color_palette()
+        self.stroke = False  # Current stroke is painting, not picking a color
+        self.clear_screen()
 
     def clear_screen(self):
         self.display.clear(background_color)
+        self.color_palette()
 
     def color_palette(self):
-        colors = [
-            color565(255, 0, 0),    # Red
-            color565(0, 255, 0),    # Green
-            color565(0, 0, 255),    # Blue
-            color565(255, 255, 0),  # Yellow
-            color565(255, 0, 255),  # Magenta
-            color565(0, 255, 255),  # Cyan
-            color565(0, 0, 0), # black
-        ]
         x = 10
-        y = 10
-        size = 20
-        for color in colors:
-            self.display.fill_rectangle(x, y, size, size, color)
-            x += size + 5
+        for color in PALETTE:
+            self.display.fill_rectangle(x, 10, SWATCH_SIZE, SWATCH_SIZE, color)
+            self.display.draw_rectangle(x, 10, SWATCH_SIZE, SWATCH_SIZE, foreground_color)
+            x += SWATCH_SIZE + SWATCH_GAP
+
+    def in_palette(self, x, y):
+        return 10 <= y < 10 + SWATCH_SIZE + SWATCH_GAP and 10 <= x < 10 + len(PALETTE) * (SWATCH_SIZE + SWATCH_GAP)
 
     def touchscreen_press(self, x, y):
         print("Touch at " + str(x) + "," + str(y))
-        if 10 <= x <= 165 and 10 <= y <= 30: #color palette area
-            colors = [
-                color565(255, 0, 0),
-                color565(0, 255, 0),
-                color565(0, 0, 255),
-                color565(255, 255, 0),
-                color565(255, 0, 255),
-                color565(0, 255, 255),
-                color565(0,0,0)
-            ]
-            color_index = (x-10)//25
-            if 0<= color_index < len(colors):
-                # self.color = colors[color_index]
-                pass
+        self.stroke = not self.in_palette(x, y)
+        if self.stroke:
+            self.draw(x, y, x, y)
         else:
-            # print("self.draw()")
-            self.draw(x, y)
-            pass
-        pass
+            self.color = PALETTE[(x - 10) // (SWATCH_SIZE + SWATCH_GAP)]
+
+    def touchscreen_move(self, x1, y1, x2, y2):
+        if self.stroke:
+            self.draw(x1, y1, x2, y2)
+
+    def touchscreen_gesture(self, gesture, x, y):
+        print("Gesture " + gesture + " at " + str(x) + "," + str(y))
+        if gesture == HOLD and self.in_palette(x, y):
+            self.clear_screen()  # Hold a swatch to clear the canvas
+
+    def draw(self, x1, y1, x2, y2):
+        self.display.draw_thick_line(x1, y1, x2, y2, self.brush_size * 2, self.color)
 
-    def touchscreen_hold(self, x, y):
-        print("Touch at " + str(x) + "," + str(y))
-        self.draw(x, y)
-        pass
-
-    def draw(self, x, y):
-        # self.clear_screen()
-        self.display.fill_circle(self.display.width - x, y, self.brush_size, foreground_color)
-        # self.display.fill_rectangle(self.display.width - x, y, self.brush_size, self.brush_size, foreground_color)
-        
     def update(self):
-        # (x, y) = self.touch.get_touch()
-        # self.draw(x, y)
-
-        if self.touch:
-            (x, y) = self.touch.raw_touch()
-            # buff = self.touch.get_touch()
-            print("Buffer at " + str(x) + "," + str(y))
-
-            # if buff is not None:
-            #     # x, y = self.normalize(*buff)
-            #     # print("buff " + str(buff))
-            #     print("Buffer at " + str(x) + "," + str(y))
-                
-            #     self.draw(x, y)
-        pass
-
-    def run(self):
-        pass
+        self.tracker.update()
+
+
 try:
     paint_app = Paint(display, touch_spi)
-    # paint_app.run()
-    # paint_app.draw()
     while True:
-        # paint_app.update()
-        # self.touch.get_touch()
-        time.sleep_ms(1)
-        # idle()
+        paint_app.update()
+        idle()
 except KeyboardInterrupt:
     print("\nCtrl-C pressed. Cleaning up and exiting...")
 finally:
-    display.cleanup()
\ No newline at end of file
+    display.cleanup()
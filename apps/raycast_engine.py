@@ -1,11 +1,11 @@
+import asyncio
 import math
-import time
 from ili9341 import Display, color565
 from machine import Pin, SPI
 
 # Display Configuration
-DISPLAY_WIDTH = const(240)
-DISPLAY_HEIGHT = const(320)
+DISPLAY_WIDTH = const(320)  # Landscape: rotation 90/270 swaps the sides
+DISPLAY_HEIGHT = const(240)
 ROTATION = const(90)
 
 # SPI Configuration
@@ -93,7 +93,7 @@ class Raycaster:
 
         return perp_wall_dist
 
-    def render(self):
+    async def render(self):
         for x in range(DISPLAY_WIDTH):
             camera_x = 2 * x / DISPLAY_WIDTH - 1
             ray_angle = self.player_angle + FOV / 2 * camera_x
@@ -106,8 +106,9 @@ class Raycaster:
 
             color = color565(255, 255, 255)  # White wall for now
 
-            for y in range(draw_start, draw_end + 1):
-                self.display.draw_pixel(x, y, color)
+            self.display.draw_vline(x, draw_start, draw_end - draw_start + 1, color)
+            if x & 15 == 15:
+                await asyncio.sleep(0)  # Let the previous frame's flush progress
 
     def update(self):
         keys = self.get_keys() #replace with your key handling.
@@ -134,14 +135,22 @@ def main():
     bl_pin.on()
 
     raycaster = Raycaster(display)
+    asyncio.run(run(display, raycaster))
 
+async def run(display, raycaster):
+    # Record the next frame while the previous one is still being sent
+    display.framebuffer(band_height=16)
+    flushing = None
     while True:
         raycaster.update()
         # display.fill(color565(0, 0, 0)) #clear screen
         # display.fill_rectangle(0, 0, display.width, display.height, color565(0, 0, 0))
         display.clear(color565(0, 0, 0))
-        raycaster.render()
-        time.sleep_ms(30) #adjust to change speed.
+        await raycaster.render()
+        if flushing is not None:
+            await flushing
+        flushing = asyncio.create_task(display.flush())
+        await asyncio.sleep_ms(30) #adjust to change speed.
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,8 +3,8 @@ import time
 from ili9341 import Display, color565
 from machine import Pin, SPI, mem32
 
-DISPLAY_WIDTH = const(240)
-DISPLAY_HEIGHT = const(320)
+DISPLAY_WIDTH = const(320)  # Landscape: rotation 90/270 swaps the sides
+DISPLAY_HEIGHT = const(240)
 ROTATION = const(90)
 
 SPI1_BAUD_RATE = const(40000000)
@@ -37,6 +37,16 @@ class CubeDemo:
             (4, 5), (5, 6), (6, 7), (7, 4),
             (0, 4), (1, 5), (2, 6), (3, 7)
         ]
+        # Faces wound so that a face turned towards the viewer projects
+        # clockwise on screen, with a color for each
+        self.faces = [
+            ((0, 1, 2, 3), color565(200, 40, 40)),
+            ((4, 7, 6, 5), color565(40, 200, 40)),
+            ((0, 4, 5, 1), color565(40, 40, 200)),
+            ((3, 2, 6, 7), color565(200, 200, 40)),
+            ((0, 3, 7, 4), color565(200, 40, 200)),
+            ((1, 5, 6, 2), color565(40, 200, 200))
+        ]
         self.projected = [(0, 0)] * 8  # Pre-allocate projected points
 
     def rotate_point(self, x, y, z, cos_a, sin_a):
@@ -56,13 +66,24 @@ class CubeDemo:
         for i, (x, y, z) in enumerate(self.vertices):
             self.projected[i] = self.project(*self.rotate_point(x, y, z, cos_a, sin_a))
 
+        # Solid faces: only those facing the viewer (back-face culling)
+        p = self.projected
+        for face, color in self.faces:
+            points = [p[i] for i in face]
+            (x0, y0), (x1, y1), (x2, y2) = points[0], points[1], points[2]
+            if (x1 - x0) * (y2 - y1) - (y1 - y0) * (x2 - x1) > 0:
+                self.display.fill_poly(points, color)
+
         for start, end in self.edges:
             self.display.draw_line(*self.projected[start], *self.projected[end], color565(255, 255, 255))
 
     def run(self):
+        # Compose each frame off-screen in 16-line bands to avoid flicker
+        self.display.framebuffer(band_height=16)
         while True:
             self.display.fill_rectangle(0, 0, self.display.width, self.display.height, color565(0, 0, 0))
             self.draw_cube()
+            self.display.show()
             self.angle += 0.05
             time.sleep_ms(10)
 
@@ -6,7 +6,7 @@ import random
 
 DISPLAY_WIDTH = const(240)
 DISPLAY_HEIGHT = const(320)
-ROTATION = const(270)
+ROTATION = const(0)  # The board and control strip are laid out in portrait
 
 SPI1_BAUD_RATE = const(40000000)
 SPI1_SCK_PIN = const(14)
@@ -50,8 +50,8 @@ class Tetris:
         self.BOARD_HEIGHT = (display.height - self.CONTROL_HEIGHT) // self.BLOCK_SIZE
 
         self.touch = Touch(spi2, cs=Pin(33), int_pin=Pin(36),
-                           int_handler=self.touchscreen_press)
-        self.touch_event = False
+                           width=display.width, height=display.height,
+                           rotation=ROTATION, calibration='touch_cal.json')
         self.reset_game()
 
     def reset_game(self):
@@ -67,25 +67,17 @@ class Tetris:
         # start roughly centered
         return {'shape': shape, 'x': self.BOARD_WIDTH // 2 - 1, 'y': 0, 'color': color}
 
-    def transform_coordinates(self, x, y):
-        # For board drawing only. Controls will be drawn using raw coordinates.
-        # if self.portrait:
-        #     return y, self.display.width - x - self.BLOCK_SIZE
-        return x, y
-
     def draw_board(self):
         # Draw only the game board area (above the control area)
         for y in range(self.BOARD_HEIGHT):
             for x in range(self.BOARD_WIDTH):
-                tx, ty = self.transform_coordinates(x * self.BLOCK_SIZE, y * self.BLOCK_SIZE)
-                self.display.fill_rectangle(tx, ty, self.BLOCK_SIZE, self.BLOCK_SIZE, self.COLORS[self.board[y][x]])
+                self.display.fill_rectangle(x * self.BLOCK_SIZE, y * self.BLOCK_SIZE, self.BLOCK_SIZE, self.BLOCK_SIZE, self.COLORS[self.board[y][x]])
 
     def draw_piece(self, piece, clear=False):
         color = self.COLORS[0] if clear else self.COLORS[piece['color']]
         for px, py in piece['shape']:
             x, y = (piece['x'] + px) * self.BLOCK_SIZE, (piece['y'] + py) * self.BLOCK_SIZE
-            tx, ty = self.transform_coordinates(x, y)
-            self.display.fill_rectangle(tx, ty, self.BLOCK_SIZE, self.BLOCK_SIZE, color)
+            self.display.fill_rectangle(x, y, self.BLOCK_SIZE, self.BLOCK_SIZE, color)
 
     def can_move(self, piece, dx, dy):
         for px, py in piece['shape']:
@@ -123,17 +115,13 @@ class Tetris:
         # Redraw control buttons on top of the board
         self.draw_controls()
 
-    def touchscreen_press(self, pin, event):
-        self.touch_event = True
-
-
     def handle_touch_controls(self):
-        if self.touch_event:
-            # Replace read() with the correct method, e.g., get_touch()
-            point = self.touch.get_touch()  
-            if point is not None:
-                self.process_touch(*point)
-            self.touch_event = False
+        # Presses are queued by the touch interrupt while the board is drawn
+        event = self.touch.get_event()
+        while event is not None:
+            if event[2]:  # Pen down; pen-up events carry zero pressure
+                self.process_touch(event[0], event[1])
+            event = self.touch.get_event()
 
 
     def process_touch(self, x, y):
@@ -193,7 +181,7 @@ class Tetris:
         self.display.fill_rectangle(0, 0, self.display.width, self.display.height, color565(0, 0, 0))
         self.draw_text("TETRIS", x=self.display.width // 2 - 40, y=self.display.height // 4, color=color565(255, 255, 255), size=3)
         self.draw_text("Tap to start", x=self.display.width // 2 - 70, y=self.display.height // 2 + 20, color=color565(255, 255, 255), size=2)
-        while not self.touch_event:
+        while self.touch.get_event() is None:
             time.sleep(0.1)
 
     def draw_text(self, text, x=None, y=None, color=color565(255, 255, 255), font=None, size=2):
@@ -201,8 +189,7 @@ class Tetris:
             x = self.display.width // 2 - len(text) * 3
         if y is None:
             y = self.display.height // 2
-        tx, ty = self.transform_coordinates(x, y)
-        self.display.draw_text8x8(tx, ty, text, color)
+        self.display.draw_text8x8(x, y, text, color)
 
 def test():
     spi = SPI(1, baudrate=SPI1_BAUD_RATE, sck=Pin(SPI1_SCK_PIN), mosi=Pin(SPI1_MOSI_PIN))
@@ -216,7 +203,7 @@ def test():
     game.draw_board()
 
     while True:
-        game.touch_event = False
+        game.touch.clear_events()
         game.show_title_screen()
         game.reset_game()
         game.draw_board()
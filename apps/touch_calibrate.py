@@ -0,0 +1,58 @@
+"""Touch screen calibration.
+
+Touch each crosshair in turn; the result is saved to touch_cal.json,
+which the other apps load with Touch(..., calibration='touch_cal.json').
+Afterwards, touches are drawn as dots to check the fit.
+"""
+from micropython import const
+from ili9341 import Display, color565
+from xpt2046 import Touch
+from machine import idle, Pin, SPI
+
+# Display configuration
+DISPLAY_WIDTH = const(240)
+DISPLAY_HEIGHT = const(320)
+ROTATION = const(0)
+CALIBRATION_FILE = 'touch_cal.json'
+
+SPI1_BAUD_RATE = const(40000000)
+SPI1_SCK_PIN = const(14)
+SPI1_MOSI_PIN = const(13)
+DISPLAY_DC_PIN = const(2)
+DISPLAY_CS_PIN = const(15)
+DISPLAY_RST_PIN = const(0)
+BL_PIN = const(21)
+
+# Touch configuration
+TOUCH_BAUD_RATE = const(1000000)
+TOUCH_SCK_PIN = const(25)
+TOUCH_MOSI_PIN = const(32)
+TOUCH_MISO_PIN = const(39)
+TOUCH_CS_PIN = const(33)
+
+
+def test():
+    spi_display = SPI(1, baudrate=SPI1_BAUD_RATE, sck=Pin(SPI1_SCK_PIN), mosi=Pin(SPI1_MOSI_PIN))
+    display = Display(spi_display, dc=Pin(DISPLAY_DC_PIN), cs=Pin(DISPLAY_CS_PIN), rst=Pin(DISPLAY_RST_PIN),
+                      width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT, rotation=ROTATION)
+    Pin(BL_PIN, Pin.OUT).on()
+
+    spi_touch = SPI(2, baudrate=TOUCH_BAUD_RATE, sck=Pin(TOUCH_SCK_PIN), mosi=Pin(TOUCH_MOSI_PIN), miso=Pin(TOUCH_MISO_PIN))
+    touch = Touch(spi_touch, cs=Pin(TOUCH_CS_PIN), width=display.width, height=display.height, rotation=ROTATION)
+
+    matrix = touch.calibrate(display, CALIBRATION_FILE)
+    print("Saved {}: {}".format(CALIBRATION_FILE, matrix))
+    display.draw_text8x8(display.width // 2 - 40, display.height // 2 - 4, "Touch test", color565(255, 255, 255))
+
+    try:
+        while True:
+            point = touch.poll()
+            if point is not None:
+                display.fill_circle(point[0], point[1], 2, color565(0, 255, 0))
+            idle()
+    except KeyboardInterrupt:
+        print("\nCtrl-C pressed. Cleaning up and exiting...")
+    finally:
+        display.cleanup()
+
+test()
@@ -0,0 +1,136 @@
+"""Scrolling text console module."""
+
+
+class ScrollingConsole(object):
+    """Text console scrolled by the ILI9341's hardware vertical scroll.
+
+    Lines are kept in a ring of text rows in display memory.  Adding a
+    line draws only that row and moves the scroll start address, so a
+    new line costs one row of SPI traffic however full the screen is.
+    Rows above header and below footer stay fixed.
+    """
+
+    def __init__(self, display, font=None, color=0xFFFF, background=0,
+                 header=0, footer=0, line_height=None, spacing=1):
+        """Initialize console and clear its scroll area.
+
+        Args:
+            display (Display): Display in portrait orientation (hardware
+                scrolling runs along the panel's long side).
+            font (Font): Font for draw_text (default: None = built-in
+                8x8 font).
+            color (int): RGB565 text color.
+            background (int): RGB565 background color (default: black)
+            header (int): Rows kept fixed at the top.
+            footer (int): Rows kept fixed at the bottom.
+            line_height (int): Rows per text line (default: font height).
+            spacing (int): Pixels between letters for draw_text.
+        """
+        if display.rotation & 0x20:
+            raise ValueError('Console needs a portrait (0 or 180) rotation.')
+        if display.is_buffered():
+            raise ValueError('Console draws straight to the display.')
+        self.display = display
+        self.font = font
+        self.color = color
+        self.background = background
+        self.spacing = spacing
+        self.char_height = 8 if font is None else font.height
+        self.line_height = line_height or self.char_height
+        self.lines = (display.height - header - footer) // self.line_height
+        if self.lines < 1:
+            raise ValueError('No room for a line between header and footer.')
+        self.header = header
+        self.area = self.lines * self.line_height
+        # Rows left over from a partial line join the footer
+        self.footer = display.height - header - self.area
+        # Memory rows run bottom to top when MADCTL MY is set, which puts
+        # the header in the bottom fixed area and reverses the scroll
+        self.flipped = bool(display.rotation & 0x80)
+        if self.flipped:
+            display.set_scroll(self.footer, header)
+        else:
+            display.set_scroll(header, self.footer)
+        self.clear()
+
+    def clear(self):
+        """Blank the scroll area and start again from its top line."""
+        self.top = 0  # Ring slot shown on the first line
+        self.count = 0  # Lines written so far, up to lines
+        self.display.fill_hrect(0, self.header, self.display.width,
+                                self.area, self.background)
+        self._scroll()
+
+    def close(self):
+        """Restore the whole screen as one unscrolled area."""
+        self.display.set_scroll(0, 0)
+        self.display.scroll(0)
+
+    def _draw_line(self, slot, text):
+        """Draw text into a ring slot, padding the row with background."""
+        display = self.display
+        y = self.header + slot * self.line_height
+        width = 0
+        if text:
+            if self.font is None:
+                display.draw_text8x8(0, y, text, self.color,
+                                     self.background)
+                width = len(text) * 8
+            else:
+                display.draw_text(0, y, text, self.font, self.color,
+                                  self.background, spacing=self.spacing)
+                width = self.font.measure_text(text, self.spacing)
+        width = min(width, display.width)
+        if width < display.width:
+            display.fill_hrect(width, y, display.width - width,
+                               self.char_height, self.background)
+        if self.line_height > self.char_height:
+            display.fill_hrect(0, y + self.char_height, display.width,
+                               self.line_height - self.char_height,
+                               self.background)
+
+    def _scroll(self):
+        """Point the scroll start address at the top slot."""
+        offset = self.top * self.line_height
+        if self.flipped:
+            self.display.scroll(self.footer + (self.area - offset) %
+                                self.area)
+        else:
+            self.display.scroll(self.header + offset)
+
+    def _wrap(self, line):
+        """Split a line into pieces that fit the display width."""
+        width = self.display.width
+        if self.font is None:
+            columns = width // 8
+            return [line[i:i + columns]
+                    for i in range(0, len(line), columns)] or ['']
+        pieces = []
+        start = 0
+        used = 0
+        for i, letter in enumerate(line):
+            w = self.font.get_width(letter) + self.spacing
+            if used + w > width and i > start:
+                pieces.append(line[start:i])
+                start = i
+                used = 0
+            used += w
+        pieces.append(line[start:])
+        return pieces
+
+    def write(self, text):
+        """Add text, one line per newline; long lines wrap.
+
+        Args:
+            text (string): Text to add.
+        """
+        for line in text.split('\n'):
+            for piece in self._wrap(line):
+                if self.count < self.lines:
+                    self._draw_line(self.count, piece)
+                    self.count += 1
+                else:
+                    # Overwrite the oldest line and scroll it to the bottom
+                    self._draw_line(self.top, piece)
+                    self.top = (self.top + 1) % self.lines
+                    self._scroll()
@@ -0,0 +1,200 @@
+"""Compact bitmap font module.
+
+Reads the font files written by tools/font_converter.py.  A file holds
+a 12 byte header, an index table and packed glyph rows:
+
+    header  '<4sBBBxHH': b'TFNT', version (1), bits per pixel (1 or 4),
+            height, first character code, number of characters
+    index   count x '<I': glyph data offset (low 24 bits) and width in
+            pixels (high 8 bits); width 0 marks a missing character
+    glyphs  height rows per glyph, each row padded to a whole byte,
+            leftmost pixel in the most significant bits
+
+Only the header and index are kept in RAM.  Glyph rows are read with
+seek/readinto into a preallocated buffer (or sliced straight out of
+frozen bytes) and expanded to RGB565 through a blend table that is
+rebuilt only when the colors change.
+"""
+from struct import unpack_from
+from sys import implementation
+
+MAGIC = b'TFNT'
+VERSION = 1
+HEADER = '<4sBBBxHH'
+HEADER_SIZE = 12
+
+
+def _expand(dst, src, offset, w, h, bpp, lut, landscape):
+    """Expand packed glyph rows to RGB565 pixels through lut.
+
+    Args:
+        dst (bytearray): Destination, w * h * 2 bytes.
+        src (buffer): Packed glyph rows starting at offset.
+        offset (int): Index of the glyph's first byte in src.
+        w, h (int): Glyph size.
+        bpp (int): Bits per pixel (1 or 4).
+        lut (bytearray): Big-endian RGB565 color for each pixel value.
+        landscape (bool): Rotate 90 degrees counterclockwise (h x w).
+    """
+    row_bytes = (w * bpp + 7) >> 3
+    mask = (1 << bpp) - 1
+    for r in range(h):
+        s = offset + r * row_bytes
+        for c in range(w):
+            bit = c * bpp
+            v = ((src[s + (bit >> 3)] >> (8 - bpp - (bit & 7))) & mask) << 1
+            if landscape:
+                d = ((w - 1 - c) * h + r) << 1
+            else:
+                d = (r * w + c) << 1
+            dst[d] = lut[v]
+            dst[d + 1] = lut[v + 1]
+
+
+if implementation.name == 'micropython':
+    import micropython  # type: ignore
+
+    @micropython.viper
+    def _expand(dst, src, offset: int, w: int, h: int, bpp: int, lut,
+                landscape: bool):
+        d8 = ptr8(dst)  # type: ignore # noqa: F821
+        s8 = ptr8(src)  # type: ignore # noqa: F821
+        t8 = ptr8(lut)  # type: ignore # noqa: F821
+        row_bytes = (w * bpp + 7) >> 3
+        mask = (1 << bpp) - 1
+        for r in range(h):
+            s = offset + r * row_bytes
+            for c in range(w):
+                bit = c * bpp
+                v = ((s8[s + (bit >> 3)] >> (8 - bpp - (bit & 7))) &
+                     mask) << 1
+                if landscape:
+                    d = ((w - 1 - c) * h + r) << 1
+                else:
+                    d = (r * w + c) << 1
+                d8[d] = t8[v]
+                d8[d + 1] = t8[v + 1]
+
+
+class Font(object):
+    """Bitmap font with lazily loaded 1 or 4 bits per pixel glyphs.
+
+    Drop-in for the XglcdFont objects Display.draw_text expects.
+    """
+
+    def __init__(self, source):
+        """Initialize font.
+
+        Args:
+            source (string or bytes): Path of a font file, or the file's
+                contents (e.g. a bytes constant in a frozen module).
+        """
+        if isinstance(source, str):
+            self._file = open(source, 'rb')
+            header = self._file.read(HEADER_SIZE)
+            self._data = None
+        else:
+            self._file = None
+            self._data = memoryview(source)
+            header = self._data[:HEADER_SIZE]
+        magic, version, self.bpp, self.height, self.first, self.count = \
+            unpack_from(HEADER, header)
+        if magic != MAGIC or version != VERSION or self.bpp not in (1, 4):
+            self.close()
+            raise ValueError('Unsupported font file.')
+        size = self.count * 4
+        if self._file is None:
+            self._index = self._data[HEADER_SIZE:HEADER_SIZE + size]
+        else:
+            self._index = self._file.read(size)
+        self._glyphs = HEADER_SIZE + size
+        self.max_width = 0
+        for i in range(self.count):
+            self.max_width = max(self.max_width, self._index[i * 4 + 3])
+        if self._file is not None:
+            self._bits = bytearray(self._row_bytes(self.max_width) *
+                                   self.height)
+            self._bits_mv = memoryview(self._bits)
+        self._buf = bytearray(self.max_width * self.height * 2)
+        self._buf_mv = memoryview(self._buf)
+        self._lut = bytearray(32)
+        self._lut_colors = None
+
+    def _blend(self, color, background):
+        """Fill the lookup table with fg/bg blends for every pixel value."""
+        levels = (1 << self.bpp) - 1
+        lut = self._lut
+        for v in range(levels + 1):
+            c = 0
+            for mask in (0xF800, 0x07E0, 0x001F):  # Blend each field
+                c |= ((color & mask) * v + (background & mask) *
+                      (levels - v) + (mask & -mask) * levels // 2) \
+                    // levels & mask
+            lut[v * 2] = c >> 8
+            lut[v * 2 + 1] = c & 0xFF
+        self._lut_colors = (color, background)
+
+    def _row_bytes(self, w):
+        return (w * self.bpp + 7) >> 3
+
+    def close(self):
+        """Close the font file (fonts read from bytes need no cleanup)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def get_letter(self, letter, color, background=0, landscape=False):
+        """Render a letter to RGB565.
+
+        Args:
+            letter (string): Letter to render.
+            color (int): RGB565 color value.
+            background (int): RGB565 background color (default: black)
+            landscape (bool): Orientation (default: False = portrait)
+        Returns:
+            (buffer, width, height).  The buffer is reused by the next
+            call and is h x w pixels in landscape.  Width is 0 for
+            letters missing from the font.
+        """
+        i = ord(letter) - self.first
+        if i < 0 or i >= self.count:
+            return self._buf_mv[:0], 0, self.height
+        entry = self._index[i * 4] | (self._index[i * 4 + 1] << 8) | \
+            (self._index[i * 4 + 2] << 16)
+        w = self._index[i * 4 + 3]
+        h = self.height
+        if w == 0:
+            return self._buf_mv[:0], 0, h
+        if self._lut_colors != (color, background):
+            self._blend(color, background)
+        if self._file is None:
+            src = self._data
+            offset = self._glyphs + entry
+        else:
+            n = self._row_bytes(w) * h
+            self._file.seek(self._glyphs + entry)
+            self._file.readinto(self._bits_mv[:n])
+            src = self._bits
+            offset = 0
+        _expand(self._buf, src, offset, w, h, self.bpp, self._lut,
+                landscape)
+        return self._buf_mv[:w * h * 2], w, h
+
+    def get_width(self, letter):
+        """Return a letter's width in pixels (0 if missing)."""
+        i = ord(letter) - self.first
+        if i < 0 or i >= self.count:
+            return 0
+        return self._index[i * 4 + 3]
+
+    def measure_text(self, text, spacing=1):
+        """Return the width of text as draw_text would lay it out.
+
+        Args:
+            text (string): Text to measure.
+            spacing (int): Pixels between letters (default: 1)
+        """
+        width = 0
+        for letter in text:
+            width += self.get_width(letter) + spacing
+        return width
@@ -0,0 +1,122 @@
+"""Touch stroke and gesture module."""
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:  # CPython (host testing)
+    from time import perf_counter
+
+    def ticks_ms():
+        return int(perf_counter() * 1000)
+
+    def ticks_diff(end, start):
+        return end - start
+
+# Gestures passed to on_gesture
+TAP = 'tap'
+HOLD = 'hold'
+SWIPE_LEFT = 'swipe_left'
+SWIPE_RIGHT = 'swipe_right'
+SWIPE_UP = 'swipe_up'
+SWIPE_DOWN = 'swipe_down'
+
+
+class StrokeTracker(object):
+    """Follow the pen through Touch.poll and report strokes and gestures.
+
+    Call update from the main loop.  While the pen is down, on_move gets
+    the segment from the last reported point to the new one, at most
+    once per interval_ms; drawing each segment as a thick line joins the
+    readings into a continuous stroke.  When the pen lifts, the stroke
+    is classified as a tap or a swipe; a hold is reported while the pen
+    stays still.
+    """
+
+    def __init__(self, touch, on_move=None, on_gesture=None, on_down=None,
+                 on_up=None, interval_ms=20, min_distance=2, hold_ms=600,
+                 tap_distance=10, swipe_distance=40):
+        """Initialize stroke tracker.
+
+        Args:
+            touch (Touch): Touch controller to poll.
+            on_move (function): Called with (x1, y1, x2, y2) per segment.
+            on_gesture (function): Called with (gesture, x, y), gesture
+                being TAP, HOLD or one of the SWIPE constants; x, y is
+                where the stroke started.
+            on_down (function): Called with (x, y) when a stroke starts.
+            on_up (function): Called with (x, y) when a stroke ends.
+            interval_ms (int): Shortest time between polls.
+            min_distance (int): Smallest move reported, in pixels.
+            hold_ms (int): Time still before a hold.
+            tap_distance (int): Farthest a tap or hold may wander.
+            swipe_distance (int): Shortest swipe, start to end.
+        """
+        self.touch = touch
+        self.on_move = on_move
+        self.on_gesture = on_gesture
+        self.on_down = on_down
+        self.on_up = on_up
+        self.interval_ms = interval_ms
+        self.min_distance = min_distance
+        self.hold_ms = hold_ms
+        self.tap_distance = tap_distance
+        self.swipe_distance = swipe_distance
+        self.down = False
+        self._last_poll = ticks_ms() - interval_ms
+
+    def _end(self):
+        """Finish the stroke and classify it."""
+        self.down = False
+        if self.on_up is not None:
+            self.on_up(self.x, self.y)
+        if self.held or self.on_gesture is None:
+            return
+        dx = self.x - self.start_x
+        dy = self.y - self.start_y
+        if max(abs(dx), abs(dy)) >= self.swipe_distance:
+            if abs(dx) >= abs(dy):
+                gesture = SWIPE_RIGHT if dx > 0 else SWIPE_LEFT
+            else:
+                gesture = SWIPE_DOWN if dy > 0 else SWIPE_UP
+        elif self.travel <= self.tap_distance:
+            gesture = TAP
+        else:
+            return  # A wandering stroke is not a gesture
+        self.on_gesture(gesture, self.start_x, self.start_y)
+
+    def update(self):
+        """Poll the touch panel and report any changes.
+
+        Returns:
+            bool: True while the pen is down.
+        """
+        now = ticks_ms()
+        if ticks_diff(now, self._last_poll) < self.interval_ms:
+            return self.down
+        self._last_poll = now
+        point = self.touch.poll()
+        if point is None:
+            if self.down and not self.touch.pen_down:
+                self._end()
+            return self.down  # Lifted, or a noisy reading mid-stroke
+        x, y = point
+        if not self.down:
+            self.down = True
+            self.start_x = self.x = x
+            self.start_y = self.y = y
+            self.start_ticks = now
+            self.travel = 0  # Farthest distance from the start
+            self.held = False
+            if self.on_down is not None:
+                self.on_down(x, y)
+            return True
+        if max(abs(x - self.x), abs(y - self.y)) >= self.min_distance:
+            if self.on_move is not None:
+                self.on_move(self.x, self.y, x, y)
+            self.x, self.y = x, y
+            self.travel = max(self.travel, abs(x - self.start_x),
+                              abs(y - self.start_y))
+        if not self.held and self.travel <= self.tap_distance and \
+                ticks_diff(now, self.start_ticks) >= self.hold_ms:
+            self.held = True
+            if self.on_gesture is not None:
+                self.on_gesture(HOLD, self.start_x, self.start_y)
+        return True
@@ -1,9 +1,25 @@
 """ILI9341 LCD/Touch module."""
+from array import array
+from collections import OrderedDict
 from time import sleep
-from math import cos, sin, pi, radians
+from math import cos, sin, pi, radians, sqrt
 from sys import implementation
 from framebuf import FrameBuffer, RGB565  # type: ignore
 from micropython import const  # type: ignore
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:  # CPython (host testing)
+    from time import perf_counter
+
+    def ticks_us():
+        return int(perf_counter() * 1000000)
+
+    def ticks_diff(end, start):
+        return end - start
+try:
+    from gc import mem_alloc, mem_free
+except ImportError:  # CPython (host testing)
+    mem_alloc = mem_free = None
 
 
 def color565(r, g, b):
@@ -17,6 +33,886 @@ def color565(r, g, b):
     return ((b & 0xF8) << 8) | ((g & 0xFC) << 3) | (r >> 3)
 
 
+# Rasterization kernels.  Each writes x, y pairs into an array('h') and
+# returns the number of points, so the caller can clip and stream them
+# in one go instead of drawing pixel by pixel.  The pure Python versions
+# below run everywhere; on MicroPython they are replaced by Viper
+# versions further down.
+def _line_points(points, x1, y1, x2, y2):
+    """Bresenham line from x1, y1 to x2, y2 (max(|dx|, |dy|) + 1 points)."""
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    sx = 1 if x1 < x2 else -1
+    sy = 1 if y1 < y2 else -1
+    err = dx - dy
+    i = 0
+    while True:
+        points[i] = x1
+        points[i + 1] = y1
+        i += 2
+        if x1 == x2 and y1 == y2:
+            break
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x1 += sx
+        if e2 < dx:
+            err += dx
+            y1 += sy
+    return i >> 1
+
+
+def _circle_points(points, x0, y0, r):
+    """Midpoint circle outline (at most 8 * r + 4 points).
+
+    Points are stored one octant at a time, each octant ordered so its
+    row or column runs ascend and joined to its neighbour through the
+    point on the axis between them, so runs stream as single windows.
+    """
+    f = 1 - r
+    dy = -r - r
+    x = 0
+    y = r
+    n = 0  # Steps per octant
+    while x < y:
+        if f >= 0:
+            y -= 1
+            dy += 2
+            f += dy
+        x += 1
+        f += x + x + 1
+        n += 1
+    # Four groups of 2n + 1 points: descending octant, axis point,
+    # ascending octant (bottom, top, left and right sides)
+    g = n + n + 1
+    for k, px, py in ((n, x0, y0 + r), (n + g, x0, y0 - r),
+                      (n + 2 * g, x0 - r, y0), (n + 3 * g, x0 + r, y0)):
+        points[k * 2] = px
+        points[k * 2 + 1] = py
+    f = 1 - r
+    dy = -r - r
+    x = 0
+    y = r
+    a = n + 1  # Ascending octants: group base + n + 1 + s
+    d = n - 1  # Descending octants: group base + n - 1 - s
+    while x < y:
+        if f >= 0:
+            y -= 1
+            dy += 2
+            f += dy
+        x += 1
+        f += x + x + 1
+        for k, px, py in ((d, x0 - x, y0 + y), (a, x0 + x, y0 + y),
+                          (d + g, x0 - x, y0 - y), (a + g, x0 + x, y0 - y),
+                          (d + 2 * g, x0 - y, y0 - x),
+                          (a + 2 * g, x0 - y, y0 + x),
+                          (d + 3 * g, x0 + y, y0 - x),
+                          (a + 3 * g, x0 + y, y0 + x)):
+            points[k * 2] = px
+            points[k * 2 + 1] = py
+        a += 1
+        d -= 1
+    return 4 * g
+
+
+def _ellipse_points_py(points, x0, y0, a, b):
+    """Midpoint ellipse outline (at most 4 * (a + b) + 12 points).
+
+    Points are ordered as for _circle_points: the region 1 arcs form the
+    top and bottom groups (rows), the region 2 arcs the left and right
+    groups (columns), each group running in ascending order.
+    """
+    a2 = a * a
+    b2 = b * b
+    twoa2 = a2 + a2
+    twob2 = b2 + b2
+    n1 = n2 = 0
+    for store in (False, True):  # Count the steps, then store the points
+        if store:
+            g = n1 + n1 + 1  # Bottom and top groups
+            m = max(n2 + n2 - 1, 0)  # Right and left groups
+            for k, qx, qy in ((n1, x0, y0 + b), (n1 + g, x0, y0 - b)):
+                points[k * 2] = qx
+                points[k * 2 + 1] = qy
+        x = 0
+        y = b
+        px = 0
+        py = twoa2 * y
+        t = 0
+        # Region 1, p = round(b2 - a2 * b + a2 / 4) (squares are 0 or 1
+        # mod 4)
+        p = b2 - a2 * b + (a2 >> 2)
+        while px < py:
+            x += 1
+            px += twob2
+            if p < 0:
+                p += b2 + px
+            else:
+                y -= 1
+                py -= twoa2
+                p += b2 + px - py
+            if store:
+                for k, qx, qy in ((n1 - 1 - t, x0 - x, y0 + y),
+                                  (n1 + 1 + t, x0 + x, y0 + y),
+                                  (g + n1 - 1 - t, x0 - x, y0 - y),
+                                  (g + n1 + 1 + t, x0 + x, y0 - y)):
+                    points[k * 2] = qx
+                    points[k * 2 + 1] = qy
+            t += 1
+        n1 = t
+        t = 0
+        # Region 2, p = round(b2 * (x + 0.5) ** 2 + a2 * (y - 1) ** 2 -
+        # a2 * b2)
+        p = b2 * x * x - a2 * b2 + a2 * (y - 1) * (y - 1) + b2 * x + \
+            (b2 >> 2)
+        while y > 0:
+            y -= 1
+            py -= twoa2
+            if p > 0:
+                p += a2 - py
+            else:
+                x += 1
+                px += twob2
+                p += a2 - py + px
+            if store:
+                # The last step (y = 0) is shared by the upper and lower
+                # arcs; only the upper one stores it
+                k = g + g + t
+                points[k * 2] = x0 + x
+                points[k * 2 + 1] = y0 - y
+                points[(k + m) * 2] = x0 - x
+                points[(k + m) * 2 + 1] = y0 - y
+                if y:
+                    k = g + g + n2 + n2 - 2 - t
+                    points[k * 2] = x0 + x
+                    points[k * 2 + 1] = y0 + y
+                    points[(k + m) * 2] = x0 - x
+                    points[(k + m) * 2 + 1] = y0 + y
+            t += 1
+        n2 = t
+    return g + g + m + m
+
+
+_ellipse_points = _ellipse_points_py
+
+
+def _clip_points(points, start, count, pixels, color, w, h):
+    """Copy on-screen points into x, y, color triples; returns the count."""
+    j = 0
+    for i in range(start << 1, (start + count) << 1, 2):
+        x = points[i]
+        y = points[i + 1]
+        if 0 <= x < w and 0 <= y < h:
+            pixels[j] = x
+            pixels[j + 1] = y
+            pixels[j + 2] = color
+            j += 3
+    return j // 3
+
+
+def _poly_edge(spans, y0, x1, y1, x2, y2):
+    """Widen the min, max x spans of rows y0... to cover a polygon edge."""
+    if y1 == y2:  # Horizontal side
+        if x1 > x2:
+            x1, x2 = x2, x1
+        j = (y1 - y0) << 1
+        if x1 < spans[j]:
+            spans[j] = x1
+        if x2 > spans[j + 1]:
+            spans[j + 1] = x2
+        return
+    # Determine how steep the line is and rotate it if necessary
+    steep = abs(y2 - y1) > abs(x2 - x1)
+    if steep:
+        x1, y1 = y1, x1
+        x2, y2 = y2, x2
+    # Swap start and end points if necessary
+    if x1 > x2:
+        x1, x2 = x2, x1
+        y1, y2 = y2, y1
+    dx = x2 - x1
+    ady = abs(y2 - y1)
+    error = dx >> 1
+    ystep = 1 if y1 < y2 else -1
+    y = y1
+    for x in range(x1, x2 + 1):
+        if steep:
+            j = (x - y0) << 1
+            v = y
+        else:
+            j = (y - y0) << 1
+            v = x
+        if v < spans[j]:
+            spans[j] = v
+        if v > spans[j + 1]:
+            spans[j + 1] = v
+        error -= ady
+        if error < 0:
+            y += ystep
+            error += dx
+
+
+def _edge_spans(spans, j, n, q, e, qs, rs, den):
+    """Step a polygon edge down n rows, storing x in every other entry.
+
+    q is the first row's x (the ceiling of the exact crossing), e its
+    error in 1/den pixels and qs + rs / den the change in x per row.
+    """
+    for j in range(j, j + n * 2, 2):
+        spans[j] = q
+        q += qs
+        e -= rs
+        if e < 0:
+            q += 1
+            e += den
+
+
+def _circle_cols(cols, r):
+    """Half heights of the columns 0...r of a filled midpoint circle."""
+    for c in range(r + 1):
+        cols[c] = 0
+    cols[0] = r
+    f = 1 - r
+    dx = 1
+    dy = -r - r
+    x = 0
+    y = r
+    while x < y:
+        if f >= 0:
+            y -= 1
+            dy += 2
+            f += dy
+        x += 1
+        dx += 2
+        f += dx
+        if y > cols[x]:
+            cols[x] = y
+        if x > cols[y]:
+            cols[y] = x
+
+
+def _ellipse_cols(cols, a, b):
+    """Half heights of the columns of a filled midpoint ellipse.
+
+    Returns:
+        int: Number of columns from the center outwards (cols[0...n-1]).
+    """
+    a2 = a * a
+    b2 = b * b
+    twoa2 = a2 + a2
+    twob2 = b2 + b2
+    x = 0
+    y = b
+    px = 0
+    py = twoa2 * y
+    cols[0] = b
+    p = b2 - a2 * b + (a2 >> 2)  # See _ellipse_points_py
+    while px < py:
+        x += 1
+        px += twob2
+        if p < 0:
+            p += b2 + px
+        else:
+            y -= 1
+            py -= twoa2
+            p += b2 + px - py
+        cols[x] = y
+    p = b2 * x * x - a2 * b2 + a2 * (y - 1) * (y - 1) + b2 * x + (b2 >> 2)
+    while y > 0:
+        y -= 1
+        py -= twoa2
+        if p > 0:
+            p += a2 - py
+        else:
+            x += 1
+            px += twob2
+            p += a2 - py + px
+            cols[x] = y
+    return x + 1
+
+
+def _reverse_pixels(dst, src, n):
+    """Copy n RGB565 pixels from src to dst in reverse order."""
+    for i in range(n):
+        j = (n - 1 - i) * 2
+        dst[j], dst[j + 1] = src[i * 2], src[i * 2 + 1]
+
+
+def _copy_rows(dst, offset, stride, src, rows, width):
+    """Copy rows of width bytes from packed src into dst every stride bytes."""
+    s = 0
+    for _ in range(rows):
+        dst[offset:offset + width] = src[s:s + width]
+        offset += stride
+        s += width
+
+
+def _rle_decode(dst, d, dend, src, state):
+    """Decode run-length packets from src into dst[d:dend].
+
+    Packets are a control byte n followed by one pixel repeated
+    (n & 0x7F) + 1 times when bit 7 is set, or by n + 1 literal pixels.
+    state is an array('i') of [pixels left in the current packet,
+    packet kind (1 run, 2 literal), run color, read position, bytes in
+    src]; decoding stops when dst is full or src runs dry, and resumes
+    from state.  Returns the new write position.
+    """
+    count = state[0]
+    kind = state[1]
+    hi = state[2] >> 8
+    lo = state[2] & 0xFF
+    s = state[3]
+    send = state[4]
+    while d < dend:
+        if count == 0:
+            if s >= send:
+                break
+            n = src[s]
+            if n & 0x80:
+                if s + 3 > send:
+                    break
+                count = (n & 0x7F) + 1
+                kind = 1
+                hi = src[s + 1]
+                lo = src[s + 2]
+                s += 3
+            else:
+                count = n + 1
+                kind = 2
+                s += 1
+        if kind == 1:
+            dst[d] = hi
+            dst[d + 1] = lo
+        else:
+            if s + 2 > send:
+                break
+            dst[d] = src[s]
+            dst[d + 1] = src[s + 1]
+            s += 2
+        d += 2
+        count -= 1
+    state[0] = count
+    state[1] = kind
+    state[2] = (hi << 8) | lo
+    state[3] = s
+    return d
+
+
+if implementation.name == 'micropython':
+    import micropython  # type: ignore
+
+    @micropython.viper
+    def _line_points(points, x1: int, y1: int, x2: int, y2: int) -> int:
+        p = ptr16(points)  # type: ignore # noqa: F821
+        dx = x2 - x1
+        if dx < 0:
+            dx = 0 - dx
+        dy = y2 - y1
+        if dy < 0:
+            dy = 0 - dy
+        ndy = 0 - dy
+        sx = 1
+        if x2 < x1:
+            sx = -1
+        sy = 1
+        if y2 < y1:
+            sy = -1
+        err = dx - dy
+        i = 0
+        while True:
+            p[i] = x1
+            p[i + 1] = y1
+            i += 2
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = err + err
+            if e2 > ndy:
+                err -= dy
+                x1 += sx
+            if e2 < dx:
+                err += dx
+                y1 += sy
+        return i >> 1
+
+    @micropython.viper
+    def _circle_points(points, x0: int, y0: int, r: int) -> int:
+        p = ptr16(points)  # type: ignore # noqa: F821
+        f = 1 - r
+        dy = 0 - r - r
+        x = 0
+        y = r
+        n = 0
+        while x < y:
+            if f >= 0:
+                y -= 1
+                dy += 2
+                f += dy
+            x += 1
+            f += x + x + 1
+            n += 1
+        g = (n + n + 1) * 2  # Group size in array entries
+        i = n * 2
+        p[i] = x0
+        p[i + 1] = y0 + r
+        p[i + g] = x0
+        p[i + g + 1] = y0 - r
+        p[i + g * 2] = x0 - r
+        p[i + g * 2 + 1] = y0
+        p[i + g * 3] = x0 + r
+        p[i + g * 3 + 1] = y0
+        f = 1 - r
+        dy = 0 - r - r
+        x = 0
+        y = r
+        a = (n + 1) * 2
+        d = (n - 1) * 2
+        while x < y:
+            if f >= 0:
+                y -= 1
+                dy += 2
+                f += dy
+            x += 1
+            f += x + x + 1
+            p[d] = x0 - x
+            p[d + 1] = y0 + y
+            p[a] = x0 + x
+            p[a + 1] = y0 + y
+            p[d + g] = x0 - x
+            p[d + g + 1] = y0 - y
+            p[a + g] = x0 + x
+            p[a + g + 1] = y0 - y
+            p[d + g * 2] = x0 - y
+            p[d + g * 2 + 1] = y0 - x
+            p[a + g * 2] = x0 - y
+            p[a + g * 2 + 1] = y0 + x
+            p[d + g * 3] = x0 + y
+            p[d + g * 3 + 1] = y0 - x
+            p[a + g * 3] = x0 + y
+            p[a + g * 3 + 1] = y0 + x
+            a += 2
+            d -= 2
+        return g * 2
+
+    # 32-bit arithmetic: only valid while a * b < 32768 (see draw_ellipse)
+    @micropython.viper
+    def _ellipse_points(points, x0: int, y0: int, a: int, b: int) -> int:
+        p = ptr16(points)  # type: ignore # noqa: F821
+        a2 = a * a
+        b2 = b * b
+        twoa2 = a2 + a2
+        twob2 = b2 + b2
+        n1 = 0
+        n2 = 0
+        g = 0
+        m = 0
+        store = 0
+        while store < 2:  # Count the steps, then store the points
+            if store:
+                g = (n1 + n1 + 1) * 2  # Sizes in array entries
+                m = (n2 + n2 - 1) * 2
+                if m < 0:
+                    m = 0
+                p[n1 * 2] = x0
+                p[n1 * 2 + 1] = y0 + b
+                p[n1 * 2 + g] = x0
+                p[n1 * 2 + g + 1] = y0 - b
+            x = 0
+            y = b
+            px = 0
+            py = twoa2 * y
+            t = 0
+            e = b2 - a2 * b + (a2 >> 2)
+            while px < py:
+                x += 1
+                px += twob2
+                if e < 0:
+                    e += b2 + px
+                else:
+                    y -= 1
+                    py -= twoa2
+                    e += b2 + px - py
+                if store:
+                    d = (n1 - 1 - t) * 2
+                    k = (n1 + 1 + t) * 2
+                    p[d] = x0 - x
+                    p[d + 1] = y0 + y
+                    p[k] = x0 + x
+                    p[k + 1] = y0 + y
+                    p[d + g] = x0 - x
+                    p[d + g + 1] = y0 - y
+                    p[k + g] = x0 + x
+                    p[k + g + 1] = y0 - y
+                t += 1
+            n1 = t
+            t = 0
+            e = b2 * x * x - a2 * b2 + a2 * (y - 1) * (y - 1) + b2 * x + \
+                (b2 >> 2)
+            while y > 0:
+                y -= 1
+                py -= twoa2
+                if e > 0:
+                    e += a2 - py
+                else:
+                    x += 1
+                    px += twob2
+                    e += a2 - py + px
+                if store:
+                    k = g + g + t * 2
+                    p[k] = x0 + x
+                    p[k + 1] = y0 - y
+                    p[k + m] = x0 - x
+                    p[k + m + 1] = y0 - y
+                    if y:
+                        k = g + g + (n2 + n2 - 2 - t) * 2
+                        p[k] = x0 + x
+                        p[k + 1] = y0 + y
+                        p[k + m] = x0 - x
+                        p[k + m + 1] = y0 + y
+                t += 1
+            n2 = t
+            store += 1
+        return g + m
+
+    @micropython.viper
+    def _clip_points(points, start: int, count: int, pixels, color: int,
+                     w: int, h: int) -> int:
+        src = ptr16(points)  # type: ignore # noqa: F821
+        dst = ptr16(pixels)  # type: ignore # noqa: F821
+        i = start << 1
+        end = (start + count) << 1
+        j = 0
+        n = 0
+        while i < end:
+            # Loads are unsigned, so negative coordinates fail x < w too
+            x = src[i]
+            y = src[i + 1]
+            i += 2
+            if x < w and y < h:
+                dst[j] = x
+                dst[j + 1] = y
+                dst[j + 2] = color
+                j += 3
+                n += 1
+        return n
+
+    @micropython.viper
+    def _poly_edge(spans, y0: int, x1: int, y1: int, x2: int, y2: int):
+        s = ptr32(spans)  # type: ignore # noqa: F821
+        if y1 == y2:  # Horizontal side
+            if x1 > x2:
+                t = x1
+                x1 = x2
+                x2 = t
+            j = (y1 - y0) << 1
+            if x1 < s[j]:
+                s[j] = x1
+            if x2 > s[j + 1]:
+                s[j + 1] = x2
+            return
+        dx = x2 - x1
+        if dx < 0:
+            dx = 0 - dx
+        dy = y2 - y1
+        if dy < 0:
+            dy = 0 - dy
+        steep = dy > dx
+        if steep:
+            t = x1
+            x1 = y1
+            y1 = t
+            t = x2
+            x2 = y2
+            y2 = t
+        if x1 > x2:
+            t = x1
+            x1 = x2
+            x2 = t
+            t = y1
+            y1 = y2
+            y2 = t
+        dx = x2 - x1
+        ady = y2 - y1
+        ystep = 1
+        if ady < 0:
+            ady = 0 - ady
+            ystep = -1
+        error = dx >> 1
+        y = y1
+        x = x1
+        while x <= x2:
+            if steep:
+                j = (x - y0) << 1
+                v = y
+            else:
+                j = (y - y0) << 1
+                v = x
+            if v < s[j]:
+                s[j] = v
+            if v > s[j + 1]:
+                s[j + 1] = v
+            error -= ady
+            if error < 0:
+                y += ystep
+                error += dx
+            x += 1
+
+    @micropython.viper
+    def _edge_spans(spans, j: int, n: int, q: int, e: int, qs: int, rs: int,
+                    den: int):
+        s = ptr16(spans)  # type: ignore # noqa: F821
+        end = j + n * 2
+        while j < end:
+            s[j] = q
+            q += qs
+            e -= rs
+            if e < 0:
+                q += 1
+                e += den
+            j += 2
+
+    @micropython.viper
+    def _reverse_pixels(dst, src, n: int):
+        d = ptr16(dst)  # type: ignore # noqa: F821
+        s = ptr16(src)  # type: ignore # noqa: F821
+        j = n - 1
+        for i in range(n):
+            d[j - i] = s[i]
+
+    @micropython.viper
+    def _copy_rows(dst, offset: int, stride: int, src, rows: int,
+                   width: int):
+        d = ptr8(dst)  # type: ignore # noqa: F821
+        s = ptr8(src)  # type: ignore # noqa: F821
+        i = 0
+        for _ in range(rows):
+            for k in range(width):
+                d[offset + k] = s[i]
+                i += 1
+            offset += stride
+
+    @micropython.viper
+    def _rle_decode(dst, d: int, dend: int, src, state) -> int:
+        o = ptr8(dst)  # type: ignore # noqa: F821
+        i = ptr8(src)  # type: ignore # noqa: F821
+        st = ptr32(state)  # type: ignore # noqa: F821
+        count = st[0]
+        kind = st[1]
+        hi = st[2] >> 8
+        lo = st[2] & 0xFF
+        s = st[3]
+        send = st[4]
+        while d < dend:
+            if count == 0:
+                if s >= send:
+                    break
+                n = i[s]
+                if n & 0x80:
+                    if s + 3 > send:
+                        break
+                    count = (n & 0x7F) + 1
+                    kind = 1
+                    hi = i[s + 1]
+                    lo = i[s + 2]
+                    s += 3
+                else:
+                    count = n + 1
+                    kind = 2
+                    s += 1
+            if kind == 1:
+                o[d] = hi
+                o[d + 1] = lo
+            else:
+                if s + 2 > send:
+                    break
+                o[d] = i[s]
+                o[d + 1] = i[s + 1]
+                s += 2
+            d += 2
+            count -= 1
+        st[0] = count
+        st[1] = kind
+        st[2] = (hi << 8) | lo
+        st[3] = s
+        return d
+
+
+class SpiCounter(object):
+    """SPI wrapper that counts command and data bytes for the profiler.
+
+    Writes made while the D/C line is low are counted as command bytes,
+    the rest as data bytes, and every write as one transfer.  All other
+    attributes are passed through.
+    """
+
+    def __init__(self, spi, dc_low, counters):
+        """Initialize counter.
+
+        Args:
+            spi (Class Spi): SPI interface to wrap.
+            dc_low (function): Returns True while D/C selects commands.
+            counters (list): [commands, data bytes, CS assertions,
+                transfers].
+        """
+        self.spi = spi
+        self.dc_low = dc_low
+        self.counters = counters
+
+    def __getattr__(self, name):
+        return getattr(self.spi, name)
+
+    def write(self, buf):
+        if self.dc_low():
+            self.counters[0] += len(buf)
+        else:
+            self.counters[1] += len(buf)
+        self.counters[3] += 1
+        self.spi.write(buf)
+
+
+class DisplayList(object):
+    """Records frame buffer drawing operations for banded rendering.
+
+    Implements the fill_rect, pixel and blit calls Display makes on its
+    frame buffer, so every primitive can be recorded unchanged and later
+    replayed into each band of the screen.
+    """
+
+    def __init__(self, width, height):
+        """Initialize display list.
+
+        Args:
+            width (int): Screen width.
+            height (int): Screen height.
+        """
+        self.width = width
+        self.height = height
+        self.reset()
+
+    def blit(self, src, x, y, key=-1):
+        """Record a block copy.
+
+        Args:
+            src (tuple): (buffer, width, height, format) of the block.
+            x, y (int): Destination of the block's top left corner.
+            key (int): Frame buffer color left transparent (-1 for none).
+        Note:
+            Mutable buffers are copied since callers may reuse them
+            before the frame is rendered.
+        """
+        if not isinstance(src[0], bytes):
+            src = (bytes(src[0]), src[1], src[2], src[3])
+        self.ops.append((2, src, x, y, key))
+
+    def fill_rect(self, x, y, w, h, c):
+        """Record a solid fill.  A full screen fill discards older ops."""
+        if x <= 0 and y <= 0 and x + w >= self.width and \
+                y + h >= self.height:
+            self.reset()
+        self.ops.append((0, x, y, w, h, c))
+
+    def pixel(self, x, y, c):
+        """Record a single pixel."""
+        ops = self.ops
+        if ops and ops[-1][0] == 1:
+            ops[-1][2] += 1
+        else:
+            ops.append([1, len(self.pixels), 1])
+        self.pixels.extend((x, y, c))
+
+    def render(self, fb, y0, h):
+        """Replay the recorded operations into one band.
+
+        Args:
+            fb (FrameBuffer): Band frame buffer.
+            y0 (int): Screen row of the band's first line.
+            h (int): Band height.
+        """
+        y1 = y0 + h
+        pixels = self.pixels
+        for op in self.ops:
+            kind = op[0]
+            if kind == 0:
+                y = op[2]
+                if y < y1 and y + op[4] > y0:
+                    fb.fill_rect(op[1], y - y0, op[3], op[4], op[5])
+            elif kind == 1:
+                for i in range(op[1], op[1] + op[2] * 3, 3):
+                    y = pixels[i + 1]
+                    if y0 <= y < y1:
+                        fb.pixel(pixels[i], y - y0, pixels[i + 2])
+            else:
+                src = op[1]
+                y = op[3]
+                if y < y1 and y + src[2] > y0:
+                    fb.blit(src, op[2], y - y0, op[4])
+
+    def reset(self):
+        """Discard all recorded operations."""
+        self.ops = []
+        self.pixels = array('H')
+
+
+class GlyphCache(object):
+    """Least recently used cache of rendered RGB565 glyphs.
+
+    Keys describe everything that affects a glyph's pixels, e.g.
+    (font, char, color, background, orientation); values are whatever
+    the caller stores with them.  The oldest entries are evicted once
+    the cached buffers exceed the byte budget.
+    """
+
+    def __init__(self, budget=4096):
+        """Initialize glyph cache.
+
+        Args:
+            budget (int): Maximum bytes of glyph buffers held (0 disables).
+        """
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def clear(self):
+        """Discard all cached glyphs."""
+        self._entries = OrderedDict()
+        self.size = 0
+
+    def get(self, key):
+        """Return the entry stored for key (or None) and mark it recent."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries[key] = entry
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, entry, nbytes):
+        """Store an entry, evicting the least recently used ones.
+
+        Args:
+            key (tuple): Glyph key.
+            entry (object): Value returned by get (usually the buffer).
+            nbytes (int): Bytes the entry holds, charged to the budget.
+        Returns:
+            entry, so misses can be written as
+            cache.put(key, render(), n).
+        """
+        if nbytes > self.budget:
+            return entry
+        entries = self._entries
+        old = entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        while entries and self.size + nbytes > self.budget:
+            oldest = next(iter(entries))
+            self.size -= entries.pop(oldest)[1]
+        entries[key] = (entry, nbytes)
+        self.size += nbytes
+        return entry
+
+
 class Display(object):
     """Serial interface for 16-bit color (5-6-5 RGB) IL9341 display.
 
@@ -51,6 +947,7 @@ class Display(object):
     MADCTL = const(0x36)  # Memory access control
     VSCRSADD = const(0x37)  # Vertical scrolling start address
     PIXFMT = const(0x3A)  # COLMOD: Pixel format set
+    WRITE_RAM_CONTINUE = const(0x3C)  # Memory write continue
     WRITE_DISPLAY_BRIGHTNESS = const(0x51)  # Brightness hardware dependent!
     READ_DISPLAY_BRIGHTNESS = const(0x52)
     WRITE_CTRL_DISPLAY = const(0x53)
@@ -82,6 +979,16 @@ class Display(object):
     ENABLE3G = const(0xF2)  # Enable 3 gamma control
     PUMPRC = const(0xF7)  # Pump ratio control
 
+    PROFILED = ('clear', 'draw_circle', 'draw_ellipse', 'draw_hline',
+                'draw_image', 'draw_letter', 'draw_line', 'draw_lines',
+                'draw_pixel', 'draw_polygon', 'draw_rectangle', 'draw_sprite',
+                'draw_text', 'draw_text8x8', 'draw_vline', 'fill_circle',
+                'fill_ellipse', 'fill_hrect', 'fill_poly', 'fill_polygon',
+                'fill_rectangle', 'fill_round_rectangle', 'fill_triangle',
+                'fill_vrect', 'scroll', 'show')  # Primitives timed by profile
+    TEXT_STRIP_BYTES = const(8192)  # Largest strip draw_text composes
+    RLE_MAGIC = b'R565'  # Run-length compressed image (see draw_image)
+
     MIRROR_ROTATE = {  # MADCTL configurations for rotation and mirroring
         (False, 0): 0x80,  # 1000 0000
         (False, 90): 0xE0,  # 1110 0000
@@ -94,7 +1001,8 @@ class Display(object):
     }
 
     def __init__(self, spi, cs, dc, rst, width=240, height=320, rotation=0,
-                 mirror=False, bgr=True, gamma=True, x_offset=0, y_offset=0):
+                 mirror=False, bgr=True, gamma=True, x_offset=0, y_offset=0,
+                 batch_size=256, glyph_cache=4096, image_buffer=4096):
         """Initialize OLED.
 
         Args:
@@ -110,6 +1018,12 @@ class Display(object):
             gamma (Optional bool): Custom gamma correction (default True)
             x_offset (Optional int): X-axis origin offset (default 0)
             y_offset (Optional int): Y-axis origin offset (default 0)
+            batch_size (Optional int): Pixels held in the pixel batch
+                before it is flushed (default 256)
+            glyph_cache (Optional int): Bytes of rendered text glyphs
+                kept for reuse (default 4096, 0 disables caching)
+            image_buffer (Optional int): RAM draw_image streams through,
+                split between two chunk buffers (default 4096)
         """
         self.spi = spi
         self.cs = cs
@@ -127,6 +1041,62 @@ class Display(object):
         self.offset = bool(x_offset or y_offset)
         self.x_offset = x_offset
         self.y_offset = y_offset
+        # Pixel batch: x, y, color triples sent under a single CS assertion
+        self._batch = array('H', bytes(6 * batch_size))
+        self._batch_size = batch_size
+        self._batch_len = 0
+        self._batch_depth = 0
+        self._batch_run = bytearray(64)
+        mv = memoryview(self._batch_run)
+        self._batch_views = tuple(mv[:n * 2] for n in range(33))  # By length
+        # Scratch buffers for the rasterization kernels (grown on demand)
+        self._points = array('h')
+        self._spans = array('i')
+        self._edges = None  # See _edge_buffer
+        # Solid color buffer for span fills (see _solid_fill)
+        self._solid = None
+        self._solid_mv = None
+        self._solid_views = None
+        self._solid_color = -1
+        self._color_bytes = bytearray(2)
+        self.set_color(0)
+        # Rendered text glyphs and the strip text is composed in
+        self.glyph_cache = GlyphCache(glyph_cache)
+        self._strip = None
+        self._strip_mv = None
+        self._strip_glyphs = []
+        # Image streaming buffers (see draw_image), allocated on first use
+        self._image_buffer = image_buffer
+        self._image_mvs = None
+        self._rle_in = None
+        self._rle_state = array('i', (0, 0, 0, 0, 0))
+        # Command scratch buffers, patched in place so writes don't allocate
+        self._cmd_buf = bytearray(1)
+        mv = memoryview(bytearray(16))
+        self._args_views = tuple(mv[:n] for n in range(17))  # By length
+        self._window = bytearray(4)
+        self._scroll_buf = bytearray(2)
+        # Address window last sent to the panel (-1 = unknown) and the row
+        # a RAMWRC would continue at (see _write_block)
+        self._caset = -1
+        self._paset = -1
+        self._ram_next = -1
+        # Off-screen frame buffer (see framebuffer method)
+        self._fb = None
+        self._fb_buf = None
+        self._band_bufs = None
+        self._flushing = False
+        self._flush_end = None
+        self._flush_strips = None  # Full frame flush in progress
+        self._flush_bytes = 0
+        self._transfer_us = 0
+        self._timing = (0, 0, 0, 0, 0)
+        self._render_us = 0
+        self._dirty = []
+        self._pixel_box = None
+        self.frame_bytes = 0
+        # Profiler (see profile method)
+        self._prof = None
 
         # Initialize GPIO pins and set implementation specific methods
         if implementation.name == 'circuitpython':
@@ -136,6 +1106,7 @@ class Display(object):
             self.reset = self.reset_cpy
             self.write_cmd = self.write_cmd_cpy
             self.write_data = self.write_data_cpy
+            self.write_pixels = self.write_pixels_cpy
         else:
             self.cs.init(self.cs.OUT, value=1)
             self.dc.init(self.dc.OUT, value=0)
@@ -143,6 +1114,7 @@ class Display(object):
             self.reset = self.reset_mpy
             self.write_cmd = self.write_cmd_mpy
             self.write_data = self.write_data_mpy
+            self.write_pixels = self.write_pixels_mpy
         self.reset()
         # Send initialization commands
         self.write_cmd(self.SWRESET)  # Software reset
@@ -177,55 +1149,167 @@ class Display(object):
         sleep(.1)
         self.clear()
 
+    def begin_batch(self):
+        """Start collecting draw_pixel writes into the pixel batch.
+
+        Note:
+            Batches nest; pixels are flushed when the outermost
+            end_batch is reached, when the batch is full, or before
+            any other block write so drawing order is preserved.
+        """
+        self._batch_depth += 1
+
     def block(self, x0, y0, x1, y1, data):
         """Write a block of data to display."""
         if not data:
             return
+        if self._batch_len:
+            self.flush_batch()
+        if self._fb is not None:
+            self._fb_block(x0, y0, x1, y1, data)
+            return
+        self._write_block(x0, y0, x1, y1, data)
+
+    def _fb_block(self, x0, y0, x1, y1, data, key=-1):
+        """Copy a block of display data into the frame buffer.
+
+        Pixels equal to key (a frame buffer color, i.e. byte swapped)
+        are left transparent; -1 copies every pixel.
+        """
+        if self._flush_strips is not None:
+            self._finish_flush()
+        w = x1 - x0 + 1
+        h = min(y1 - y0 + 1, len(data) // (w * 2))
+        if h <= 0:
+            return
+        self._fb.blit((data, w, h, RGB565), x0, y0, key)
+        self._mark_dirty(x0, y0, x1, y0 + h - 1)
+
+    def _fb_fill(self, x, y, w, h, color):
+        """Fill a rectangle of the frame buffer."""
+        if self._flush_strips is not None:
+            self._finish_flush()
+        self._fb.fill_rect(x, y, w, h, ((color & 0xFF) << 8) | (color >> 8))
+        self._mark_dirty(x, y, x + w - 1, y + h - 1)
+
+    def _mark_dirty(self, x0, y0, x1, y1):
+        """Add a rectangle to the frame buffer dirty list.
+
+        Note:
+            Rectangles that overlap or touch an existing entry are merged
+            into it.  Once 8 entries exist everything collapses into one
+            bounding rectangle.
+        """
+        if self._dirty is None:  # Banded mode redraws every band
+            return
+        x0 = max(x0, 0)
+        y0 = max(y0, 0)
+        x1 = min(x1, self.width - 1)
+        y1 = min(y1, self.height - 1)
+        if x0 > x1 or y0 > y1:
+            return
+        dirty = self._dirty
+        for r in dirty:
+            if (x0 <= r[2] + 1 and x1 >= r[0] - 1 and
+                    y0 <= r[3] + 1 and y1 >= r[1] - 1):
+                r[0] = min(r[0], x0)
+                r[1] = min(r[1], y0)
+                r[2] = max(r[2], x1)
+                r[3] = max(r[3], y1)
+                return
+        if len(dirty) == 8:
+            for r in dirty:
+                x0 = min(r[0], x0)
+                y0 = min(r[1], y0)
+                x1 = max(r[2], x1)
+                y1 = max(r[3], y1)
+            dirty.clear()
+        dirty.append([x0, y0, x1, y1])
+
+    def _write_block(self, x0, y0, x1, y1, data):
+        """Send a block of data straight to display memory.
+
+        Returns:
+            int: Bytes sent over SPI, address commands included.
+        """
+        sent = self._ram_window(x0, y0, x1, y1, len(data))
+        self.write_data(data)
+        return sent + len(data)
+
+    def _ram_window(self, x0, y0, x1, y1, size):
+        """Start a memory write of size bytes into a block.
+
+        Returns:
+            int: Command and parameter bytes sent.
+        Note:
+            The column and page ranges last sent are cached and only
+            changed ranges are re-sent.  The page range runs to the bottom
+            of the screen, so a block with the same columns that starts on
+            the row after the previous block ended is sent with RAMWRC and
+            no address commands at all.
+        """
         if self.offset:  # Add offset if specified
             x0 += self.x_offset
             x1 += self.x_offset
             y0 += self.y_offset
             y1 += self.y_offset
 
-        self.write_cmd(self.SET_COLUMN,
-                       x0 >> 8, x0 & 0xff, x1 >> 8, x1 & 0xff)
-        self.write_cmd(self.SET_PAGE,
-                       y0 >> 8, y0 & 0xff, y1 >> 8, y1 & 0xff)
-        self.write_cmd(self.WRITE_RAM)
-        self.write_data(data)
+        col = (x0 << 16) | x1
+        row_bytes = (x1 - x0 + 1) * 2
+        if size > (y1 - y0 + 1) * row_bytes:
+            # Data overruns the window: keep the exact page range so it
+            # wraps within the block as before
+            y_end = y1
+            ram_next = -1
+        else:
+            y_end = self.height - 1 + self.y_offset
+            ram_next = -1 if size % row_bytes else y0 + size // row_bytes
+        sent = 1
+        if col == self._caset and y0 == self._ram_next:
+            self.write_cmd(self.WRITE_RAM_CONTINUE)
+        else:
+            window = self._window
+            if col != self._caset:
+                window[0] = x0 >> 8
+                window[1] = x0 & 0xff
+                window[2] = x1 >> 8
+                window[3] = x1 & 0xff
+                self.write_cmd(self.SET_COLUMN)
+                self.write_data(window)
+                self._caset = col
+                sent += 5
+            page = (y0 << 16) | y_end
+            if page != self._paset:
+                window[0] = y0 >> 8
+                window[1] = y0 & 0xff
+                window[2] = y_end >> 8
+                window[3] = y_end & 0xff
+                self.write_cmd(self.SET_PAGE)
+                self.write_data(window)
+                self._paset = page
+                sent += 5
+            self.write_cmd(self.WRITE_RAM)
+        self._ram_next = ram_next
+        return sent
 
     def cleanup(self):
         """Clean up resources."""
+        self.framebuffer(False)
         self.clear()
         self.display_off()
         self.spi.deinit()
         print('display off')
 
-    def clear(self, color=0, hlines=8):
+    def clear(self, color=0, hlines=None):
         """Clear display.
 
         Args:
             color (Optional int): RGB565 color value (Default: 0 = Black).
-            hlines (Optional int): # of horizontal lines per chunk (Default: 8)
-        Note:
-            hlines was introduced to deal with memory allocation on some
-            boards.  Smaller values allocate less memory but take longer
-            to execute.  hlines must be a factor of the display height.
-            For example, for a 240 pixel height, valid values for hline
-            would be 1, 2, 3, 4, 5, 6, 8, 10, 12, 15, 16, 20, 24, 30, 40, etc.
-            Higher values may result in memory allocation errors.
-        """
-        w = self.width
-        h = self.height
-        assert hlines > 0 and h % hlines == 0, (
-            "hlines must be a non-zero factor of height.")
-        # Clear display
-        if color:
-            line = color.to_bytes(2, 'big') * (w * hlines)
-        else:
-            line = bytearray(w * 2 * hlines)
-        for y in range(0, h, hlines):
-            self.block(0, y, w - 1, y + hlines - 1, line)
+            hlines: Deprecated and ignored.  The screen is streamed from
+                the shared solid fill buffer (see _solid_fill), so there
+                is no chunk size to tune.  Kept so old calls still work.
+        """
+        self._solid_fill(0, 0, self.width, self.height, color)
 
     def display_off(self):
         """Turn display off."""
@@ -244,31 +1328,9 @@ class Display(object):
             r (int): Radius.
             color (int): RGB565 color value.
         """
-        f = 1 - r
-        dx = 1
-        dy = -r - r
-        x = 0
-        y = r
-        self.draw_pixel(x0, y0 + r, color)
-        self.draw_pixel(x0, y0 - r, color)
-        self.draw_pixel(x0 + r, y0, color)
-        self.draw_pixel(x0 - r, y0, color)
-        while x < y:
-            if f >= 0:
-                y -= 1
-                dy += 2
-                f += dy
-            x += 1
-            dx += 2
-            f += dx
-            self.draw_pixel(x0 + x, y0 + y, color)
-            self.draw_pixel(x0 - x, y0 + y, color)
-            self.draw_pixel(x0 + x, y0 - y, color)
-            self.draw_pixel(x0 - x, y0 - y, color)
-            self.draw_pixel(x0 + y, y0 + x, color)
-            self.draw_pixel(x0 - y, y0 + x, color)
-            self.draw_pixel(x0 + y, y0 - x, color)
-            self.draw_pixel(x0 - y, y0 - x, color)
+        self.set_color(color)
+        points = self._point_buffer(8 * r + 4)
+        self._draw_points(_circle_points(points, x0, y0, r))
 
     def draw_ellipse(self, x0, y0, a, b, color):
         """Draw an ellipse.
@@ -284,50 +1346,13 @@ class Display(object):
             up to complete on a full pixel.  Therefore the major and
             minor axes are increased by 1.
         """
-        a2 = a * a
-        b2 = b * b
-        twoa2 = a2 + a2
-        twob2 = b2 + b2
-        x = 0
-        y = b
-        px = 0
-        py = twoa2 * y
-        # Plot initial points
-        self.draw_pixel(x0 + x, y0 + y, color)
-        self.draw_pixel(x0 - x, y0 + y, color)
-        self.draw_pixel(x0 + x, y0 - y, color)
-        self.draw_pixel(x0 - x, y0 - y, color)
-        # Region 1
-        p = round(b2 - (a2 * b) + (0.25 * a2))
-        while px < py:
-            x += 1
-            px += twob2
-            if p < 0:
-                p += b2 + px
-            else:
-                y -= 1
-                py -= twoa2
-                p += b2 + px - py
-            self.draw_pixel(x0 + x, y0 + y, color)
-            self.draw_pixel(x0 - x, y0 + y, color)
-            self.draw_pixel(x0 + x, y0 - y, color)
-            self.draw_pixel(x0 - x, y0 - y, color)
-        # Region 2
-        p = round(b2 * (x + 0.5) * (x + 0.5) +
-                  a2 * (y - 1) * (y - 1) - a2 * b2)
-        while y > 0:
-            y -= 1
-            py -= twoa2
-            if p > 0:
-                p += a2 - py
-            else:
-                x += 1
-                px += twob2
-                p += a2 - py + px
-            self.draw_pixel(x0 + x, y0 + y, color)
-            self.draw_pixel(x0 - x, y0 + y, color)
-            self.draw_pixel(x0 + x, y0 - y, color)
-            self.draw_pixel(x0 - x, y0 - y, color)
+        self.set_color(color)
+        points = self._point_buffer(4 * (a + b) + 12)
+        if a * b < 32768:  # Viper kernel uses 32-bit arithmetic
+            n = _ellipse_points(points, x0, y0, a, b)
+        else:
+            n = _ellipse_points_py(points, x0, y0, a, b)
+        self._draw_points(n)
 
     def draw_hline(self, x, y, w, color=None):
         """Draw a horizontal line."""
@@ -340,8 +1365,7 @@ class Display(object):
         if color is not None:
             self.set_color(color)
 
-        line = self._color_bytes * w
-        self.block(x, y, x + w - 1, y, line)
+        self._solid_fill(x, y, w, 1, self._color)
 
     def draw_image(self, path, x=0, y=0, w=320, h=240):
         """Draw image from flash.
@@ -352,28 +1376,101 @@ class Display(object):
             y (int): Y coordinate of image top.  Default is 0.
             w (int): Width of image.  Default is 320.
             h (int): Height of image.  Default is 240.
+        Note:
+            Raw files hold w x h RGB565 pixels, high byte first.  Files
+            made by tools/image_converter.py --rle start with RLE_MAGIC
+            and their own size (w and h are then ignored) and are decoded
+            while streaming.  Chunks are read with readinto into two
+            buffers that take turns, sized by image_buffer.  Images
+            partly off the display are clipped.
         """
-        x2 = x + w - 1
-        y2 = y + h - 1
-        if self.is_off_grid(x, y, x2, y2):
-            return
         with open(path, "rb") as f:
-            chunk_height = 1024 // w
-            chunk_count, remainder = divmod(h, chunk_height)
-            chunk_size = chunk_height * w * 2
-            chunk_y = y
-            if chunk_count:
-                for c in range(0, chunk_count):
-                    buf = f.read(chunk_size)
-                    self.block(x, chunk_y,
-                               x2, chunk_y + chunk_height - 1,
-                               buf)
-                    chunk_y += chunk_height
-            if remainder:
-                buf = f.read(remainder * w * 2)
-                self.block(x, chunk_y,
-                           x2, chunk_y + remainder - 1,
-                           buf)
+            header = f.read(8)
+            rle = header[:4] == self.RLE_MAGIC
+            if rle:
+                w = header[4] | (header[5] << 8)
+                h = header[6] | (header[7] << 8)
+            x0 = max(x, 0)
+            y0 = max(y, 0)
+            x1 = min(x + w, self.width) - 1
+            y1 = min(y + h, self.height) - 1
+            if x0 > x1 or y0 > y1:
+                return
+            vw = x1 - x0 + 1
+            bytes_per_row = (w if rle else vw) * 2
+            bufs = self._image_buffers(bytes_per_row)
+            rows = len(bufs[0]) // bytes_per_row
+            if rle:
+                state = self._rle_state
+                for i in range(5):
+                    state[i] = 0
+                skip = y0 - y  # Rows above the display are decoded and lost
+                while skip:
+                    n = min(rows, skip)
+                    self._read_rle(f, bufs[0], n * w * 2)
+                    skip -= n
+            else:
+                offset = ((y0 - y) * w + (x0 - x)) * 2
+                f.seek(offset)
+            turn = 0
+            row = y0
+            while row <= y1:
+                n = min(rows, y1 - row + 1)
+                buf = bufs[turn]
+                turn ^= 1
+                if rle:
+                    size = self._read_rle(f, buf, n * w * 2)
+                    if vw != w:  # Keep the visible part of each row
+                        for r in range(n):
+                            s = r * w * 2 + (x0 - x) * 2
+                            buf[r * vw * 2:(r + 1) * vw * 2] = \
+                                buf[s:s + vw * 2]
+                        size = size // (w * 2) * vw * 2
+                elif vw == w:
+                    size = f.readinto(buf[:n * vw * 2]) or 0
+                else:
+                    size = 0
+                    for r in range(n):
+                        f.seek(offset)
+                        size += f.readinto(
+                            buf[r * vw * 2:(r + 1) * vw * 2]) or 0
+                        offset += w * 2
+                if not size:
+                    return
+                self.block(x0, row, x1, row + n - 1, buf[:size])
+                row += n
+
+    def _image_buffers(self, row_bytes):
+        """Return the two draw_image chunk buffers, holding a row at least."""
+        size = max(self._image_buffer // 2, row_bytes)
+        if self._image_mvs is None or len(self._image_mvs[0]) < size:
+            self._image_mvs = (memoryview(bytearray(size)),
+                               memoryview(bytearray(size)))
+        return self._image_mvs
+
+    def _read_rle(self, f, buf, nbytes):
+        """Decode the next nbytes of pixels of an RLE image into buf.
+
+        Returns:
+            int: Bytes decoded (less than nbytes if the file ends).
+        """
+        if self._rle_in is None:
+            self._rle_in = memoryview(bytearray(256))
+        src = self._rle_in
+        state = self._rle_state
+        d = 0
+        while True:
+            d = _rle_decode(buf, d, nbytes, src, state)
+            if d >= nbytes:
+                return d
+            # Input used up: keep the partial packet and refill
+            left = state[4] - state[3]
+            src[:left] = src[state[3]:state[4]]
+            n = f.readinto(src[left:]) or 0
+            state[3] = 0
+            state[4] = left + n
+            if not n:
+                return d
 
     def draw_letter(self, x, y, letter, font, color, background=0,
                     landscape=False, rotate_180=False):
@@ -389,21 +1486,8 @@ class Display(object):
             landscape (bool): Orientation (default: False = portrait)
             rotate_180 (bool): Rotate text by 180 degrees
         """
-        buf, w, h = font.get_letter(letter, color, background, landscape)
-        if rotate_180:
-            # Manually rotate the buffer by 180 degrees
-            # ensure bytes pairs for each pixel retain color565
-            new_buf = bytearray(len(buf))
-            num_pixels = len(buf) // 2
-            for i in range(num_pixels):
-                # The index for the new buffer's byte pair
-                new_idx = (num_pixels - 1 - i) * 2
-                # The index for the original buffer's byte pair
-                old_idx = i * 2
-                # Swap the pixels
-                new_buf[new_idx], new_buf[new_idx + 1] = buf[old_idx], buf[old_idx + 1]
-            buf = new_buf
-
+        buf, w, h = self._letter(letter, font, color, background, landscape,
+                                 rotate_180)
         # Check for errors (Font could be missing specified letter)
         if w == 0:
             return w, h
@@ -423,8 +1507,38 @@ class Display(object):
                        buf)
         return w, h
 
+    def _letter(self, letter, font, color, background, landscape,
+                rotate_180):
+        """Return the (buffer, width, height) of a font letter.
+
+        Letters are rendered by the font once and then served from the
+        glyph cache.
+        """
+        key = (font, letter, color, background, landscape, rotate_180)
+        glyph = self.glyph_cache.get(key)
+        if glyph is not None:
+            return glyph
+        buf, w, h = font.get_letter(letter, color, background, landscape)
+        if rotate_180:
+            # Rotate the buffer by 180 degrees, keeping color565 byte pairs
+            new_buf = bytearray(len(buf))
+            _reverse_pixels(new_buf, buf, len(buf) // 2)
+            buf = new_buf
+        elif w:
+            buf = bytes(buf)  # Fonts may reuse their letter buffer
+        if not w:
+            return buf, w, h
+        return self.glyph_cache.put(key, (buf, w, h), len(buf))
+
     def set_color(self, color):
-        self._color_bytes = color.to_bytes(2, 'big')
+        """Set the default color used when a primitive's color is None.
+
+        Args:
+            color (int): RGB565 color value.
+        """
+        self._color = color
+        self._color_bytes[0] = color >> 8
+        self._color_bytes[1] = color & 0xFF
 
     def draw_line(self, x1, y1, x2, y2, color=None):
         """Draw a line using Bresenham's algorithm."""
@@ -443,23 +1557,8 @@ class Display(object):
             self.draw_hline(x1, y1, x2 - x1 + 1)
             return
 
-        dx = abs(x2 - x1)
-        dy = abs(y2 - y1)
-        sx = 1 if x1 < x2 else -1
-        sy = 1 if y1 < y2 else -1
-        err = dx - dy
-
-        while True:
-            self.draw_pixel(x1, y1)
-            if x1 == x2 and y1 == y2:
-                break
-            e2 = 2 * err
-            if e2 > -dy:
-                err -= dy
-                x1 += sx
-            if e2 < dx:
-                err += dx
-                y1 += sy
+        points = self._point_buffer(max(abs(x2 - x1), abs(y2 - y1)) + 1)
+        self._draw_points(_line_points(points, x1, y1, x2, y2))
 
     def draw_lines(self, coords, color):
         """Draw multiple lines.
@@ -470,18 +1569,300 @@ class Display(object):
         """
         # Starting point
         x1, y1 = coords[0]
-        # Iterate through coordinates
-        for i in range(1, len(coords)):
-            x2, y2 = coords[i]
-            self.draw_line(x1, y1, x2, y2, color)
-            x1, y1 = x2, y2
+        self.begin_batch()
+        try:
+            # Iterate through coordinates
+            for i in range(1, len(coords)):
+                x2, y2 = coords[i]
+                self.draw_line(x1, y1, x2, y2, color)
+                x1, y1 = x2, y2
+        finally:
+            self.end_batch()
 
     def draw_pixel(self, x, y, color=None):
         """Draw a pixel at the given coordinates."""
         if color is not None:
             self.set_color(color)
-        # Assuming self.block handles single pixel writes:
-        self.block(x, y, x, y, self._color_bytes) # Replace with your actual pixel write logic
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return
+        if self._fb is not None:
+            if self._flush_strips is not None:
+                self._finish_flush()
+            c = self._color
+            self._fb.pixel(x, y, ((c & 0xFF) << 8) | (c >> 8))
+            box = self._pixel_box
+            if box is None:
+                self._pixel_box = [x, y, x, y]
+            else:
+                if x < box[0]:
+                    box[0] = x
+                elif x > box[2]:
+                    box[2] = x
+                if y < box[1]:
+                    box[1] = y
+                elif y > box[3]:
+                    box[3] = y
+            if not self._batch_depth:
+                self.flush_batch()
+            return
+        if not self._batch_depth:
+            self.block(x, y, x, y, self._color_bytes)
+            return
+        # Queue pixel in the batch
+        i = self._batch_len * 3
+        batch = self._batch
+        batch[i] = x
+        batch[i + 1] = y
+        batch[i + 2] = self._color
+        self._batch_len += 1
+        if self._batch_len == self._batch_size:
+            self.flush_batch()
+
+    def _draw_points(self, n):
+        """Draw the first n x, y pairs of the point buffer.
+
+        Note:
+            Off-screen points are skipped.  Without a frame buffer the
+            points are clipped into the pixel batch array and streamed
+            a batch at a time.
+        """
+        points = self._points
+        if self._fb is not None:
+            for i in range(0, n * 2, 2):
+                self.draw_pixel(points[i], points[i + 1])
+            return
+        self.flush_batch()
+        batch = self._batch
+        size = self._batch_size
+        color = self._color
+        w, h = self.width, self.height
+        for start in range(0, n, size):
+            count = _clip_points(points, start, min(size, n - start), batch,
+                                 color, w, h)
+            if count:
+                self.write_pixels(batch, count)
+
+    def _point_buffer(self, n):
+        """Return the point buffer, grown to hold at least n x, y pairs."""
+        if len(self._points) < n * 2:
+            self._points = array('h', bytes(n * 4))
+        return self._points
+
+    def _edge_buffer(self):
+        """Return the fill_poly span buffer (two entries per screen row)."""
+        if self._edges is None:
+            self._edges = array('h', bytes(4 * max(self.width, self.height)))
+        return self._edges
+
+    def _span_buffer(self, rows):
+        """Return the span buffer, grown to hold min, max pairs for rows."""
+        if len(self._spans) < rows * 2:
+            self._spans = array('i', bytes(rows * 8))
+        return self._spans
+
+    def _fill_spans(self, spans, top, rows, color, start=0):
+        """Fill the min, max x spans of rows top... from a span buffer.
+
+        Args:
+            start (Optional int): First row to fill (default 0); rows
+                before it are left alone.
+        Note:
+            Consecutive rows with the same span are merged into one
+            rectangle.  Rows whose min exceeds their max are skipped.
+        """
+        i = start * 2
+        end = rows * 2
+        while i < end:
+            x1 = spans[i]
+            x2 = spans[i + 1]
+            j = i + 2
+            while j < end and spans[j] == x1 and spans[j + 1] == x2:
+                j += 2
+            if x1 <= x2:
+                self._solid_fill(x1, top + (i >> 1), x2 - x1 + 1,
+                                 (j - i) >> 1, color)
+            i = j
+
+    def _fill_convex(self, spans, top, rows, color):
+        """Fill a convex shape from the min, max x spans of its rows.
+
+        Note:
+            Like _fill_quadrants, the shape is split into a central
+            rectangle, row spans above and below it and column spans left
+            and right of it, so sloped sides cost one window per row or
+            per column, whichever is fewer.  The rows of the rectangle are
+            picked by trimming its narrower end row by row and keeping the
+            split with the fewest spans.
+        """
+        end = rows - 1
+        lo = 32767
+        hi = -32768
+        for i in range(0, rows * 2, 2):
+            if spans[i] < lo:
+                lo = spans[i]
+            if spans[i + 1] > hi:
+                hi = spans[i + 1]
+        # Trim rows from the narrower end; the rectangle spans the inner
+        # edges of its first and last rows
+        a = 0
+        b = end
+        best = rows + 1
+        ba = bb = -1
+        while a <= b:
+            left = max(spans[a * 2], spans[b * 2])
+            right = min(spans[a * 2 + 1], spans[b * 2 + 1])
+            if left <= right:
+                cost = a + end - b + left - lo + hi - right
+                if cost < best:
+                    best, ba, bb = cost, a, b
+            if (spans[a * 2 + 1] - spans[a * 2] <
+                    spans[b * 2 + 1] - spans[b * 2]):
+                a += 1
+            else:
+                b -= 1
+        if ba < 0:
+            self._fill_spans(spans, top, rows, color)
+            return
+        left = max(spans[ba * 2], spans[bb * 2])
+        right = min(spans[ba * 2 + 1], spans[bb * 2 + 1])
+        self._fill_spans(spans, top, ba, color)
+        self._solid_fill(left, top + ba, right - left + 1, bb - ba + 1, color)
+        self._fill_spans(spans, top, rows, color, bb + 1)
+        # Columns beside the rectangle; each one's rows shrink towards
+        # the widest row as x moves out
+        for side in (0, 1):
+            y1 = ba
+            y2 = bb
+            x = left - 1 if side == 0 else right + 1
+            step = -1 if side == 0 else 1
+            run = r1 = r2 = rx = 0
+            while True:
+                if side == 0:
+                    while y1 <= y2 and spans[y1 * 2] > x:
+                        y1 += 1
+                    while y2 >= y1 and spans[y2 * 2] > x:
+                        y2 -= 1
+                else:
+                    while y1 <= y2 and spans[y1 * 2 + 1] < x:
+                        y1 += 1
+                    while y2 >= y1 and spans[y2 * 2 + 1] < x:
+                        y2 -= 1
+                if run and (y1 > y2 or y1 != r1 or y2 != r2):
+                    # Columns with the same rows are one rectangle
+                    self._solid_fill(min(rx, x - step), top + r1, run,
+                                     r2 - r1 + 1, color)
+                    run = 0
+                if y1 > y2:
+                    break
+                if not run:
+                    r1, r2, rx = y1, y2, x
+                run += 1
+                x += step
+
+    def _fill_quadrants(self, cols, n, xl, xr, yt, yb, color):
+        """Fill a shape whose four corners are quarter ellipses.
+
+        Args:
+            cols (array): Column half heights of one corner, center out.
+            n (int): Number of columns in cols.
+            xl, xr (int): X of the left and right corner centers.
+            yt, yb (int): Y of the top and bottom corner centers.
+            color (int): RGB565 color value.
+        Note:
+            The shape is split into a central rectangle with its corners
+            on the curve, row spans above and below it and column spans
+            left and right of it.  The corner is placed where the fewest
+            spans remain, and rows (columns) of equal width (height) are
+            merged into one rectangle.
+        """
+        best = 0
+        for c in range(1, n):
+            if c + cols[c] > best + cols[best]:
+                best = c
+        bh = cols[best]
+        self._solid_fill(xl - best, yt - bh, xr - xl + 2 * best + 1,
+                         yb - yt + 2 * bh + 1, color)
+        # Rows above and below: row k from the center is as wide as the
+        # widest column that reaches it
+        height = cols[0]
+        c = best
+        k = bh + 1
+        while k <= height:
+            while cols[c] < k:
+                c -= 1
+            k_end = cols[c]
+            w = xr - xl + 2 * c + 1
+            self._solid_fill(xl - c, yt - k_end, w, k_end - k + 1, color)
+            self._solid_fill(xl - c, yb + k, w, k_end - k + 1, color)
+            k = k_end + 1
+        # Columns left and right
+        c = best + 1
+        while c < n:
+            h = cols[c]
+            c_end = c
+            while c_end + 1 < n and cols[c_end + 1] == h:
+                c_end += 1
+            w = c_end - c + 1
+            self._solid_fill(xl - c_end, yt - h, w, yb - yt + 2 * h + 1,
+                             color)
+            self._solid_fill(xr + c, yt - h, w, yb - yt + 2 * h + 1, color)
+            c = c_end + 1
+
+    def _solid_fill(self, x, y, w, h, color):
+        """Fill a rectangle, clipped to the screen, from a solid buffer.
+
+        Note:
+            The buffer is refilled only when the color changes.  The
+            rectangle is sent as one memory write, streamed from
+            preallocated views of the buffer, so filling allocates
+            nothing.
+        """
+        if x < 0:
+            w += x
+            x = 0
+        if y < 0:
+            h += y
+            y = 0
+        w = min(w, self.width - x)
+        h = min(h, self.height - y)
+        if w <= 0 or h <= 0:
+            return
+        if self._fb is not None:
+            self._fb_fill(x, y, w, h, color)
+            return
+        if color != self._solid_color:
+            if self._solid is None:
+                self._solid = bytearray(2048)
+                self._solid_mv = memoryview(self._solid)
+                # Views of 2, 4, 8 ... 2048 bytes
+                self._solid_views = tuple(self._solid_mv[:2 << k]
+                                          for k in range(11))
+            mv = self._solid_mv
+            mv[0] = color >> 8
+            mv[1] = color & 0xFF
+            size = len(mv)
+            n = 2
+            while n < size:
+                m = min(n, size - n)
+                mv[n:n + m] = mv[:m]
+                n += m
+            self._solid_color = color
+        if self._batch_len:
+            self.flush_batch()
+        size = w * h * 2
+        self._ram_window(x, y, x + w - 1, y + h - 1, size)
+        write = self.write_data
+        views = self._solid_views
+        full = views[10]
+        while size >= 2048:
+            write(full)
+            size -= 2048
+        k = 0
+        while size:  # Remainder by its binary digits
+            if size & (2 << k):
+                write(views[k])
+                size -= 2 << k
+            k += 1
 
     def draw_polygon(self, sides, x0, y0, r, color, rotate=0):
         """Draw an n-sided regular polygon.
@@ -524,7 +1905,7 @@ class Display(object):
         self.draw_vline(x, y, h, color)
         self.draw_vline(x2, y, h, color)
 
-    def draw_sprite(self, buf, x, y, w, h):
+    def draw_sprite(self, buf, x, y, w, h, key=None):
         """Draw a sprite (optimized for horizontal drawing).
 
         Args:
@@ -533,12 +1914,59 @@ class Display(object):
             y (int): Starting Y position.
             w (int): Width of drawing.
             h (int): Height of drawing.
+            key (int): RGB565 color drawn as transparent (default: None)
+        Note:
+            Sprites are clipped to the display.  Transparency is applied
+            while blitting in frame buffer mode; drawing straight to the
+            display sends each opaque run of a row as its own block
+            (see sprite.SpriteSheet for runs split ahead of time).
         """
         x2 = x + w - 1
         y2 = y + h - 1
         if self.is_off_grid(x, y, x2, y2):
             return
-        self.block(x, y, x2, y2, buf)
+        if self._fb is not None:
+            if self._batch_len:
+                self.flush_batch()
+            self._fb_block(x, y, x2, y2, buf, -1 if key is None else
+                           ((key & 0xFF) << 8) | (key >> 8))
+            return
+        cx0 = max(x, 0)
+        cy0 = max(y, 0)
+        cx1 = min(x2, self.width - 1)
+        cy1 = min(y2, self.height - 1)
+        if key is None:
+            if cx0 == x and cy0 == y and cx1 == x2 and cy1 == y2:
+                self.block(x, y, x2, y2, buf)
+                return
+            # Pack the visible rows into the strip and send one block
+            vw = (cx1 - cx0 + 1) * 2
+            rows = cy1 - cy0 + 1
+            strip = self._strip_buffer(vw * rows)
+            src = memoryview(buf)
+            s = ((cy0 - y) * w + cx0 - x) * 2
+            for r in range(rows):
+                strip[r * vw:(r + 1) * vw] = src[s:s + vw]
+                s += w * 2
+            self.block(cx0, cy0, cx1, cy1, strip[:vw * rows])
+            return
+        hi, lo = key >> 8, key & 0xFF
+        src = memoryview(buf)
+        for row in range(cy0, cy1 + 1):
+            s = ((row - y) * w + cx0 - x) * 2
+            col = cx0
+            while col <= cx1:
+                # Skip transparent pixels, then send the opaque run
+                while col <= cx1 and buf[s] == hi and buf[s + 1] == lo:
+                    col += 1
+                    s += 2
+                start = col
+                begin = s
+                while col <= cx1 and (buf[s] != hi or buf[s + 1] != lo):
+                    col += 1
+                    s += 2
+                if col > start:
+                    self.block(start, row, col - 1, row, src[begin:s])
 
     def draw_text(self, x, y, text, font, color,  background=0,
                   landscape=False, rotate_180=False, spacing=1):
@@ -554,35 +1982,91 @@ class Display(object):
             landscape (bool): Orientation (default: False = portrait)
             rotate_180 (bool): Rotate text by 180 degrees
             spacing (int): Pixels between letters (default: 1)
+        Note:
+            Letters, spacing and background are composed into one strip
+            that is written with a single block.  Strings larger than the
+            strip (TEXT_STRIP_BYTES, less when free RAM is short) are
+            sent in several blocks.  Drawing stops quietly at the first
+            letter that is missing from the font or lies off the display.
         """
+        limit = self.TEXT_STRIP_BYTES
+        if mem_free is not None:
+            limit = min(limit, mem_free() // 4)
+        glyphs = self._strip_glyphs
+        total = 0  # Pixels along the text direction in the current strip
+        h = 0
         iterable_text = reversed(text) if rotate_180 else text
         for letter in iterable_text:
-            # Get letter array and letter dimensions
-            w, h = self.draw_letter(x, y, letter, font, color, background,
-                                    landscape, rotate_180)
-            # Stop on error
-            if w == 0 or h == 0:
-                print('Invalid width {0} or height {1}'.format(w, h))
+            glyph = self._letter(letter, font, color, background, landscape,
+                                 rotate_180)
+            w, gh = glyph[1], glyph[2]
+            if w and gh and (
+                    self.is_off_grid(x, y - total - w, x + gh - 1,
+                                     y - total - 1) if landscape else
+                    self.is_off_grid(x + total, y, x + total + w - 1,
+                                     y + gh - 1)):
+                w = gh = 0  # Letter off the display
+            # Stop at a missing or clipped letter
+            if w == 0 or gh == 0:
+                self._draw_strip(x, y, total, h, spacing, background,
+                                 landscape)
                 return
+            if glyphs and ((total + w + spacing) * h * 2 > limit or
+                           gh != h):
+                # Strip full (or letter height changed): send what we have
+                self._draw_strip(x, y, total, h, spacing, background,
+                                 landscape)
+                if landscape:
+                    y -= total
+                else:
+                    x += total
+                total = 0
+            h = gh
+            glyphs.append(glyph)
+            total += w + spacing
+        self._draw_strip(x, y, total, h, spacing, background, landscape)
 
-            if landscape:
-                # Fill in spacing
-                if spacing:
-                    self.fill_hrect(x, y - w - spacing, h, spacing, background)
-                # Position y for next letter
-                y -= (w + spacing)
-            else:
-                # Fill in spacing
-                if spacing:
-                    self.fill_hrect(x + w, y, spacing, h, background)
-                # Position x for next letter
-                x += (w + spacing)
-
-                # # Fill in spacing
-                # if spacing:
-                #     self.fill_vrect(x + w, y, spacing, h, background)
-                # # Position x for next letter
-                # x += w + spacing
+    def _draw_strip(self, x, y, length, h, spacing, background, landscape):
+        """Compose the letters queued by draw_text and write one block.
+
+        Args:
+            x, y (int): Text origin as passed to draw_text.
+            length (int): Strip length in pixels, spacing included.
+            h (int): Letter height.
+            spacing (int): Pixels of background after each letter.
+            background (int): RGB565 background color.
+            landscape (bool): Letters run upwards from y.
+        """
+        glyphs = self._strip_glyphs
+        if not glyphs:
+            return
+        nbytes = length * h * 2
+        strip = self._strip_buffer(nbytes)
+        if spacing:
+            # Background in every pixel (doubling copies); letters then
+            # overwrite their part
+            strip[0] = background >> 8
+            strip[1] = background & 0xFF
+            n = 2
+            while n < nbytes:
+                k = min(n, nbytes - n)
+                strip[n:n + k] = strip[:k]
+                n += k
+        offset = 0
+        if landscape:
+            # Letters stack upwards, each one a contiguous h x w run
+            offset = length
+            for buf, w, _ in glyphs:
+                offset -= w + spacing
+                _copy_rows(strip, (offset + spacing) * h * 2, 0, buf, 1,
+                           w * h * 2)
+            self.block(x, y - length, x + h - 1, y - 1, strip[:nbytes])
+        else:
+            for buf, w, _ in glyphs:
+                _copy_rows(strip, offset * 2, length * 2, buf, h, w * 2)
+                offset += w + spacing
+            self.block(x, y, x + length - 1, y + h - 1, strip[:nbytes])
+        glyphs.clear()
 
     def draw_text8x8(self, x, y, text, color,  background=0,
                      rotate=0):
@@ -596,46 +2080,96 @@ class Display(object):
             background (int): RGB565 background color (default: black).
             rotate(int): 0, 90, 180, 270
         """
-        w = len(text) * 8
-        h = 8
+        n = len(text)
+        w = n * 8
         # Confirm coordinates in boundary
-        if self.is_off_grid(x, y, x + 7, y + 7):
+        if self.is_off_grid(x, y, x + 7, y + 7) or not n:
             return
-        buf = bytearray(w * 16)
-        fbuf = FrameBuffer(buf, w, h, RGB565)
+        # Glyphs come from the cache and are copied into one strip.  For
+        # 90 and 270 degrees the strip is 8 pixels wide, so each glyph is
+        # one contiguous 128 byte run; 180 and 270 reverse the text.
+        strip = self._strip_buffer(w * 16)
+        reverse = rotate == 180 or rotate == 270
+        for i in range(n):
+            glyph = self._glyph8x8(text[i], color, background, rotate)
+            j = n - 1 - i if reverse else i
+            if rotate == 90 or rotate == 270:
+                _copy_rows(strip, j * 128, 128, glyph, 1, 128)
+            else:
+                _copy_rows(strip, j * 16, w * 2, glyph, 8, 16)
+        if rotate == 90 or rotate == 270:
+            self.block(x, y, x + 7, y + w - 1, strip[:w * 16])
+        else:
+            self.block(x, y, x + w - 1, y + 7, strip[:w * 16])
+
+    def _glyph8x8(self, char, color, background, rotate):
+        """Return the 8x8 RGB565 buffer of one built-in font character.
+
+        Glyphs are rendered once and then served from the glyph cache.
+        """
+        key = (None, char, color, background, rotate)
+        buf = self.glyph_cache.get(key)
+        if buf is not None:
+            return buf
+        buf = bytearray(128)
+        fbuf = FrameBuffer(buf, 8, 8, RGB565)
         if background != 0:
             # Swap background color bytes to correct for framebuf endianness
-            b_color = ((background & 0xFF) << 8) | ((background & 0xFF00) >> 8)
-            fbuf.fill(b_color)
+            fbuf.fill(((background & 0xFF) << 8) | (background >> 8))
         # Swap text color bytes to correct for framebuf endianness
-        t_color = ((color & 0xFF) << 8) | ((color & 0xFF00) >> 8)
-        fbuf.text(text, 0, 0, t_color)
-        if rotate == 0:
-            self.block(x, y, x + w - 1, y + (h - 1), buf)
-        elif rotate == 90:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, h, w, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(y1, x1,
-                                fbuf.pixel(x1, (h - 1) - y1))
-            self.block(x, y, x + (h - 1), y + w - 1, buf2)
-        elif rotate == 180:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, w, h, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(x1, y1,
-                                fbuf.pixel((w - 1) - x1, (h - 1) - y1))
-            self.block(x, y, x + w - 1, y + (h - 1), buf2)
-        elif rotate == 270:
-            buf2 = bytearray(w * 16)
-            fbuf2 = FrameBuffer(buf2, h, w, RGB565)
-            for y1 in range(h):
-                for x1 in range(w):
-                    fbuf2.pixel(y1, x1,
-                                fbuf.pixel((w - 1) - x1, y1))
-            self.block(x, y, x + (h - 1), y + w - 1, buf2)
+        fbuf.text(char, 0, 0, ((color & 0xFF) << 8) | (color >> 8))
+        if rotate == 180:
+            rotated = bytearray(128)
+            _reverse_pixels(rotated, buf, 64)
+            buf = rotated
+        elif rotate == 90 or rotate == 270:
+            rotated = bytearray(128)
+            fbuf2 = FrameBuffer(rotated, 8, 8, RGB565)
+            for y1 in range(8):
+                for x1 in range(8):
+                    if rotate == 90:
+                        fbuf2.pixel(y1, x1, fbuf.pixel(x1, 7 - y1))
+                    else:
+                        fbuf2.pixel(y1, x1, fbuf.pixel(7 - x1, y1))
+            buf = rotated
+        return self.glyph_cache.put(key, buf, 128)
+
+    def _strip_buffer(self, nbytes):
+        """Return a reusable buffer view of at least nbytes for text."""
+        if self._strip is None or len(self._strip) < nbytes:
+            self._strip = bytearray(nbytes)
+            self._strip_mv = memoryview(self._strip)
+        return self._strip_mv
+
+    def draw_thick_line(self, x1, y1, x2, y2, width, color):
+        """Draw a line of any width with rounded ends as one fill.
+
+        Args:
+            x1, y1, x2, y2 (int): End points (centers of the round ends).
+            width (int): Line width in pixels.
+            color (int): RGB565 color value.
+        Note:
+            The line is a single convex polygon passed to fill_poly, so
+            each row is sent as one span.  Segments that share end
+            points join without gaps, which suits drawing a touch stroke
+            a segment at a time.  Equal end points draw a round dot.
+        """
+        if width <= 1:
+            self.draw_line(x1, y1, x2, y2, color)
+            return
+        r = width / 2
+        dx, dy = x2 - x1, y2 - y1
+        length = sqrt(dx * dx + dy * dy)
+        ux, uy = (dx / length, dy / length) if length else (1, 0)
+        h = 0.7071
+        points = []
+        # Half octagon around each end, from one side of the line to the
+        # other: (along, across) unit offsets at -90 to 90 degrees
+        for cx, cy, sx, sy in ((x2, y2, ux, uy), (x1, y1, -ux, -uy)):
+            for a, b in ((0, -1), (h, -h), (1, 0), (h, h), (0, 1)):
+                points.append((int(round(cx + r * (a * sx - b * sy))),
+                               int(round(cy + r * (a * sy + b * sx)))))
+        self.fill_poly(points, color)
 
     def draw_vline(self, x, y, h, color=None):
         """Draw a vertical line."""
@@ -648,8 +2182,13 @@ class Display(object):
         if color is not None:
             self.set_color(color)
 
-        line = self._color_bytes * h
-        self.block(x, y, x, y + h - 1, line)
+        self._solid_fill(x, y, 1, h, self._color)
+
+    def end_batch(self):
+        """Finish a begin_batch section and flush pending pixels."""
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self.flush_batch()
 
     def fill_circle(self, x0, y0, r, color):
         """Draw a filled circle.
@@ -660,24 +2199,9 @@ class Display(object):
             r (int): Radius.
             color (int): RGB565 color value.
         """
-        f = 1 - r
-        dx = 1
-        dy = -r - r
-        x = 0
-        y = r
-        self.draw_vline(x0, y0 - r, 2 * r + 1, color)
-        while x < y:
-            if f >= 0:
-                y -= 1
-                dy += 2
-                f += dy
-            x += 1
-            dx += 2
-            f += dx
-            self.draw_vline(x0 + x, y0 - y, 2 * y + 1, color)
-            self.draw_vline(x0 - x, y0 - y, 2 * y + 1, color)
-            self.draw_vline(x0 - y, y0 - x, 2 * x + 1, color)
-            self.draw_vline(x0 + y, y0 - x, 2 * x + 1, color)
+        cols = self._point_buffer(r + 1)  # Column half heights
+        _circle_cols(cols, r)
+        self._fill_quadrants(cols, r + 1, x0, x0, y0, y0, color)
 
     def fill_ellipse(self, x0, y0, a, b, color):
         """Draw a filled ellipse.
@@ -693,43 +2217,9 @@ class Display(object):
             up to complete on a full pixel.  Therefore the major and
             minor axes are increased by 1.
         """
-        a2 = a * a
-        b2 = b * b
-        twoa2 = a2 + a2
-        twob2 = b2 + b2
-        x = 0
-        y = b
-        px = 0
-        py = twoa2 * y
-        # Plot initial points
-        self.draw_line(x0, y0 - y, x0, y0 + y, color)
-        # Region 1
-        p = round(b2 - (a2 * b) + (0.25 * a2))
-        while px < py:
-            x += 1
-            px += twob2
-            if p < 0:
-                p += b2 + px
-            else:
-                y -= 1
-                py -= twoa2
-                p += b2 + px - py
-            self.draw_line(x0 + x, y0 - y, x0 + x, y0 + y, color)
-            self.draw_line(x0 - x, y0 - y, x0 - x, y0 + y, color)
-        # Region 2
-        p = round(b2 * (x + 0.5) * (x + 0.5) +
-                  a2 * (y - 1) * (y - 1) - a2 * b2)
-        while y > 0:
-            y -= 1
-            py -= twoa2
-            if p > 0:
-                p += a2 - py
-            else:
-                x += 1
-                px += twob2
-                p += a2 - py + px
-            self.draw_line(x0 + x, y0 - y, x0 + x, y0 + y, color)
-            self.draw_line(x0 - x, y0 - y, x0 - x, y0 + y, color)
+        cols = self._point_buffer(a + b + 2)  # Column half heights
+        n = _ellipse_cols(cols, a, b)
+        self._fill_quadrants(cols, n, x0, x0, y0, y0, color)
 
     def fill_hrect(self, x, y, w, h, color):
         """Draw a filled rectangle (optimized for horizontal drawing).
@@ -743,23 +2233,7 @@ class Display(object):
         """
         if self.is_off_grid(x, y, x + w - 1, y + h - 1):
             return
-        chunk_height = 1024 // w
-        chunk_count, remainder = divmod(h, chunk_height)
-        chunk_size = chunk_height * w
-        chunk_y = y
-        if chunk_count:
-            buf = color.to_bytes(2, 'big') * chunk_size
-            for c in range(0, chunk_count):
-                self.block(x, chunk_y,
-                           x + w - 1, chunk_y + chunk_height - 1,
-                           buf)
-                chunk_y += chunk_height
-
-        if remainder:
-            buf = color.to_bytes(2, 'big') * remainder * w
-            self.block(x, chunk_y,
-                       x + w - 1, chunk_y + remainder - 1,
-                       buf)
+        self._solid_fill(x, y, w, h, color)
 
     def fill_rectangle(self, x, y, w, h, color):
         """Draw a filled rectangle.
@@ -778,6 +2252,119 @@ class Display(object):
         else:
             self.fill_vrect(x, y, w, h, color)
 
+    def fill_round_rectangle(self, x, y, w, h, r, color):
+        """Draw a filled rectangle with rounded corners.
+
+        Args:
+            x (int): Starting X position.
+            y (int): Starting Y position.
+            w (int): Width of rectangle.
+            h (int): Height of rectangle.
+            r (int): Corner radius (limited to fit the rectangle).
+            color (int): RGB565 color value.
+        """
+        if w <= 0 or h <= 0:
+            return
+        r = max(0, min(r, (w - 1) >> 1, (h - 1) >> 1))
+        cols = self._point_buffer(r + 1)  # Column half heights
+        _circle_cols(cols, r)
+        self._fill_quadrants(cols, r + 1, x + r, x + w - 1 - r,
+                             y + r, y + h - 1 - r, color)
+
+    def fill_poly(self, points, color):
+        """Draw a filled polygon with arbitrary vertices.
+
+        Args:
+            points (list): Vertex (x, y) pairs.  The last vertex joins
+                the first.
+            color (int): RGB565 color value.
+        Note:
+            A pixel is filled when its center is inside the polygon.
+            Centers on a left or top edge count as inside and those on a
+            right or bottom edge do not, so polygons that share an edge
+            neither overlap nor leave a gap.  Concave and
+            self-intersecting polygons are filled with the even-odd rule.
+        """
+        n = len(points)
+        if n < 3:
+            return
+        top = max(0, min(p[1] for p in points))
+        bottom = min(self.height, max(p[1] for p in points))
+        if top >= bottom:
+            return
+        # Signed area, turn directions and changes of vertical direction
+        area = 0
+        turns = 0
+        flips = 0
+        x0, y0 = points[-2]
+        x1, y1 = points[-1]
+        down = 0
+        for x2, y2 in points:
+            area += x1 * y2 - x2 * y1
+            cross = (x1 - x0) * (y2 - y1) - (y1 - y0) * (x2 - x1)
+            if cross > 0:
+                turns |= 1
+            elif cross < 0:
+                turns |= 2
+            if y2 != y1:
+                if down and (y2 > y1) != (down > 0):
+                    flips += 1
+                down = 1 if y2 > y1 else -1
+            x0, y0, x1, y1 = x1, y1, x2, y2
+        if not area:
+            return
+        if turns == 3 or flips > 2:  # Not convex
+            self._fill_poly_even_odd(points, top, bottom, color)
+            return
+        # Convex: each row has one left and one right crossing
+        spans = self._edge_buffer()
+        x0, y0 = points[-1]
+        for x1, y1 in points:
+            if y0 != y1:
+                # Downward edges are on the right of a clockwise polygon
+                right = 1 if (y1 > y0) == (area > 0) else 0
+                if y0 < y1:
+                    xa, ya, xb, yb = x0, y0, x1, y1
+                else:
+                    xa, ya, xb, yb = x1, y1, x0, y0
+                start = max(ya, top)
+                end = min(yb, bottom)
+                if start < end:
+                    den = yb - ya
+                    dx = xb - xa
+                    num = xa * den + (start - ya) * dx
+                    q = -(-num // den)  # Ceiling
+                    qs, rs = divmod(dx, den)
+                    _edge_spans(spans, (start - top) * 2 + right, end - start,
+                                q - right, q * den - num, qs, rs, den)
+            x0, y0 = x1, y1
+        self._fill_spans(spans, top, bottom - top, color)
+
+    def _fill_poly_even_odd(self, points, top, bottom, color):
+        """Fill rows top...bottom - 1 of any polygon, row by row."""
+        xs = array('h', bytes(2 * len(points)))  # Crossings of one row
+        for y in range(top, bottom):
+            k = 0
+            x0, y0 = points[-1]
+            for x1, y1 in points:
+                if y0 <= y < y1 or y1 <= y < y0:
+                    den = y1 - y0
+                    num = x0 * den + (y - y0) * (x1 - x0)
+                    if den < 0:
+                        num = -num
+                        den = -den
+                    x = -(-num // den)
+                    # Insertion sort
+                    i = k
+                    while i and xs[i - 1] > x:
+                        xs[i] = xs[i - 1]
+                        i -= 1
+                    xs[i] = x
+                    k += 1
+                x0, y0 = x1, y1
+            for i in range(0, k - 1, 2):
+                self._solid_fill(xs[i], y, xs[i + 1] - xs[i], 1, color)
+
     def fill_polygon(self, sides, x0, y0, r, color, rotate=0):
         """Draw a filled n-sided regular polygon.
 
@@ -799,66 +2386,32 @@ class Display(object):
         for s in range(n):
             t = 2.0 * pi * s / sides + theta
             coords.append([int(r * cos(t) + x0), int(r * sin(t) + y0)])
-        # Starting point
+        # Minimum and maximum x of each row, widened edge by edge
+        top = min(c[1] for c in coords)
+        rows = max(c[1] for c in coords) - top + 1
+        spans = self._span_buffer(rows)
+        for i in range(0, rows * 2, 2):
+            spans[i] = 32767
+            spans[i + 1] = -32768
         x1, y1 = coords[0]
-        # Minimum Maximum X dict
-        xdict = {y1: [x1, x1]}
-        # Iterate through coordinates
-        for row in coords[1:]:
-            x2, y2 = row
-            xprev, yprev = x2, y2
-            # Calculate perimeter
-            # Check for horizontal side
-            if y1 == y2:
-                if x1 > x2:
-                    x1, x2 = x2, x1
-                if y1 in xdict:
-                    xdict[y1] = [min(x1, xdict[y1][0]), max(x2, xdict[y1][1])]
-                else:
-                    xdict[y1] = [x1, x2]
-                x1, y1 = xprev, yprev
-                continue
-            # Non horizontal side
-            # Changes in x, y
-            dx = x2 - x1
-            dy = y2 - y1
-            # Determine how steep the line is
-            is_steep = abs(dy) > abs(dx)
-            # Rotate line
-            if is_steep:
-                x1, y1 = y1, x1
-                x2, y2 = y2, x2
-            # Swap start and end points if necessary
-            if x1 > x2:
-                x1, x2 = x2, x1
-                y1, y2 = y2, y1
-            # Recalculate differentials
-            dx = x2 - x1
-            dy = y2 - y1
-            # Calculate error
-            error = dx >> 1
-            ystep = 1 if y1 < y2 else -1
-            y = y1
-            # Calcualte minimum and maximum x values
-            for x in range(x1, x2 + 1):
-                if is_steep:
-                    if x in xdict:
-                        xdict[x] = [min(y, xdict[x][0]), max(y, xdict[x][1])]
-                    else:
-                        xdict[x] = [y, y]
-                else:
-                    if y in xdict:
-                        xdict[y] = [min(x, xdict[y][0]), max(x, xdict[y][1])]
-                    else:
-                        xdict[y] = [x, x]
-                error -= abs(dy)
-                if error < 0:
-                    y += ystep
-                    error += dx
-            x1, y1 = xprev, yprev
-        # Fill polygon
-        for y, x in xdict.items():
-            self.draw_hline(x[0], y, x[1] - x[0] + 2, color)
+        for x2, y2 in coords[1:]:
+            _poly_edge(spans, top, x1, y1, x2, y2)
+            x1, y1 = x2, y2
+        # Fill polygon (spans reach one pixel past the right edge)
+        for i in range(1, rows * 2, 2):
+            spans[i] += 1
+        self._fill_convex(spans, top, rows, color)
+
+    def fill_triangle(self, x1, y1, x2, y2, x3, y3, color):
+        """Draw a filled triangle.
+
+        Args:
+            x1, y1, x2, y2, x3, y3 (int): Vertex coordinates.
+            color (int): RGB565 color value.
+        Note:
+            Edges follow the same rule as fill_poly.
+        """
+        self.fill_poly(((x1, y1), (x2, y2), (x3, y3)), color)
 
     def fill_vrect(self, x, y, w, h, color):
         """Draw a filled rectangle (optimized for vertical drawing).
@@ -872,23 +2425,168 @@ class Display(object):
         """
         if self.is_off_grid(x, y, x + w - 1, y + h - 1):
             return
-        chunk_width = 1024 // h
-        chunk_count, remainder = divmod(w, chunk_width)
-        chunk_size = chunk_width * h
-        chunk_x = x
-        if chunk_count:
-            buf = color.to_bytes(2, 'big') * chunk_size
-            for c in range(0, chunk_count):
-                self.block(chunk_x, y,
-                           chunk_x + chunk_width - 1, y + h - 1,
-                           buf)
-                chunk_x += chunk_width
-
-        if remainder:
-            buf = color.to_bytes(2, 'big') * remainder * h
-            self.block(chunk_x, y,
-                       chunk_x + remainder - 1, y + h - 1,
-                       buf)
+        self._solid_fill(x, y, w, h, color)
+
+    def flush(self, rows=16):
+        """Send the off-screen frame, yielding to other tasks between strips.
+
+        Args:
+            rows (Optional int): Rows per strip for full frame buffer mode
+                (default 16).  Banded mode sends one band per strip.
+        Returns:
+            coroutine: Await it, or pass it to asyncio.create_task(), to
+                run the flush.  It returns the bytes sent over SPI.
+        Note:
+            Cooperative counterpart of show() for asyncio apps.  The
+            pending frame is detached when flush() is called, so anything
+            drawn afterwards belongs to the next frame.  In banded mode
+            the app can therefore record the next frame while this one
+            streams.  The full frame buffer is sent from where it is
+            drawn, so drawing during a full frame flush first sends the
+            rest of the frame without yielding; it never tears.  Strips
+            alternate between two buffers.  Only one
+            flush runs at a time; a second one waits for the first.  On a
+            shared bus (see spi_bus) the bus is held until the frame is
+            sent; Touch.poll returns None meanwhile.
+            Timing of the last flush is returned by frame_timing().
+        """
+        if self._flushing or self._fb is None:
+            return self._flush(None, rows)
+        self._flushing = True
+        return self._flush(self._take_frame(), rows)
+
+    async def _flush(self, frame, rows):
+        """Stream a detached frame (see flush)."""
+        import asyncio
+        if frame is None:
+            while self._flushing:
+                await asyncio.sleep(0)
+            if self._fb is None:
+                return 0
+            self._flushing = True
+            frame = self._take_frame()
+        try:
+            if self._band_bufs is not None and len(self._band_bufs) == 1:
+                self._band_bufs.append(bytearray(len(self._band_bufs[0])))
+            start = ticks_us()
+            if self._flush_end is None:
+                draw = 0
+            else:
+                draw = ticks_diff(start, self._flush_end)
+            self._render_us = 0
+            self._transfer_us = 0
+            self._flush_bytes = 0
+            strips = self._strips(frame, rows)
+            spi = self.spi
+            hold = getattr(spi, 'acquire', None)
+            if hold is not None:
+                hold()
+            try:
+                if self._band_bufs is None:
+                    self._flush_strips = strips  # See _finish_flush
+                while self._send_strip(strips):
+                    await asyncio.sleep(0)
+            finally:
+                self._flush_strips = None
+                if hold is not None:
+                    spi.release()
+            sent = self._flush_bytes
+            self._flush_end = ticks_us()
+            self._timing = (draw, self._render_us, self._transfer_us,
+                            ticks_diff(self._flush_end, start), sent)
+        finally:
+            self._flushing = False
+        self.frame_bytes = sent
+        return sent
+
+    def _finish_flush(self):
+        """Send the rest of a full frame flush before the frame changes."""
+        strips = self._flush_strips
+        self._flush_strips = None
+        while self._send_strip(strips):
+            pass
+
+    def _send_strip(self, strips):
+        """Send the next strip of a flush; returns False once all are sent."""
+        for x0, y0, x1, y1, data in strips:
+            t = ticks_us()
+            self._flush_bytes += self._write_block(x0, y0, x1, y1, data)
+            self._transfer_us += ticks_diff(ticks_us(), t)
+            return True
+        return False
+
+    def flush_batch(self):
+        """Send all pixels queued in the pixel batch."""
+        if self._pixel_box is not None:
+            self._mark_dirty(*self._pixel_box)
+            self._pixel_box = None
+        if self._batch_len:
+            count = self._batch_len
+            self._batch_len = 0
+            self.write_pixels(self._batch, count)
+
+    def frame_timing(self):
+        """Return frame pacing statistics for the last flush().
+
+        Returns:
+            dict: draw_us (time between the previous flush finishing and
+                this one starting, i.e. app drawing time), render_us
+                (composing strips), transfer_us (SPI writes), flush_us
+                (whole flush including time yielded to other tasks) and
+                bytes (bytes sent).
+        """
+        draw, render, transfer, total, sent = self._timing
+        return {'draw_us': draw, 'render_us': render,
+                'transfer_us': transfer, 'flush_us': total, 'bytes': sent}
+
+    def framebuffer(self, enable=True, band_height=0, background=0):
+        """Enables or disables off-screen frame buffer mode.
+
+        Args:
+            enable (Optional bool): True=enable, False=disable
+            band_height (Optional int): 0 (default) buffers the full frame,
+                otherwise the frame is rendered in bands of this height.
+            background (Optional int): RGB565 color each band starts from
+                in banded mode (default: black).
+        Note:
+            While enabled primitives draw off-screen and nothing is sent
+            until show() is called.  A full frame needs width x height x 2
+            bytes (153,600 for 240x320), which normally requires PSRAM.
+            Banded mode records a display list of the frame instead and
+            show() replays it into a width x band_height strip one band
+            at a time, so RAM use is constant.  The display list is
+            cleared by show(), so each frame must be drawn completely.
+            Disabling the mode shows any pending changes first.
+        """
+        if not enable:
+            if self._fb is not None:
+                self.show()
+                self._fb = None
+                self._fb_buf = None
+                self._band_bufs = None
+                self._dirty = []
+            return
+        if self._fb is not None:
+            return
+        self.flush_batch()
+        if band_height:
+            self._band_bufs = [bytearray(self.width * band_height * 2)]
+            self._band_height = band_height
+            self._band_background = (((background & 0xFF) << 8) |
+                                     (background >> 8))
+            # Two lists: one is replayed while the next frame records
+            self._fb = DisplayList(self.width, self.height)
+            self._fb_next = DisplayList(self.width, self.height)
+            self._dirty = None
+            return
+        size = self.width * self.height * 2
+        try:
+            self._fb_buf = bytearray(size)
+        except MemoryError:
+            raise MemoryError('Frame buffer needs {0} bytes.'.format(size))
+        self._fb = FrameBuffer(self._fb_buf, self.width, self.height, RGB565)
+        self._fb_strips = [bytearray(2048), bytearray(2048)]
+        self._dirty = []
 
     def invert(self, enable=True):
         """Enables or disables inversion of display colors.
@@ -901,6 +2599,10 @@ class Display(object):
         else:
             self.write_cmd(self.INVOFF)
 
+    def is_buffered(self):
+        """Check if drawing goes to the off-screen frame buffer."""
+        return self._fb is not None
+
     def is_off_grid(self, x0, y0, x1, y1):
         """Check if any part of the rectangle is off the display."""
         return (x1 < 0 or y1 < 0 or x0 >= self.width or y0 >= self.height)
@@ -919,6 +2621,97 @@ class Display(object):
         with open(path, "rb") as f:
             return f.read(buf_size)
 
+    def profile(self, enable=True):
+        """Enables or disables SPI and primitive instrumentation.
+
+        Args:
+            enable (Optional bool): True=enable, False=disable
+        Note:
+            While enabled, command bytes, data bytes, CS assertions and
+            SPI transfers are counted.  Each call of a primitive in PROFILED is also timed,
+            and SPI traffic and heap allocation (MicroPython only) are
+            charged to it.  Nested primitives are charged to the
+            outermost call.  Read the results with stats().  Disabled
+            profiling adds no overhead.
+        """
+        if not enable:
+            if self._prof is not None:
+                self.spi = self.spi.spi
+                for name in self.PROFILED + ('write_cmd', 'write_data',
+                                             'write_pixels'):
+                    delattr(self, name)
+                self._prof = None
+                if implementation.name == 'circuitpython':
+                    self.write_cmd = self.write_cmd_cpy
+                    self.write_data = self.write_data_cpy
+                    self.write_pixels = self.write_pixels_cpy
+                else:
+                    self.write_cmd = self.write_cmd_mpy
+                    self.write_data = self.write_data_mpy
+                    self.write_pixels = self.write_pixels_mpy
+            return
+        if self._prof is not None:
+            return
+        counters = [0, 0, 0, 0]  # Command and data bytes, CS, transfers
+        self._prof = counters
+        self._prof_calls = {}
+        self._prof_depth = 0
+        self._prof_start = ticks_us()
+        if implementation.name == 'circuitpython':
+            self.spi = SpiCounter(self.spi, lambda: not self.dc.value,
+                                  counters)
+        else:
+            self.spi = SpiCounter(self.spi, lambda: not self.dc(), counters)
+        write_cmd = self.write_cmd
+        write_data = self.write_data
+        write_pixels = self.write_pixels
+
+        def counted_cmd(command, *args):
+            counters[2] += 1
+            write_cmd(command, *args)
+
+        def counted_data(data):
+            counters[2] += 1
+            write_data(data)
+
+        def counted_pixels(pixels, count):
+            counters[2] += 1
+            write_pixels(pixels, count)
+
+        self.write_cmd = counted_cmd
+        self.write_data = counted_data
+        self.write_pixels = counted_pixels
+        for name in self.PROFILED:
+            setattr(self, name, self._profiled(name, getattr(self, name)))
+
+    def _profiled(self, name, func):
+        """Wrap a primitive to charge its time and SPI traffic to name."""
+        counters = self._prof
+
+        def wrapper(*args, **kwargs):
+            if self._prof_depth:
+                return func(*args, **kwargs)
+            self._prof_depth = 1
+            cmd, data, cs, _ = counters
+            heap = mem_alloc() if mem_alloc else 0
+            start = ticks_us()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = ticks_diff(ticks_us(), start)
+                alloc = mem_alloc() - heap if mem_alloc else 0
+                entry = self._prof_calls.get(name)
+                if entry is None:
+                    entry = self._prof_calls[name] = [0, 0, 0, 0, 0, 0]
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] += counters[0] - cmd
+                entry[3] += counters[1] - data
+                entry[4] += counters[2] - cs
+                entry[5] += max(alloc, 0)  # A collection can shrink the heap
+                self._prof_depth = 0
+        return wrapper
+
     def reset_cpy(self):
         """Perform reset: Low=initialization, High=normal operation.
 
@@ -945,7 +2738,36 @@ class Display(object):
         Args:
             y (int): Number of pixels to scroll display.
         """
-        self.write_cmd(self.VSCRSADD, y >> 8, y & 0xFF)
+        buf = self._scroll_buf
+        buf[0] = y >> 8
+        buf[1] = y & 0xFF
+        self.write_cmd(self.VSCRSADD)
+        self.write_data(buf)
+
+    def set_rotation(self, rotation, mirror=False):
+        """Change the display orientation.
+
+        Args:
+            rotation (int): 0, 90, 180 or 270.
+            mirror (Optional bool): Mirror display (default False)
+        Note:
+            Width and height are swapped when changing between portrait
+            and landscape.  MADCTL is only sent if it changes.  Existing
+            screen content is not redrawn.
+        """
+        if (mirror, rotation) not in self.MIRROR_ROTATE:
+            raise ValueError('Rotation must be 0, 90, 180 or 270.')
+        if self._fb is not None:
+            raise ValueError('Disable the frame buffer before rotating.')
+        madctl = self.MIRROR_ROTATE[mirror, rotation] | (self.rotation & 0x08)
+        if madctl == self.rotation:
+            return
+        self.flush_batch()
+        if (madctl ^ self.rotation) & 0x20:  # Row/column exchange changed
+            self.width, self.height = self.height, self.width
+        self.rotation = madctl
+        self.write_cmd(self.MADCTL, madctl)
+        self._caset = self._paset = self._ram_next = -1
 
     def set_scroll(self, top, bottom):
         """Set the height of the top and bottom scroll margins.
@@ -964,6 +2786,105 @@ class Display(object):
                            bottom >> 8,
                            bottom & 0xFF)
 
+    def show(self):
+        """Send the changed regions of the frame buffer to the display.
+
+        Returns:
+            int: Bytes sent over SPI, including address commands.  The
+                value is also kept in the frame_bytes attribute.
+        Note:
+            In banded mode the whole frame is composed and sent.  On a
+            shared bus (see spi_bus) the bus is held for the whole frame,
+            so touch samples wait until it has been sent.
+        """
+        if self._fb is None:
+            return 0
+        spi = self.spi
+        hold = getattr(spi, 'acquire', None)
+        if hold is not None:
+            hold()
+        sent = 0
+        try:
+            for x0, y0, x1, y1, data in self._strips(self._take_frame()):
+                sent += self._write_block(x0, y0, x1, y1, data)
+        finally:
+            if hold is not None:
+                spi.release()
+        self.frame_bytes = sent
+        return sent
+
+    def _take_frame(self):
+        """Detach the pending frame so drawing can continue on the next.
+
+        Returns:
+            DisplayList in banded mode, else the list of dirty rectangles.
+        """
+        self.flush_batch()
+        if self._band_bufs is not None:
+            dl = self._fb
+            self._fb = self._fb_next
+            self._fb_next = dl
+            return dl
+        dirty = self._dirty
+        self._dirty = []
+        return dirty
+
+    def _strips(self, frame, rows=0):
+        """Yield (x0, y0, x1, y1, data) strips of a detached frame.
+
+        Args:
+            frame: Frame returned by _take_frame.
+            rows (int): Split full width regions of the frame buffer into
+                strips of at most this many rows (0 = no limit).
+        Note:
+            Strips are composed into alternating buffers, so one strip
+            can still be in flight while the next is prepared.
+        """
+        if self._band_bufs is not None:
+            w = self.width
+            h = self._band_height
+            bufs = self._band_bufs
+            n = 0
+            for y in range(0, self.height, h):
+                bh = min(h, self.height - y)
+                buf = bufs[n % len(bufs)]
+                n += 1
+                fb = FrameBuffer(buf, w, bh, RGB565)
+                start = ticks_us()
+                fb.fill(self._band_background)
+                frame.render(fb, y, bh)
+                self._render_us += ticks_diff(ticks_us(), start)
+                yield 0, y, w - 1, y + bh - 1, memoryview(buf)[:w * bh * 2]
+            frame.reset()
+            return
+        stride = self.width * 2
+        buf = memoryview(self._fb_buf)
+        strips = self._fb_strips
+        n = 0
+        for x0, y0, x1, y1 in frame:
+            w = x1 - x0 + 1
+            if w == self.width:
+                # Full rows are contiguous in the frame buffer
+                step = rows or (y1 - y0 + 1)
+                for y in range(y0, y1 + 1, step):
+                    ye = min(y + step - 1, y1)
+                    yield x0, y, x1, ye, buf[y * stride:(ye + 1) * stride]
+                continue
+            row_bytes = w * 2
+            step = 2048 // row_bytes
+            for y in range(y0, y1 + 1, step):
+                ye = min(y + step - 1, y1)
+                strip = strips[n & 1]
+                n += 1
+                start = ticks_us()
+                for i in range(ye - y + 1):
+                    src = (y + i) * stride + x0 * 2
+                    strip[i * row_bytes:(i + 1) * row_bytes] = \
+                        buf[src:src + row_bytes]
+                self._render_us += ticks_diff(ticks_us(), start)
+                yield x0, y, x1, ye, memoryview(strip)[:(ye - y + 1) *
+                                                       row_bytes]
+
     def sleep(self, enable=True):
         """Enters or exits sleep mode.
 
@@ -975,20 +2896,58 @@ class Display(object):
         else:
             self.write_cmd(self.SLPOUT)
 
+    def stats(self, reset=True):
+        """Return profiler statistics collected since the last reset.
+
+        Args:
+            reset (Optional bool): Zero the statistics afterwards, so
+                calling stats() once per frame gives per-frame figures
+                (default True).
+        Returns:
+            dict: commands, data_bytes, cs_toggles, transfers (SPI
+                writes) and us (elapsed time) totals, plus primitives mapping each primitive called to
+                a dict of calls, us, commands, data_bytes, cs_toggles and
+                alloc_bytes.  None if profiling is disabled.
+        """
+        counters = self._prof
+        if counters is None:
+            return None
+        now = ticks_us()
+        primitives = {}
+        for name, e in self._prof_calls.items():
+            primitives[name] = {'calls': e[0], 'us': e[1], 'commands': e[2],
+                                'data_bytes': e[3], 'cs_toggles': e[4],
+                                'alloc_bytes': e[5]}
+        result = {'commands': counters[0], 'data_bytes': counters[1],
+                  'cs_toggles': counters[2], 'transfers': counters[3],
+                  'us': ticks_diff(now, self._prof_start),
+                  'primitives': primitives}
+        if reset:
+            counters[0] = counters[1] = counters[2] = counters[3] = 0
+            self._prof_calls = {}
+            self._prof_start = now
+        return result
+
     def write_cmd_mpy(self, command, *args):
         """Write command to OLED (MicroPython).
 
         Args:
             command (byte): ILI9341 command code.
             *args (optional bytes): Data to transmit.
+        Note:
+            Arguments are copied into a preallocated scratch buffer.  Hot
+            paths patch their own parameter buffer and pass it to
+            write_data instead of using *args.
         """
+        cmd = self._cmd_buf
+        cmd[0] = command
         self.dc(0)
         self.cs(0)
-        self.spi.write(bytearray([command]))
+        self.spi.write(cmd)
         self.cs(1)
         # Handle any passed data
         if len(args) > 0:
-            self.write_data(bytearray(args))
+            self._write_args(args)
 
     def write_cmd_cpy(self, command, *args):
         """Write command to OLED (CircuitPython).
@@ -997,17 +2956,27 @@ class Display(object):
             command (byte): ILI9341 command code.
             *args (optional bytes): Data to transmit.
         """
+        cmd = self._cmd_buf
+        cmd[0] = command
         self.dc.value = False
         self.cs.value = False
         # Confirm SPI locked before writing
         while not self.spi.try_lock():
             pass
-        self.spi.write(bytearray([command]))
+        self.spi.write(cmd)
         self.spi.unlock()
         self.cs.value = True
         # Handle any passed data
         if len(args) > 0:
-            self.write_data(bytearray(args))
+            self._write_args(args)
+
+    def _write_args(self, args):
+        """Write command arguments (up to 16) from the scratch buffer."""
+        n = len(args)
+        buf = self._args_views[n]
+        for i in range(n):
+            buf[i] = args[i]
+        self.write_data(buf)
 
     def write_data_mpy(self, data):
         """Write data to OLED (MicroPython).
@@ -1034,3 +3003,111 @@ class Display(object):
         self.spi.write(data)
         self.spi.unlock()
         self.cs.value = True
+
+    def write_pixels_mpy(self, pixels, count):
+        """Write queued single pixels in one CS assertion (MicroPython).
+
+        Args:
+            pixels (array): X, Y, RGB565 color triples.
+            count (int): Number of pixels to write.
+        """
+        self.cs(0)
+        self._write_pixel_runs(pixels, count, self.dc)
+        self.cs(1)
+
+    def write_pixels_cpy(self, pixels, count):
+        """Write queued single pixels in one CS assertion (CircuitPython).
+
+        Args:
+            pixels (array): X, Y, RGB565 color triples.
+            count (int): Number of pixels to write.
+        """
+        self.cs.value = False
+        # Confirm SPI locked before writing
+        while not self.spi.try_lock():
+            pass
+        self._write_pixel_runs(pixels, count, self._dc_cpy)
+        self.spi.unlock()
+        self.cs.value = True
+
+    def _dc_cpy(self, value):
+        self.dc.value = bool(value)
+
+    def _write_pixel_runs(self, pixels, count, dc):
+        """Stream queued pixels while the caller holds CS low.
+
+        Consecutive pixels of the same color that continue a horizontal
+        or vertical run share one address window, and column or page
+        addresses are only re-sent when they change.
+        """
+        write = self.spi.write
+        cmd = self._cmd_buf
+        param = self._window
+        run = self._batch_run
+        run_max = len(run) >> 1
+        views = self._batch_views
+        run_color = -1
+        x_offset = self.x_offset
+        y_offset = self.y_offset
+        last_col = self._caset
+        last_page = self._paset
+        i = 0
+        end = count * 3
+        while i < end:
+            x0 = x1 = pixels[i]
+            y0 = y1 = pixels[i + 1]
+            color = pixels[i + 2]
+            n = 1
+            i += 3
+            while i < end and n < run_max and pixels[i + 2] == color:
+                if y1 == y0 and pixels[i + 1] == y0 and pixels[i] == x1 + 1:
+                    x1 += 1
+                elif x1 == x0 and pixels[i] == x0 and pixels[i + 1] == y1 + 1:
+                    y1 += 1
+                else:
+                    break
+                n += 1
+                i += 3
+            x0 += x_offset
+            x1 += x_offset
+            y0 += y_offset
+            y1 += y_offset
+            col = (x0 << 16) | x1
+            if col != last_col:
+                cmd[0] = self.SET_COLUMN
+                param[0] = x0 >> 8
+                param[1] = x0 & 0xff
+                param[2] = x1 >> 8
+                param[3] = x1 & 0xff
+                dc(0)
+                write(cmd)
+                dc(1)
+                write(param)
+                last_col = col
+            page = (y0 << 16) | y1
+            if page != last_page:
+                cmd[0] = self.SET_PAGE
+                param[0] = y0 >> 8
+                param[1] = y0 & 0xff
+                param[2] = y1 >> 8
+                param[3] = y1 & 0xff
+                dc(0)
+                write(cmd)
+                dc(1)
+                write(param)
+                last_page = page
+            if color != run_color:
+                hi = color >> 8
+                lo = color & 0xff
+                for j in range(0, len(run), 2):
+                    run[j] = hi
+                    run[j + 1] = lo
+                run_color = color
+            cmd[0] = self.WRITE_RAM
+            dc(0)
+            write(cmd)
+            dc(1)
+            write(views[n])
+        self._caset = last_col
+        self._paset = last_page
+        self._ram_next = -1
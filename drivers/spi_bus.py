@@ -0,0 +1,156 @@
+"""Shared SPI bus module."""
+
+
+class SharedSPI(object):
+    """One SPI bus shared by devices with different settings.
+
+    Each device gets an SPIDevice, which its driver uses in place of the
+    SPI object, and whose cs attribute replaces the chip select pin.
+    Asserting chip select locks the bus and, only when another device
+    used it last, re-initializes it with this device's baudrate and
+    mode.  While the bus is locked, work deferred by other devices (such
+    as a touch sample scheduled from an interrupt) waits until the lock
+    is released, so it never lands in the middle of a transfer.
+    """
+
+    def __init__(self, spi):
+        """Initialize shared bus.
+
+        Args:
+            spi (Class Spi): SPI interface, with pins set up.
+        """
+        self.spi = spi
+        self.current = None  # Device the bus is configured for
+        self.depth = 0  # Chip selects and held locks outstanding
+        self._deferred = []
+
+    def _acquire(self, device):
+        """Lock the bus and set it up for device."""
+        self.depth += 1
+        if self.current is not device:
+            self.spi.init(baudrate=device.baudrate,
+                          polarity=device.polarity, phase=device.phase)
+            self.current = device
+
+    def defer(self, callback):
+        """Run callback(0) once the bus is unlocked.
+
+        Args:
+            callback (function): Called with one argument, as for
+                micropython.schedule.  Added once however often deferred.
+        """
+        if callback not in self._deferred:
+            self._deferred.append(callback)
+
+    def device(self, cs, baudrate, polarity=0, phase=0):
+        """Return the SPIDevice for a device on this bus.
+
+        Args:
+            cs (Class Pin): The device's chip select pin.
+            baudrate (int): SPI clock rate for the device.
+            polarity (int): Clock idle level, 0 or 1.
+            phase (int): Clock edge data is sampled on, 0 or 1.
+        """
+        return SPIDevice(self, cs, baudrate, polarity, phase)
+
+    def locked(self, device=None):
+        """Return True while a device (other than device) holds the bus."""
+        return self.depth > 0 and self.current is not device
+
+    def _release(self):
+        """Unlock the bus, running deferred work on the last release."""
+        self.depth -= 1
+        if not self.depth and self._deferred:
+            deferred = self._deferred
+            self._deferred = []
+            for callback in deferred:
+                callback(0)
+
+
+class SPIDevice(object):
+    """A device's view of a SharedSPI.
+
+    Passes reads and writes to the bus and provides the chip select for
+    the driver (cs attribute).  acquire and release, or using it as a
+    context manager, hold the bus across several transfers; Display does
+    so for each frame it shows.
+    """
+
+    def __init__(self, bus, cs, baudrate, polarity=0, phase=0):
+        """Initialize device (see SharedSPI.device)."""
+        self.bus = bus
+        self.spi = bus.spi
+        self.baudrate = baudrate
+        self.polarity = polarity
+        self.phase = phase
+        self.cs = ChipSelect(self, cs)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+    def acquire(self):
+        """Lock the bus for this device until release is called."""
+        self.bus._acquire(self)
+
+    def deinit(self):
+        """Leave the bus running for the other devices."""
+        pass
+
+    def init(self, baudrate=None, polarity=None, phase=None, **kwargs):
+        """Change the device's settings from its next chip select."""
+        if baudrate is not None:
+            self.baudrate = baudrate
+        if polarity is not None:
+            self.polarity = polarity
+        if phase is not None:
+            self.phase = phase
+        if self.bus.current is self:
+            self.bus.current = None
+
+    def read(self, nbytes, write=0x00):
+        return self.spi.read(nbytes, write)
+
+    def readinto(self, buf, write=0x00):
+        self.spi.readinto(buf, write)
+
+    def release(self):
+        """Unlock the bus after acquire; deferred work then runs."""
+        self.bus._release()
+
+    def write(self, buf):
+        self.spi.write(buf)
+
+    def write_readinto(self, write_buf, read_buf):
+        self.spi.write_readinto(write_buf, read_buf)
+
+
+class ChipSelect(object):
+    """Chip select pin that locks the shared bus while asserted.
+
+    Called like a Pin; other attributes are passed to the pin.
+    """
+
+    def __init__(self, device, pin):
+        self.device = device
+        self.pin = pin
+        self.selected = False
+
+    def __call__(self, value=None):
+        if value is None:
+            return self.pin()
+        if value:
+            self.pin(1)
+            if self.selected:
+                self.selected = False
+                self.device.bus._release()
+        elif not self.selected:
+            self.device.bus._acquire(self.device)
+            self.selected = True
+            self.pin(0)
+
+    def __getattr__(self, name):
+        return getattr(self.pin, name)
@@ -0,0 +1,153 @@
+"""Sprite sheet module."""
+from array import array
+from ili9341 import Display, _reverse_pixels, _rle_decode
+
+
+class SpriteSheet(object):
+    """Atlas of equally sized RGB565 sprite frames.
+
+    The atlas is loaded into RAM once; frames are numbered left to right,
+    top to bottom.  With a transparent color key, the opaque runs of
+    every frame row are split when the sheet is loaded, so drawing
+    straight to the display only sends visible pixels.
+    """
+
+    def __init__(self, path, frame_w, frame_h, width=None, key=None):
+        """Initialize sprite sheet.
+
+        Args:
+            path (string): Atlas file: raw RGB565 (high byte first) or
+                RLE, as written by tools/image_converter.py.
+            frame_w (int): Width of a frame.
+            frame_h (int): Height of a frame.
+            width (int): Atlas width for raw files (default: frame_w).
+            key (int): RGB565 color drawn as transparent (default: None)
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:4] == Display.RLE_MAGIC:
+            width = data[4] | (data[5] << 8)
+            height = data[6] | (data[7] << 8)
+            atlas = bytearray(width * height * 2)
+            state = array('i', (0, 0, 0, 8, len(data)))
+            _rle_decode(atlas, 0, len(atlas), data, state)
+            data = atlas
+        else:
+            if width is None:
+                width = frame_w
+            height = len(data) // (width * 2)
+        self.buf = memoryview(data)
+        self.width = width
+        self.height = height
+        self.frame_w = frame_w
+        self.frame_h = frame_h
+        self.columns = width // frame_w
+        self.count = self.columns * (height // frame_h)
+        self.key = key
+        self._frame = bytearray(frame_w * frame_h * 2)
+        self._frame_mv = memoryview(self._frame)
+        self._row = bytearray(frame_w * 2)
+        self._row_mv = memoryview(self._row)
+        self.runs = None
+        if key is not None:
+            self.runs = [self._split_runs(i) for i in range(self.count)]
+
+    def _offset(self, index):
+        """Return the atlas byte offset of a frame's top left pixel."""
+        row, col = divmod(index, self.columns)
+        return (row * self.frame_h * self.width + col * self.frame_w) * 2
+
+    def _split_runs(self, index):
+        """Return a frame's opaque runs as array('H') of row, x, length."""
+        buf = self.buf
+        hi, lo = self.key >> 8, self.key & 0xFF
+        runs = array('H')
+        s = self._offset(index)
+        for row in range(self.frame_h):
+            i = s
+            col = 0
+            while col < self.frame_w:
+                while col < self.frame_w and buf[i] == hi and \
+                        buf[i + 1] == lo:
+                    col += 1
+                    i += 2
+                start = col
+                while col < self.frame_w and (buf[i] != hi or
+                                              buf[i + 1] != lo):
+                    col += 1
+                    i += 2
+                if col > start:
+                    runs.extend((row, start, col - start))
+            s += self.width * 2
+        return runs
+
+    def draw(self, display, index, x, y, flip_h=False, flip_v=False):
+        """Draw a frame.
+
+        Args:
+            display (Display): Display to draw on.
+            index (int): Frame number.
+            x, y (int): Top left corner on the display.
+            flip_h (bool): Mirror left to right (default: False)
+            flip_v (bool): Mirror top to bottom (default: False)
+        Note:
+            Frames are clipped to the display.  In frame buffer mode the
+            frame is blitted with the color key.  Straight to the display,
+            transparent sheets send their precomputed runs and opaque
+            frames go out as one block.
+        """
+        fw, fh = self.frame_w, self.frame_h
+        if display.is_off_grid(x, y, x + fw - 1, y + fh - 1):
+            return
+        if self.runs is None or display.is_buffered():
+            display.draw_sprite(self.frame(index, flip_h, flip_v), x, y,
+                                fw, fh, self.key)
+            return
+        runs = self.runs[index]
+        buf = self.buf
+        s = self._offset(index)
+        stride = self.width * 2
+        width, height = display.width, display.height
+        for i in range(0, len(runs), 3):
+            row, start, n = runs[i], runs[i + 1], runs[i + 2]
+            dy = y + (fh - 1 - row if flip_v else row)
+            if dy < 0 or dy >= height:
+                continue
+            dx = x + (fw - start - n if flip_h else start)
+            a = max(0, -dx)  # Run pixels hidden on either side
+            b = min(n, width - dx)
+            if a >= b:
+                continue
+            if flip_h:
+                src = s + row * stride + (start + n - b) * 2
+                _reverse_pixels(self._row_mv, buf[src:src + (b - a) * 2],
+                                b - a)
+                data = self._row_mv[:(b - a) * 2]
+            else:
+                src = s + row * stride + (start + a) * 2
+                data = buf[src:src + (b - a) * 2]
+            display.block(dx + a, dy, dx + b - 1, dy, data)
+
+    def frame(self, index, flip_h=False, flip_v=False):
+        """Return a frame's pixels as a packed RGB565 buffer.
+
+        Args:
+            index (int): Frame number.
+            flip_h (bool): Mirror left to right (default: False)
+            flip_v (bool): Mirror top to bottom (default: False)
+        Returns:
+            memoryview: frame_w x frame_h pixels, reused by the next call.
+        """
+        fw, fh = self.frame_w, self.frame_h
+        row_bytes = fw * 2
+        out = self._frame_mv
+        s = self._offset(index)
+        for row in range(fh):
+            d = (fh - 1 - row if flip_v else row) * row_bytes
+            if flip_h:
+                _reverse_pixels(out[d:d + row_bytes],
+                                self.buf[s:s + row_bytes], fw)
+            else:
+                out[d:d + row_bytes] = self.buf[s:s + row_bytes]
+            s += self.width * 2
+        return out
@@ -1,6 +1,71 @@
 """XPT2046 Touch module."""
+from array import array
 from time import sleep
-from micropython import const  # type: ignore
+import json
+from micropython import const, schedule  # type: ignore
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:  # CPython (host testing)
+    from time import perf_counter
+
+    def ticks_ms():
+        return int(perf_counter() * 1000)
+
+    def ticks_diff(end, start):
+        return end - start
+
+
+def _median(values, n, max_spread):
+    """Sort the first n values in place and return their median.
+
+    Returns:
+        int: Median, or -1 if the middle half spans more than max_spread.
+    """
+    for i in range(1, n):  # Insertion sort; n is small
+        v = values[i]
+        j = i - 1
+        while j >= 0 and values[j] > v:
+            values[j + 1] = values[j]
+            j -= 1
+        values[j + 1] = v
+    if values[(n * 3) // 4] - values[n // 4] > max_spread:
+        return -1
+    return values[n // 2]
+
+
+def _fit_affine(raw, points):
+    """Least-squares affine fit from raw readings to screen points.
+
+    Args:
+        raw (list): (raw_x, raw_y) readings, at least 3 not in a line.
+        points (list): (x, y) screen coordinates touched for each reading.
+    Returns:
+        tuple: ((a, b, c), (d, e, f)) as for Touch(matrix=...)
+    """
+    n = len(raw)
+    mx = sum(r[0] for r in raw) / n
+    my = sum(r[1] for r in raw) / n
+    # Centered readings decouple the offsets from the 2x2 normal equations
+    suu = suv = svv = 0
+    for rx, ry in raw:
+        u, v = rx - mx, ry - my
+        suu += u * u
+        suv += u * v
+        svv += v * v
+    det = suu * svv - suv * suv
+    if det <= (suu + svv) * (suu + svv) * 1e-6:
+        raise ValueError('Calibration points are in a line.')
+    rows = []
+    for k in (0, 1):
+        mp = sum(p[k] for p in points) / n
+        sup = svp = 0
+        for (rx, ry), p in zip(raw, points):
+            sup += (rx - mx) * (p[k] - mp)
+            svp += (ry - my) * (p[k] - mp)
+        a = (svv * sup - suv * svp) / det
+        b = (suu * svp - suv * sup) / det
+        rows.append((a, b, mp - a * mx - b * my))
+    return tuple(rows)
 
 
 class Touch(object):
@@ -16,28 +81,80 @@ class Touch(object):
     GET_BATTERY = const(0b10100000)  # Battery monitor
     GET_AUX = const(0b11100000)  # Auxiliary input to ADC
 
+    MIRROR_ROTATE = {  # Display MADCTL bits (as Display.MIRROR_ROTATE)
+        (False, 0): 0x80,
+        (False, 90): 0xE0,
+        (False, 180): 0x40,
+        (False, 270): 0x20,
+        (True, 0): 0xC0,
+        (True, 90): 0x60,
+        (True, 180): 0x00,
+        (True, 270): 0xA0
+    }
+    FIXED_SHIFT = const(16)  # Fraction bits of the transform coefficients
+    RAW_MIN = const(1)  # Readings on the ADC rails mean the pen is up
+    RAW_MAX = const(4094)
+
     def __init__(self, spi, cs, int_pin=None, int_handler=None,
                  width=240, height=320,
-                 x_min=100, x_max=1962, y_min=100, y_max=1900):
+                 x_min=100, x_max=1962, y_min=100, y_max=1900,
+                 rotation=0, mirror=False, matrix=None, calibration=None,
+                 queue_size=16, debounce_ms=50, samples=7, max_spread=32,
+                 z_threshold=400):
         """Initialize touch screen controller.
 
         Args:
             spi (Class Spi):  SPI interface for OLED
             cs (Class Pin):  Chip select pin
             int_pin (Class Pin):  Touch controller interrupt pin
-            int_handler (function): Handler for screen interrupt
+            int_handler (function): Optional handler called with (x, y)
+                for each touch event, outside interrupt context
             width (int): Width of LCD screen
             height (int): Height of LCD screen
             x_min (int): Minimum x coordinate
             x_max (int): Maximum x coordinate
             y_min (int): Minimum Y coordinate
             y_max (int): Maximum Y coordinate
+            rotation (int): Display rotation: 0, 90, 180 or 270
+            mirror (bool): Display mirroring, as passed to Display
+            matrix (tuple): Optional affine calibration from raw readings
+                to rotation 0 (portrait) coordinates, ((a, b, c),
+                (d, e, f)) so that x = a * raw_x + b * raw_y + c and
+                y = d * raw_x + ... (a third row of a 3x3 matrix is
+                ignored).  Replaces the min/max calibration.
+            calibration (string): Optional file saved by calibrate; loaded
+                if it exists, replacing min/max and matrix.
+            queue_size (int): Touch events kept until read by get_event.
+            debounce_ms (int): Pen-down edges closer together than this
+                are treated as contact bounce and ignored.
+            samples (int): Conversions per axis taken by poll (see
+                set_budget).
+            max_spread (int): Raw noise poll tolerates (see set_budget).
+            z_threshold (int): Lowest pressure (see pressure) counted as
+                a touch; lighter contact is treated as pen up.
+        Note:
+            Without a matrix, raw readings span the min/max range across
+            the panel in its native portrait orientation (rotation 0).
+            Width and height are the display's size in this rotation,
+            exactly as passed to (and reported by) Display.
         """
         self.spi = spi
+        self._bus = getattr(spi, 'bus', None)  # SharedSPI (see spi_bus)
         self.cs = cs
         self.cs.init(self.cs.OUT, value=1)
         self.rx_buf = bytearray(3)  # Receive buffer
         self.tx_buf = bytearray(3)  # Transmit buffer
+        self.set_budget(samples, max_spread)
+        self.z_threshold = z_threshold
+        self._z_tx = bytearray((self.GET_Z1, 0, self.GET_Z2, 0, 0))
+        self._z_rx = bytearray(5)
+        self.z = 0  # Pressure at the last poll
+        self.pen_down = False
+        self._pen_x = self._pen_y = 0
+        # Ring of x, y, z, ticks events, allocated up front
+        self._events = array('i', [0] * (queue_size * 4))
+        self._event_start = 0
+        self._event_count = 0
         self.width = width
         self.height = height
         # Set calibration
@@ -45,81 +162,420 @@ class Touch(object):
         self.x_max = x_max
         self.y_min = y_min
         self.y_max = y_max
-        self.x_multiplier = width / (x_max - x_min)
-        self.x_add = x_min * -self.x_multiplier
-        self.y_multiplier = height / (y_max - y_min)
-        self.y_add = y_min * -self.y_multiplier
+        self.set_transform(rotation, mirror, matrix)
+        if calibration is not None:
+            try:
+                self.load_calibration(calibration)
+            except OSError:
+                pass  # Not calibrated yet
 
         if int_pin is not None:
             self.int_pin = int_pin
             self.int_pin.init(int_pin.IN)
             self.int_handler = int_handler
-            self.int_locked = False
+            self.debounce_ms = debounce_ms
+            self._last_press = ticks_ms() - debounce_ms
+            self._sample_pending = False
+            self._sample_cb = self._sample  # Bound once; IRQs can't allocate
             int_pin.irq(trigger=int_pin.IRQ_FALLING | int_pin.IRQ_RISING,
                         handler=self.int_press)
 
-    def get_touch(self):
-        """Take multiple samples to get accurate touch reading."""
-        timeout = 2  # set timeout to 2 seconds
-        confidence = 5
-        buff = [[0, 0] for x in range(confidence)]
-        buf_length = confidence  # Require a confidence of 5 good samples
-        buffptr = 0  # Track current buffer position
-        nsamples = 0  # Count samples
-        while timeout > 0:
-            if nsamples == buf_length:
-                meanx = sum([c[0] for c in buff]) // buf_length
-                meany = sum([c[1] for c in buff]) // buf_length
-                dev = sum([(c[0] - meanx)**2 +
-                          (c[1] - meany)**2 for c in buff]) / buf_length
-                if dev <= 50:  # Deviation should be under margin of 50
-                    return self.normalize(meanx, meany)
-            # get a new value
-            sample = self.raw_touch()  # get a touch
-            if sample is None:
-                nsamples = 0    # Invalidate buff
-            else:
-                buff[buffptr] = sample  # put in buff
-                buffptr = (buffptr + 1) % buf_length  # Incr, until rollover
-                nsamples = min(nsamples + 1, buf_length)  # Incr. until max
-
-            sleep(.05)
-            timeout -= .05
-        return None
+    def calibrate(self, display, path=None, color=0xFFFF, background=0,
+                  inset=20):
+        """Calibrate by touching crosshairs drawn on the display.
+
+        Args:
+            display (Display): Display the touch panel covers, set up
+                with the same rotation and mirroring as this Touch.
+            path (string): Optional file to save the calibration to.
+            color (int): RGB565 crosshair color (default: white)
+            background (int): RGB565 background color (default: black)
+            inset (int): Distance of the outer targets from the edges.
+        Returns:
+            tuple: Calibration matrix ((a, b, c), (d, e, f)), also applied.
+        Note:
+            Five targets are shown in turn (four corners and the center);
+            each is sampled with get_touch once the pen settles
+            and accepted when the pen lifts.  The matrix maps to rotation 0
+            coordinates, so it stays valid if the rotation changes later.
+        """
+        w, h = display.width, display.height
+        targets = ((inset, inset), (w - 1 - inset, inset),
+                   (w - 1 - inset, h - 1 - inset), (inset, h - 1 - inset),
+                   (w // 2, h // 2))
+        # Screen to rotation 0 coordinates (the rotation is orthogonal)
+        ra, rb, rc, rd, re, rf = self._rotate(self.rotation, self.mirror)
+        # Accept any reading off the ADC rails while calibrating
+        self._raw_range = (self.RAW_MIN, self.RAW_MAX,
+                           self.RAW_MIN, self.RAW_MAX)
+        raw = []
+        points = []
+        display.clear(background)
+        try:
+            for x, y in targets:
+                self._crosshair(display, x, y, color)
+                sample = None
+                while sample is None:
+                    sample = self.get_touch(raw=True)
+                while self.pressure() >= self.z_threshold:
+                    sleep(.05)  # Wait for the pen to lift
+                self._crosshair(display, x, y, background)
+                # Aim for the pixel center; normalize rounds down
+                sx, sy = x + .5 - rc, y + .5 - rf
+                raw.append(sample)
+                points.append((ra * sx + rd * sy, rb * sx + re * sy))
+            matrix = _fit_affine(raw, points)
+        finally:
+            self._set_raw_range(self.matrix, *self._native_size(
+                self.rotation, self.mirror))
+        self.set_transform(self.rotation, self.mirror, matrix)
+        # The pen lifts unseen by poll, so start the next touch afresh
+        self.pen_down = False
+        self.clear_events()
+        if path is not None:
+            self.save_calibration(path)
+        return matrix
+
+    def _crosshair(self, display, x, y, color, size=8):
+        """Draw a calibration target centered on x, y."""
+        display.draw_hline(x - size, y, size * 2 + 1, color)
+        display.draw_vline(x, y - size, size * 2 + 1, color)
+        display.draw_circle(x, y, size // 2, color)
+
+    def get_touch(self, raw=False, timeout_ms=2000):
+        """Wait for a steady touch reading.
+
+        Args:
+            raw (bool): Return the median raw readings instead of
+                screen coordinates (default: False)
+            timeout_ms (int): Longest time to wait (default: 2 seconds)
+        Returns:
+            tuple(int, int): X, Y as from poll, or None on timeout.
+        """
+        start = ticks_ms()
+        while True:
+            sample = self.poll(raw)
+            if sample is not None or \
+                    ticks_diff(ticks_ms(), start) >= timeout_ms:
+                return sample
+            sleep(.01)
+
+    def clear_events(self):
+        """Discard queued touch events."""
+        self._event_start = 0
+        self._event_count = 0
+
+    def get_event(self):
+        """Return the oldest queued touch event.
+
+        Returns:
+            tuple(int, int, int, int): x, y, z and ticks_ms of a pen-down
+                (z is the pressure) or pen-up (z is 0, x and y are the
+                last position) transition, or None if the queue is empty.
+        Note:
+            Transitions are found by poll, which the touch interrupt runs
+            on both edges; without an interrupt pin, call poll regularly.
+        """
+        if not self._event_count:
+            return None
+        i = self._event_start * 4
+        ev = self._events
+        self._event_start = (self._event_start + 1) % (len(ev) // 4)
+        self._event_count -= 1
+        return (ev[i], ev[i + 1], ev[i + 2], ev[i + 3])
 
     def int_press(self, pin):
-        """Send X,Y values to passed interrupt handler."""
-        if not pin.value() and not self.int_locked:
-            self.int_locked = True  # Lock Interrupt
-            buff = self.raw_touch()
-
-            if buff is not None:
-                x, y = self.normalize(*buff)
-                self.int_handler(x, y)
-            sleep(.1)  # Debounce falling edge
-        elif pin.value() and self.int_locked:
-            sleep(.1)  # Debounce rising edge
-            self.int_locked = False  # Unlock interrupt
+        """Schedule a touch sample on a pen edge.
+
+        Note:
+            Runs in interrupt context, so it only checks the debounce time
+            and hands the SPI reads to micropython.schedule.
+        """
+        now = ticks_ms()
+        if self._sample_pending:
+            return
+        if pin.value():
+            if not self.pen_down:
+                return  # Rising edge with no press to end
+        elif ticks_diff(now, self._last_press) < self.debounce_ms:
+            return
+        else:
+            self._last_press = now
+        self._sample_pending = True
+        try:
+            schedule(self._sample_cb, 0)
+        except RuntimeError:  # Schedule queue full; drop this press
+            self._sample_pending = False
+
+    def load_calibration(self, path):
+        """Load a calibration matrix saved by calibrate.
+
+        Args:
+            path (string): Calibration file.
+        """
+        with open(path) as f:
+            matrix = json.load(f)['matrix']
+        self.set_transform(self.rotation, self.mirror, matrix)
 
     def normalize(self, x, y):
-        """Normalize mean X,Y values to match LCD screen."""
-        x = int(self.x_multiplier * x + self.x_add)
-        y = int(self.y_multiplier * y + self.y_add)
-        return x, y
+        """Normalize mean X,Y values to match LCD screen.
+
+        Note:
+            Results are clamped to the screen.
+        """
+        t = self._transform
+        sx = (t[0] * x + t[1] * y + t[2]) >> self.FIXED_SHIFT
+        sy = (t[3] * x + t[4] * y + t[5]) >> self.FIXED_SHIFT
+        return (min(max(sx, 0), self.width - 1),
+                min(max(sy, 0), self.height - 1))
+
+    def _native_size(self, rotation, mirror):
+        """Return the screen's width and height at rotation 0.
+
+        Note:
+            width and height are the screen's extents in this rotation,
+            as passed to Display; rotations that exchange rows and
+            columns (MADCTL MV) swap them back.
+        """
+        if (mirror, rotation) not in self.MIRROR_ROTATE:
+            raise ValueError('Rotation must be 0, 90, 180 or 270.')
+        if self.MIRROR_ROTATE[mirror, rotation] & 0x20:
+            return self.height, self.width
+        return self.width, self.height
+
+    def _rotate(self, rotation, mirror):
+        """Return the affine from rotation 0 to screen coordinates.
+
+        Returns:
+            tuple(int): a, b, c, d, e, f so that screen x = a * x + b * y
+                + c and screen y = d * x + e * y + f.
+        """
+        w, h = self._native_size(rotation, mirror)
+        base = self.MIRROR_ROTATE[False, 0]
+        madctl = self.MIRROR_ROTATE[mirror, rotation]
+
+        def screen(x, y):
+            # Rotation 0 coordinates to panel memory, then back out
+            # through this rotation's MADCTL
+            if base & 0x80:
+                y = h - y
+            if madctl & 0x80:
+                y = h - y
+            if madctl & 0x40:
+                x = w - x
+            return (y, x) if madctl & 0x20 else (x, y)
+
+        x0, y0 = screen(0, 0)
+        x1, y1 = screen(1, 0)
+        x2, y2 = screen(0, 1)
+        return (x1 - x0, x2 - x0, x0, y1 - y0, y2 - y0, y0)
+
+    def poll(self, raw=False):
+        """Read the touch position without waiting.
+
+        Takes the set_budget number of X and Y conversions in one SPI
+        transaction and filters each axis with a median.
+
+        Args:
+            raw (bool): Return the median raw readings instead of
+                screen coordinates (default: False)
+        Returns:
+            tuple(int, int): X, Y, or None if the pen is up, the readings
+                are too noisy (e.g. while the pen lands) or a shared bus
+                is held by another device (e.g. a frame being shown).
+        Note:
+            Pressure is checked first, so X and Y are only converted
+            while the panel is pressed.  Pen-down and pen-up transitions
+            are queued for get_event.
+        """
+        if self._bus is not None and self._bus.locked(self.spi):
+            return None
+        z = self.pressure()
+        self.z = z
+        if z < self.z_threshold:
+            if self.pen_down:
+                self.pen_down = False
+                self._queue(self._pen_x, self._pen_y, 0)
+            return None
+        tx, rx = self._burst_tx, self._burst_rx
+        self.cs(0)
+        self.spi.write_readinto(tx, rx)
+        self.cs(1)
+        n = self.samples
+        xs, ys = self._xs, self._ys
+        j = 1
+        for i in range(n):
+            xs[i] = (rx[j] << 4) | (rx[j + 1] >> 4)
+            ys[i] = (rx[j + n * 2] << 4) | (rx[j + n * 2 + 1] >> 4)
+            j += 2
+        x = _median(xs, n, self.max_spread)
+        y = _median(ys, n, self.max_spread)
+        x_lo, x_hi, y_lo, y_hi = self._raw_range
+        if not (x_lo <= x <= x_hi and y_lo <= y <= y_hi):
+            return None
+        sx, sy = self.normalize(x, y)
+        self._pen_x, self._pen_y = sx, sy
+        if not self.pen_down:
+            self.pen_down = True
+            self._queue(sx, sy, z)
+        if raw:
+            return (x, y)
+        return (sx, sy)
+
+    def pressure(self):
+        """Read the touch pressure from the Z1 and Z2 conversions.
+
+        Returns:
+            int: z1 + 4095 - z2, which is 0 with the pen up and rises as
+                touch resistance falls (a firmer press).
+        Note:
+            The datasheet's touch resistance, Rx * x / 4096 *
+            (z2 / z1 - 1), also needs X and the plate resistance; this
+            form orders presses the same way from Z1 and Z2 alone, so a
+            light or absent touch costs one short SPI transaction.
+        """
+        rx = self._z_rx
+        self.cs(0)
+        self.spi.write_readinto(self._z_tx, rx)
+        self.cs(1)
+        z1 = (rx[1] << 4) | (rx[2] >> 4)
+        z2 = (rx[3] << 4) | (rx[4] >> 4)
+        return max(z1 + 4095 - z2, 0) if z1 else 0
+
+    def _queue(self, x, y, z):
+        """Add an event to the ring, dropping the oldest when full."""
+        ev = self._events
+        size = len(ev) // 4
+        if self._event_count == size:
+            self._event_start = (self._event_start + 1) % size
+            self._event_count -= 1
+        i = (self._event_start + self._event_count) % size * 4
+        ev[i] = x
+        ev[i + 1] = y
+        ev[i + 2] = z
+        ev[i + 3] = ticks_ms()
+        self._event_count += 1
 
     def raw_touch(self):
         """Read raw X,Y touch values.
 
         Returns:
-            tuple(int, int): X, Y
+            tuple(int, int): X, Y, or None if the pen is up
         """
+        if self.pressure() < self.z_threshold:
+            return None
         x = self.send_command(self.GET_X)
         y = self.send_command(self.GET_Y)
-        if self.x_min <= x <= self.x_max and self.y_min <= y <= self.y_max:
+        x_lo, x_hi, y_lo, y_hi = self._raw_range
+        if x_lo <= x <= x_hi and y_lo <= y <= y_hi:
             return (x, y)
         else:
             return None
 
+    def _sample(self, _):
+        """Run poll for the touch interrupt and call int_handler."""
+        bus = self._bus
+        if bus is not None and bus.locked(self.spi):
+            bus.defer(self._sample_cb)  # Don't interrupt a transfer
+            return
+        self._sample_pending = False
+        was_down = self.pen_down
+        for _ in range(3):  # Retry readings taken while the pen lands
+            sample = self.poll()
+            if sample is not None or self.z < self.z_threshold:
+                break
+        if sample is not None and not was_down and \
+                self.int_handler is not None:
+            self.int_handler(*sample)
+
+    def save_calibration(self, path):
+        """Save the current calibration matrix to a file.
+
+        Args:
+            path (string): File for Touch(calibration=...) to load.
+        """
+        with open(path, 'w') as f:
+            json.dump({'matrix': [list(row) for row in self.matrix]}, f)
+
+    def set_budget(self, samples=7, max_spread=32):
+        """Set the latency/accuracy trade-off of poll.
+
+        Args:
+            samples (int): Conversions per axis, 1 or more.  Each takes 16
+                SPI clocks, so at 1 MHz 7 samples cost about 0.25 ms.
+            max_spread (int): Largest raw spread allowed across the middle
+                half of the samples; noisier readings are rejected.
+        """
+        if samples < 1:
+            raise ValueError('Need at least one sample.')
+        self.samples = samples
+        self.max_spread = max_spread
+        # 16-clock conversions: each command overlaps the previous result
+        n = samples * 2
+        self._burst_tx = bytearray(n * 2 + 1)
+        for i in range(n):
+            self._burst_tx[i * 2] = self.GET_X if i < samples else self.GET_Y
+        self._burst_rx = bytearray(n * 2 + 1)
+        self._xs = array('H', [0] * samples)
+        self._ys = array('H', [0] * samples)
+
+    def _set_raw_range(self, matrix, w, h):
+        """Accept raw readings that map onto the screen, plus a margin.
+
+        Args:
+            matrix (tuple): Raw to rotation 0 affine (see __init__).
+            w, h (int): Screen size at rotation 0.
+        Note:
+            Presses at the very edge read a little past the calibrated
+            range; they are kept and clamped by normalize rather than
+            dropped.  Readings on the ADC rails still count as pen up.
+        """
+        (a, b, c), (d, e, f) = matrix
+        det = a * e - b * d
+        if not det:
+            raise ValueError('Calibration matrix is not invertible.')
+        xs = []
+        ys = []
+        for x, y in ((0, 0), (w, 0), (0, h), (w, h)):
+            xs.append((e * (x - c) - b * (y - f)) / det)
+            ys.append((a * (y - f) - d * (x - c)) / det)
+        x_margin = (max(xs) - min(xs)) / 8
+        y_margin = (max(ys) - min(ys)) / 8
+        self._raw_range = (max(int(min(xs) - x_margin), self.RAW_MIN),
+                           min(int(max(xs) + x_margin), self.RAW_MAX),
+                           max(int(min(ys) - y_margin), self.RAW_MIN),
+                           min(int(max(ys) + y_margin), self.RAW_MAX))
+
+    def set_transform(self, rotation=0, mirror=False, matrix=None):
+        """Set how raw readings map to screen coordinates.
+
+        Args:
+            rotation (int): Display rotation: 0, 90, 180 or 270
+            mirror (bool): Display mirroring, as passed to Display
+            matrix (tuple): Optional affine calibration (see __init__)
+        Note:
+            The mapping is folded into six fixed-point integers, so
+            normalize needs no floating point.
+        """
+        w, h = self._native_size(rotation, mirror)
+        if matrix is None:
+            # Raw range to rotation 0 coordinates
+            sx = w / (self.x_max - self.x_min)
+            sy = h / (self.y_max - self.y_min)
+            matrix = ((sx, 0, -sx * self.x_min), (0, sy, -sy * self.y_min))
+        else:
+            matrix = (tuple(matrix[0]), tuple(matrix[1]))
+        self._set_raw_range(matrix, w, h)
+        self.rotation = rotation
+        self.mirror = mirror
+        self.matrix = matrix
+        (a, b, c), (d, e, f) = matrix
+        ra, rb, rc, rd, re, rf = self._rotate(rotation, mirror)
+        one = 1 << self.FIXED_SHIFT
+        self._transform = tuple(int(round(v * one)) for v in (
+            ra * a + rb * d, ra * b + rb * e, ra * c + rb * f + rc,
+            rd * a + re * d, rd * b + re * e, rd * c + re * f + rf))
+
     def send_command(self, command):
         """Write command to XT2046 (MicroPython).
 
@@ -0,0 +1,368 @@
+"""Host stand-in for the MicroPython ``framebuf`` module.
+
+Implements the subset of the C module used by the drivers with the same
+drawing algorithms, so rendered pixels match the device.  RGB565 pixels
+are stored little-endian, exactly as ``modframebuf.c`` does on the ESP32.
+"""
+import os
+
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+MVLSB = MONO_VLSB
+
+_FILL = 0x10
+_MASK_ALL = 0x0F
+_font = None
+
+
+def _load_font():
+    """Load the 8x8 petme128 font from a MicroPython source checkout.
+
+    The font table is not bundled; point ``MICROPY_FONT`` at
+    ``micropython/ports/../extmod/font_petme128_8x8.h`` to get device
+    accurate text.  Without it text renders as solid 6x8 cells.
+    """
+    global _font
+    if _font is None:
+        _font = b''
+        path = os.environ.get('MICROPY_FONT')
+        if path and os.path.exists(path):
+            with open(path) as f:
+                src = f.read()
+            body = src[src.index('{') + 1:src.rindex('}')]
+            values = []
+            for line in body.splitlines():
+                line = line.split('//')[0]
+                values.extend(int(v, 0) for v in line.replace(',', ' ').split())
+            _font = bytes(values)
+    return _font
+
+
+class FrameBuffer(object):
+    """Pure Python frame buffer."""
+
+    def __init__(self, buffer, width, height, format, stride=None):
+        self.buf = buffer
+        self.width = width
+        self.height = height
+        self.format = format
+        self.stride = width if stride is None else stride
+        if format == MONO_VLSB:
+            need = ((height + 7) >> 3) * self.stride
+        elif format in (MONO_HLSB, MONO_HMSB):
+            need = ((self.stride + 7) >> 3) * height
+        elif format == GS2_HMSB:
+            need = ((self.stride + 3) >> 2) * height
+        elif format == GS4_HMSB:
+            need = ((self.stride + 1) >> 1) * height
+        elif format == GS8:
+            need = self.stride * height
+        elif format == RGB565:
+            need = self.stride * height * 2
+        else:
+            raise ValueError('invalid format')
+        if len(memoryview(buffer).cast('B')) < need:
+            raise ValueError('buffer too small')
+
+    # Raw pixel access -----------------------------------------------------
+    def _set(self, x, y, c):
+        fmt = self.format
+        buf = self.buf
+        if fmt == RGB565:
+            i = (x + y * self.stride) * 2
+            buf[i] = c & 0xFF
+            buf[i + 1] = (c >> 8) & 0xFF
+        elif fmt == MONO_HLSB or fmt == MONO_HMSB:
+            i = (x + y * ((self.stride + 7) & ~7)) >> 3
+            off = (7 - (x & 7)) if fmt == MONO_HLSB else (x & 7)
+            buf[i] = (buf[i] & ~(1 << off)) | ((c != 0) << off)
+        elif fmt == MONO_VLSB:
+            i = (y >> 3) * self.stride + x
+            off = y & 7
+            buf[i] = (buf[i] & ~(1 << off)) | ((c != 0) << off)
+        elif fmt == GS8:
+            buf[x + y * self.stride] = c & 0xFF
+        elif fmt == GS4_HMSB:
+            i = (x + y * self.stride) >> 1
+            if x & 1:
+                buf[i] = (buf[i] & 0xF0) | (c & 0x0F)
+            else:
+                buf[i] = (buf[i] & 0x0F) | ((c & 0x0F) << 4)
+        elif fmt == GS2_HMSB:
+            i = (x + y * self.stride) >> 2
+            shift = (x & 3) << 1
+            buf[i] = (buf[i] & ~(0x3 << shift)) | ((c & 0x3) << shift)
+
+    def _get(self, x, y):
+        fmt = self.format
+        buf = self.buf
+        if fmt == RGB565:
+            i = (x + y * self.stride) * 2
+            return buf[i] | (buf[i + 1] << 8)
+        if fmt == MONO_HLSB or fmt == MONO_HMSB:
+            i = (x + y * ((self.stride + 7) & ~7)) >> 3
+            off = (7 - (x & 7)) if fmt == MONO_HLSB else (x & 7)
+            return (buf[i] >> off) & 1
+        if fmt == MONO_VLSB:
+            return (buf[(y >> 3) * self.stride + x] >> (y & 7)) & 1
+        if fmt == GS8:
+            return buf[x + y * self.stride]
+        if fmt == GS4_HMSB:
+            v = buf[(x + y * self.stride) >> 1]
+            return v & 0x0F if x & 1 else v >> 4
+        v = buf[(x + y * self.stride) >> 2]
+        return (v >> ((x & 3) << 1)) & 0x3
+
+    def _fill_rect(self, x, y, w, h, c):
+        if (h < 1 or w < 1 or x + w <= 0 or y + h <= 0 or
+                y >= self.height or x >= self.width):
+            return
+        xend = min(self.width, x + w)
+        yend = min(self.height, y + h)
+        x = max(x, 0)
+        y = max(y, 0)
+        if self.format == RGB565:
+            row = bytes((c & 0xFF, (c >> 8) & 0xFF)) * (xend - x)
+            mv = memoryview(self.buf).cast('B')
+            for yy in range(y, yend):
+                i = (x + yy * self.stride) * 2
+                mv[i:i + len(row)] = row
+        else:
+            for yy in range(y, yend):
+                for xx in range(x, xend):
+                    self._set(xx, yy, c)
+
+    def _set_checked(self, x, y, c, mask=1):
+        if mask and 0 <= x < self.width and 0 <= y < self.height:
+            self._set(x, y, c)
+
+    # Public API -----------------------------------------------------------
+    def fill(self, c):
+        self._fill_rect(0, 0, self.width, self.height, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        self._fill_rect(x, y, w, h, c)
+
+    def pixel(self, x, y, c=None):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            if c is None:
+                return self._get(x, y)
+            self._set(x, y, c)
+        return None
+
+    def hline(self, x, y, w, c):
+        self._fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self._fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self._fill_rect(x, y, w, h, c)
+        else:
+            self._fill_rect(x, y, w, 1, c)
+            self._fill_rect(x, y + h - 1, w, 1, c)
+            self._fill_rect(x, y, 1, h, c)
+            self._fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        dx = x2 - x1
+        if dx > 0:
+            sx = 1
+        else:
+            dx = -dx
+            sx = -1
+        dy = y2 - y1
+        if dy > 0:
+            sy = 1
+        else:
+            dy = -dy
+            sy = -1
+        steep = dy > dx
+        if steep:
+            x1, y1 = y1, x1
+            dx, dy = dy, dx
+            sx, sy = sy, sx
+        e = 2 * dy - dx
+        for _ in range(dx):
+            if steep:
+                self._set_checked(y1, x1, c)
+            else:
+                self._set_checked(x1, y1, c)
+            while e >= 0:
+                y1 += sy
+                e -= 2 * dx
+            x1 += sx
+            e += 2 * dy
+        self._set_checked(x2, y2, c)
+
+    def _ellipse_points(self, cx, cy, x, y, c, mask):
+        if mask & _FILL:
+            if mask & 0x01:
+                self._fill_rect(cx, cy - y, x + 1, 1, c)
+            if mask & 0x02:
+                self._fill_rect(cx - x, cy - y, x + 1, 1, c)
+            if mask & 0x04:
+                self._fill_rect(cx - x, cy + y, x + 1, 1, c)
+            if mask & 0x08:
+                self._fill_rect(cx, cy + y, x + 1, 1, c)
+        else:
+            self._set_checked(cx + x, cy - y, c, mask & 0x01)
+            self._set_checked(cx - x, cy - y, c, mask & 0x02)
+            self._set_checked(cx - x, cy + y, c, mask & 0x04)
+            self._set_checked(cx + x, cy + y, c, mask & 0x08)
+
+    def ellipse(self, cx, cy, xr, yr, c, f=False, m=_MASK_ALL):
+        mask = (_FILL if f else 0) | (m & _MASK_ALL)
+        if xr == 0 and yr == 0:
+            self._set_checked(cx, cy, c, mask & _MASK_ALL)
+            return
+        two_asquare = 2 * xr * xr
+        two_bsquare = 2 * yr * yr
+        x = xr
+        y = 0
+        xchange = yr * yr * (1 - 2 * xr)
+        ychange = xr * xr
+        error = 0
+        stoppingx = two_bsquare * xr
+        stoppingy = 0
+        while stoppingx >= stoppingy:
+            self._ellipse_points(cx, cy, x, y, c, mask)
+            y += 1
+            stoppingy += two_asquare
+            error += ychange
+            ychange += two_asquare
+            if 2 * error + xchange > 0:
+                x -= 1
+                stoppingx -= two_bsquare
+                error += xchange
+                xchange += two_bsquare
+        x = 0
+        y = yr
+        xchange = yr * yr
+        ychange = xr * xr * (1 - 2 * yr)
+        error = 0
+        stoppingx = 0
+        stoppingy = two_asquare * yr
+        while stoppingx <= stoppingy:
+            self._ellipse_points(cx, cy, x, y, c, mask)
+            x += 1
+            stoppingx += two_bsquare
+            error += xchange
+            xchange += two_bsquare
+            if 2 * error + ychange > 0:
+                y -= 1
+                stoppingy -= two_asquare
+                error += ychange
+                ychange += two_asquare
+
+    def poly(self, x, y, coords, c, f=False):
+        n = len(coords) // 2
+        if n < 1:
+            return
+        if not f:
+            px1, py1 = coords[0], coords[1]
+            for i in range(n - 1, -1, -1):
+                px2, py2 = coords[2 * i], coords[2 * i + 1]
+                self.line(x + px1, y + py1, x + px2, y + py2, c)
+                px1, py1 = px2, py2
+            return
+        ys = [coords[2 * i + 1] for i in range(n)]
+        for row in range(min(ys), max(ys) + 1):
+            nodes = []
+            px1, py1 = coords[0], coords[1]
+            for i in range(n - 1, -1, -1):
+                px2, py2 = coords[2 * i], coords[2 * i + 1]
+                if py1 != py2 and ((py1 > row >= py2) or (py2 > row >= py1) or
+                                   (py1 == row and py2 < row) or
+                                   (py2 == row and py1 < row)):
+                    node = (32 * px1 + 32 * (px2 - px1) * (row - py1) //
+                            (py2 - py1) + 16) // 32
+                    nodes.append(node)
+                elif row == max(py1, py2) and py1 != py2:
+                    nodes.append(px1 if py1 > py2 else px2)
+                elif row == py1 == py2:
+                    self._fill_rect(x + min(px1, px2), y + row,
+                                    abs(px1 - px2) + 1, 1, c)
+                px1, py1 = px2, py2
+            nodes.sort()
+            for i in range(0, len(nodes) - 1, 2):
+                self._fill_rect(x + nodes[i], y + row,
+                                nodes[i + 1] - nodes[i] + 1, 1, c)
+
+    def text(self, s, x0, y0, c=1):
+        font = _load_font()
+        for ch in s:
+            code = ord(ch)
+            if code < 32 or code > 127:
+                code = 127
+            if font:
+                base = (code - 32) * 8
+                for j in range(8):
+                    line = font[base + j]
+                    y = y0
+                    while line:
+                        if line & 1:
+                            self._set_checked(x0, y, c)
+                        line >>= 1
+                        y += 1
+                    x0 += 1
+            else:
+                if code != 32:
+                    self._fill_rect(x0 + 1, y0, 6, 8, c)
+                x0 += 8
+
+    def scroll(self, xstep, ystep):
+        if xstep < 0:
+            sx, xend, dx = 0, self.width + xstep, 1
+        else:
+            sx, xend, dx = self.width - 1, xstep - 1, -1
+        if ystep < 0:
+            y, yend, dy = 0, self.height + ystep, 1
+        else:
+            y, yend, dy = self.height - 1, ystep - 1, -1
+        while y != yend:
+            x = sx
+            while x != xend:
+                self._set(x, y, self._get(x - xstep, y - ystep))
+                x += dx
+            y += dy
+
+    def blit(self, source, x, y, key=-1, palette=None):
+        if not isinstance(source, FrameBuffer):
+            source = FrameBuffer(*source)
+        if (x >= self.width or y >= self.height or
+                -x >= source.width or -y >= source.height):
+            return
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = max(0, -x)
+        y1 = max(0, -y)
+        x0end = min(self.width, x + source.width)
+        y0end = min(self.height, y + source.height)
+        fast = (key == -1 and palette is None and self.format == RGB565 and
+                source.format == RGB565)
+        dst = memoryview(self.buf).cast('B')
+        src = memoryview(source.buf).cast('B')
+        while y0 < y0end:
+            if fast:
+                n = (x0end - x0) * 2
+                d = (x0 + y0 * self.stride) * 2
+                s = (x1 + y1 * source.stride) * 2
+                dst[d:d + n] = src[s:s + n]
+            else:
+                cx1 = x1
+                for cx0 in range(x0, x0end):
+                    col = source._get(cx1, y1)
+                    if palette is not None:
+                        col = palette._get(col, 0)
+                    if col != key:
+                        self._set(cx0, y0, col)
+                    cx1 += 1
+            y1 += 1
+            y0 += 1
@@ -0,0 +1,214 @@
+"""Host-side ILI9341 panel model.
+
+Decodes the command stream a Display writes over a simulated SPI bus
+into a 240x320 RGB565 GRAM image.  Address windows (CASET/PASET),
+memory writes (RAMWR/RAMWRC), MADCTL orientation, vertical scrolling
+(VSCRDEF/VSCRSADD) and inversion (INVON/INVOFF) are honoured.
+
+Example:
+    spi = SPI(1)
+    panel = Ili9341Sim(spi)
+    display = Display(spi, cs=panel.cs, dc=panel.dc, rst=panel.rst)
+    display.fill_circle(120, 160, 50, color565(255, 0, 0))
+    panel.save('frame.png')
+"""
+import struct
+import zlib
+from machine import Pin
+
+CASET = 0x2A
+PASET = 0x2B
+RAMWR = 0x2C
+RAMWRC = 0x3C
+MADCTL = 0x36
+VSCRDEF = 0x33
+VSCRSADD = 0x37
+INVOFF = 0x20
+INVON = 0x21
+SWRESET = 0x01
+
+_PARAMS = {CASET: 4, PASET: 4, MADCTL: 1, VSCRDEF: 6, VSCRSADD: 2}
+
+
+class Ili9341Sim(object):
+    """Simulated ILI9341 attached to a host SPI bus.
+
+    Args:
+        spi (machine.SPI): Host SPI bus to listen on.
+        cs, dc, rst (Optional machine.Pin): Pins to use; created if omitted.
+    Attributes:
+        gram (bytearray): Physical frame memory, big-endian RGB565 as sent.
+        commands (dict): Count of each command byte received.
+        data_bytes (int): Parameter and pixel bytes received.
+    """
+
+    WIDTH = 240
+    HEIGHT = 320
+
+    def __init__(self, spi, cs=None, dc=None, rst=None):
+        self.cs = cs if cs is not None else Pin('lcd_cs', value=1)
+        self.dc = dc if dc is not None else Pin('lcd_dc')
+        self.rst = rst if rst is not None else Pin('lcd_rst', value=1)
+        self.gram = bytearray(self.WIDTH * self.HEIGHT * 2)
+        self.reset_counters()
+        self._reset_state()
+        spi.attach(self)
+
+    def _reset_state(self):
+        self.madctl = 0
+        self.inverted = False
+        self.scroll_def = (0, self.HEIGHT, 0)
+        self.scroll_start = 0
+        self.sc, self.ec = 0, self.WIDTH - 1
+        self.sp, self.ep = 0, self.HEIGHT - 1
+        self.col = 0
+        self.page = 0
+        self._cmd = None
+        self._params = bytearray()
+        self._pending = None
+
+    def reset_counters(self):
+        """Zero the command and byte counters."""
+        self.commands = {}
+        self.data_bytes = 0
+        self.pixels_written = 0
+
+    # SPI traffic -----------------------------------------------------------
+    def receive(self, data, read_buf):
+        if not self.dc.value():
+            for command in data:
+                self._command(command)
+        else:
+            self.data_bytes += len(data)
+            if self._cmd in (RAMWR, RAMWRC):
+                self._pixels(data)
+            elif self._cmd in _PARAMS:
+                self._params.extend(data)
+                if len(self._params) >= _PARAMS[self._cmd]:
+                    self._apply(self._cmd, self._params)
+                    self._params = bytearray()
+
+    def _command(self, command):
+        self.commands[command] = self.commands.get(command, 0) + 1
+        self._cmd = command
+        self._params = bytearray()
+        self._pending = None
+        if command == RAMWR:
+            self.col, self.page = self.sc, self.sp
+        elif command == INVON:
+            self.inverted = True
+        elif command == INVOFF:
+            self.inverted = False
+        elif command == SWRESET:
+            self._reset_state()
+
+    def _apply(self, command, p):
+        if command == CASET:
+            self.sc, self.ec = (p[0] << 8) | p[1], (p[2] << 8) | p[3]
+        elif command == PASET:
+            self.sp, self.ep = (p[0] << 8) | p[1], (p[2] << 8) | p[3]
+        elif command == MADCTL:
+            self.madctl = p[0]
+        elif command == VSCRDEF:
+            self.scroll_def = ((p[0] << 8) | p[1], (p[2] << 8) | p[3],
+                               (p[4] << 8) | p[5])
+        elif command == VSCRSADD:
+            self.scroll_start = (p[0] << 8) | p[1]
+
+    def _physical(self, col, page):
+        """Map address counters to a physical GRAM (x, y) via MADCTL."""
+        m = self.madctl
+        if m & 0x20:  # MV: row/column exchange
+            x, y = page, col
+        else:
+            x, y = col, page
+        if m & 0x40:  # MX: column address order
+            x = self.WIDTH - 1 - x
+        if m & 0x80:  # MY: row address order
+            y = self.HEIGHT - 1 - y
+        return x, y
+
+    def _pixels(self, data):
+        if self._pending is not None:
+            data = bytes((self._pending,)) + data
+            self._pending = None
+        if len(data) & 1:
+            self._pending = data[-1]
+            data = data[:-1]
+        gram = self.gram
+        col, page = self.col, self.page
+        sc, ec, sp, ep = self.sc, self.ec, self.sp, self.ep
+        w, h = self.WIDTH, self.HEIGHT
+        for i in range(0, len(data), 2):
+            x, y = self._physical(col, page)
+            if 0 <= x < w and 0 <= y < h:
+                j = (y * w + x) * 2
+                gram[j] = data[i]
+                gram[j + 1] = data[i + 1]
+            col += 1
+            if col > ec:
+                col = sc
+                page += 1
+                if page > ep:
+                    page = sp
+        self.pixels_written += len(data) >> 1
+        self.col, self.page = col, page
+
+    # Inspection ------------------------------------------------------------
+    def pixel(self, x, y, physical=False):
+        """Return the RGB565 value at logical (or physical) x, y."""
+        if not physical:
+            x, y = self._physical(x, y)
+        j = (y * self.WIDTH + x) * 2
+        return (self.gram[j] << 8) | self.gram[j + 1]
+
+    def frame(self):
+        """Return the panel image as rows of (r, g, b) tuples.
+
+        The image is what the glass shows: vertical scrolling and
+        colour inversion are applied to GRAM in physical orientation.
+        """
+        top, area, _ = self.scroll_def
+        start = self.scroll_start
+        bgr = self.madctl & 0x08
+        rows = []
+        for line in range(self.HEIGHT):
+            src = line
+            if top <= line < top + area and area:
+                src = top + (start - top + line - top) % area
+            row = []
+            base = src * self.WIDTH * 2
+            for x in range(self.WIDTH):
+                v = (self.gram[base + x * 2] << 8) | self.gram[base + x * 2 + 1]
+                if self.inverted:
+                    v ^= 0xFFFF
+                hi, g, lo = v >> 11, (v >> 5) & 0x3F, v & 0x1F
+                r, b = (lo, hi) if bgr else (hi, lo)
+                row.append(((r << 3) | (r >> 2), (g << 2) | (g >> 4),
+                            (b << 3) | (b >> 2)))
+            rows.append(row)
+        return rows
+
+    def save(self, path):
+        """Write the panel image to a .ppm or .png file."""
+        rows = self.frame()
+        if path.lower().endswith('.ppm'):
+            with open(path, 'wb') as f:
+                f.write(b'P6 %d %d 255\n' % (self.WIDTH, self.HEIGHT))
+                for row in rows:
+                    f.write(bytes(c for px in row for c in px))
+            return
+        raw = b''.join(b'\x00' + bytes(c for px in row for c in px)
+                       for row in rows)
+
+        def chunk(tag, body):
+            crc = zlib.crc32(tag + body) & 0xFFFFFFFF
+            return struct.pack('>I', len(body)) + tag + body + \
+                struct.pack('>I', crc)
+
+        with open(path, 'wb') as f:
+            f.write(b'\x89PNG\r\n\x1a\n')
+            f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', self.WIDTH,
+                                               self.HEIGHT, 8, 2, 0, 0, 0)))
+            f.write(chunk(b'IDAT', zlib.compress(raw)))
+            f.write(chunk(b'IEND', b''))
@@ -0,0 +1,200 @@
+"""Host stand-in for the MicroPython ``machine`` module.
+
+Pin and SPI are modelled; ADC and mem32 are inert placeholders so the
+apps import.  Simulated peripherals (see ili9341_sim
+and xpt2046_sim) attach to an SPI bus and receive the bytes written
+while their chip select pin is low, so drivers run unmodified on CPython.
+"""
+from time import sleep
+
+
+_pins = {}
+_buses = {}
+
+
+def reset():
+    """Forget all pins and buses, like a hard reset of the board."""
+    _pins.clear()
+    _buses.clear()
+
+
+class Pin(object):
+    """GPIO pin with value storage and edge interrupts.
+
+    Pins are singletons per id, so Pin(15) created by an app and by a
+    simulated device refer to the same line.
+    """
+
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 1
+    IRQ_RISING = 2
+
+    def __new__(cls, id, *args, **kwargs):
+        pin = _pins.get(id)
+        if pin is None:
+            pin = object.__new__(cls)
+            pin.id = id
+            pin.mode = -1
+            pin._value = 0
+            pin._irq_handler = None
+            pin._irq_trigger = 0
+            _pins[id] = pin
+        return pin
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.init(mode, pull, value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if mode != -1:
+            self.mode = mode
+        if value is not None:
+            self._value = int(bool(value))
+
+    def __call__(self, value=None):
+        return self.value(value)
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        old = self._value
+        self._value = int(bool(value))
+        if self._irq_handler is not None and old != self._value:
+            edge = self.IRQ_RISING if self._value else self.IRQ_FALLING
+            if self._irq_trigger & edge:
+                self._irq_handler(self)
+        return None
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING):
+        self._irq_handler = handler
+        self._irq_trigger = trigger
+
+
+class SPI(object):
+    """SPI bus that forwards traffic to attached simulated devices.
+
+    Buses are singletons per id; devices stay attached when an app
+    re-creates SPI(1) with different settings.
+
+    Args:
+        id (int): Bus number (ignored).
+        baudrate (int): Clock rate, used to simulate transfer latency.
+        latency (bool): Sleep for the time the transfer would take on
+            the wire (default False).
+    """
+
+    MSB = 0
+    LSB = 1
+
+    def __new__(cls, id=1, *args, **kwargs):
+        bus = _buses.get(id)
+        if bus is None:
+            bus = object.__new__(cls)
+            bus.id = id
+            bus.devices = []
+            bus.latency = False
+            bus.bytes_written = 0
+            bus.transfers = 0
+            _buses[id] = bus
+        return bus
+
+    def __init__(self, id=1, baudrate=1000000, polarity=0, phase=0,
+                 bits=8, firstbit=MSB, sck=None, mosi=None, miso=None,
+                 latency=None):
+        if latency is not None:
+            self.latency = latency
+        self.init(baudrate=baudrate, polarity=polarity, phase=phase)
+
+    def init(self, baudrate=1000000, polarity=0, phase=0, bits=8,
+             firstbit=MSB, sck=None, mosi=None, miso=None):
+        self.baudrate = baudrate
+        self.polarity = polarity
+        self.phase = phase
+
+    def deinit(self):
+        pass
+
+    def attach(self, device):
+        """Connect a simulated device; it must expose ``cs`` and ``receive``."""
+        self.devices.append(device)
+
+    def _selected(self):
+        return [d for d in self.devices if not d.cs.value()]
+
+    def reset_counters(self):
+        """Zero the byte and transfer counters."""
+        self.bytes_written = 0
+        self.transfers = 0
+
+    def _account(self, n):
+        self.bytes_written += n
+        self.transfers += 1
+        if self.latency:
+            sleep(n * 8 / self.baudrate)
+
+    def write(self, buf):
+        data = bytes(buf)
+        self._account(len(data))
+        for device in self._selected():
+            device.receive(data, None)
+
+    def write_readinto(self, write_buf, read_buf):
+        data = bytes(write_buf)
+        self._account(len(data))
+        for i in range(len(read_buf)):
+            read_buf[i] = 0
+        for device in self._selected():
+            device.receive(data, read_buf)
+
+    def read(self, nbytes, write=0x00):
+        buf = bytearray(nbytes)
+        self.write_readinto(bytes([write]) * nbytes, buf)
+        return bytes(buf)
+
+    def readinto(self, buf, write=0x00):
+        self.write_readinto(bytes([write]) * len(buf), buf)
+
+
+class ADC(object):
+    """Analog input that always reads zero."""
+
+    ATTN_0DB = 0
+    ATTN_2_5DB = 1
+    ATTN_6DB = 2
+    ATTN_11DB = 3
+
+    def __init__(self, pin, atten=ATTN_0DB):
+        self.pin = pin
+
+    def read(self):
+        return 0
+
+    def read_u16(self):
+        return 0
+
+    def read_uv(self):
+        return 0
+
+
+class _Memory(object):
+    def __getitem__(self, addr):
+        return 0
+
+    def __setitem__(self, addr, value):
+        pass
+
+
+mem8 = mem16 = mem32 = _Memory()
+
+
+def idle():
+    pass
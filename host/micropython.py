@@ -0,0 +1,11 @@
+"""Host stand-in for the MicroPython ``micropython`` module."""
+
+
+def const(expr):
+    """Return ``expr`` unchanged (compile-time constant on device)."""
+    return expr
+
+
+def schedule(func, arg):
+    """Run ``func(arg)`` immediately; the host has no interrupt context."""
+    func(arg)
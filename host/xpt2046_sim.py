@@ -0,0 +1,118 @@
+"""Host-side XPT2046 touch controller model.
+
+Answers the conversions Touch sends over a simulated SPI bus from the
+current pen state and drives the PENIRQ pin, so touch handling can be
+replayed from recorded traces.
+
+Trace files hold one sample per line: ``t_ms x y [z1 z2]`` for a touch
+or ``t_ms -`` for pen up.  Values are raw readings as returned by
+Touch.send_command.
+"""
+import random
+from time import sleep
+from machine import Pin
+
+# Channel select bits (A2-A0) of the control byte
+X = 0b101
+Y = 0b001
+Z1 = 0b011
+Z2 = 0b100
+
+
+class Xpt2046Sim(object):
+    """Simulated XPT2046 attached to a host SPI bus.
+
+    Args:
+        spi (machine.SPI): Host SPI bus to listen on.
+        cs, irq (Optional machine.Pin): Chip select and PENIRQ pins;
+            created if omitted.
+        noise (Optional int): Random jitter added to each X/Y conversion.
+        seed (Optional int): Seed for the jitter generator.
+    Attributes:
+        conversions (int): Number of conversions answered.
+    """
+
+    def __init__(self, spi, cs=None, irq=None, noise=0, seed=0):
+        self.cs = cs if cs is not None else Pin('tp_cs', value=1)
+        self.irq = irq if irq is not None else Pin('tp_irq', value=1)
+        self.irq.value(1)
+        self.noise = noise
+        self.random = random.Random(seed)
+        self.conversions = 0
+        self.state = None
+        spi.attach(self)
+
+    def press(self, x, y, z1=400, z2=1200):
+        """Put the pen down (or move it) at raw position x, y."""
+        self.state = (x, y, z1, z2)
+        self.irq.value(0)
+
+    def release(self):
+        """Lift the pen."""
+        self.state = None
+        self.irq.value(1)
+
+    def play(self, trace, realtime=False):
+        """Replay a trace, yielding after each sample is applied.
+
+        Args:
+            trace (list): (t_ms, x, y, z1, z2) tuples, or (t_ms, None)
+                for pen up, e.g. from load().
+            realtime (bool): Sleep between samples to honour timestamps.
+        """
+        last = None
+        for sample in trace:
+            t = sample[0]
+            if realtime and last is not None and t > last:
+                sleep((t - last) / 1000)
+            last = t
+            if sample[1] is None:
+                self.release()
+            else:
+                self.press(*sample[1:])
+            yield sample
+
+    @staticmethod
+    def load(path):
+        """Read a trace file into a list for play()."""
+        trace = []
+        with open(path) as f:
+            for line in f:
+                fields = line.split('#')[0].split()
+                if not fields:
+                    continue
+                t = int(fields[0])
+                if fields[1] == '-':
+                    trace.append((t, None))
+                else:
+                    trace.append(tuple([t] + [int(v) for v in fields[1:]]))
+        return trace
+
+    def _convert(self, channel):
+        if self.state is None:
+            return 4095 if channel == Z2 else 0
+        x, y, z1, z2 = self.state
+        if channel == X or channel == Y:
+            value = x if channel == X else y
+            if self.noise:
+                value += self.random.randint(-self.noise, self.noise)
+            return max(0, min(4095, value))
+        if channel == Z1:
+            return z1
+        if channel == Z2:
+            return z2
+        return 0
+
+    def receive(self, data, read_buf):
+        if read_buf is None:
+            return
+        for i, byte in enumerate(data):
+            if not byte & 0x80:  # Not a control byte (no start bit)
+                continue
+            value = self._convert((byte >> 4) & 0x07)
+            self.conversions += 1
+            # Touch.send_command reads (rx[1] << 4) | (rx[2] >> 4)
+            if i + 1 < len(read_buf):
+                read_buf[i + 1] = (value >> 4) & 0xFF
+            if i + 2 < len(read_buf):
+                read_buf[i + 2] = (value & 0x0F) << 4
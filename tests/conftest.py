@@ -0,0 +1,19 @@
+"""Run the drivers on the host simulator (see README, Host Simulator)."""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'host'), os.path.join(ROOT, 'drivers'),
+                os.path.join(ROOT, 'tools')]
+
+import machine  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def board():
+    """Start every test from freshly reset pins and buses."""
+    machine.reset()
+    yield
+    machine.reset()
@@ -0,0 +1,135 @@
+"""Drawing primitives allocate nothing once warmed up."""
+import gc
+from sys import implementation
+
+import pytest
+from machine import Pin, SPI
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+
+if implementation.name == 'micropython':
+    def allocated(func):
+        """Return the bytes allocated by one call of func."""
+        gc.collect()
+        gc.disable()
+        start = gc.mem_alloc()
+        func()
+        used = gc.mem_alloc() - start
+        gc.enable()
+        return used
+    BUDGET = 0
+else:
+    import tracemalloc
+
+    def allocated(func):
+        """Return the peak bytes allocated by one call of func."""
+        gc.collect()
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak - start
+    # CPython boxes ints above 256 (MicroPython keeps them in the
+    # pointer) and the pure Python kernels build point tuples, so allow
+    # that churn but not a chunk buffer; the buffers themselves are
+    # checked exactly by test_primitive_writes_preallocated_buffers
+    BUDGET = 1536
+
+PRIMITIVES = {
+    'clear': lambda d: d.clear(0x1234),
+    'fill_rectangle': lambda d: d.fill_rectangle(10, 20, 101, 77, 0xF800),
+    'fill_hrect': lambda d: d.fill_hrect(3, 5, 200, 50, 0x07E0),
+    'fill_vrect': lambda d: d.fill_vrect(3, 5, 17, 300, 0x001F),
+    'draw_hline': lambda d: d.draw_hline(0, 10, 200, 0xFFFF),
+    'draw_vline': lambda d: d.draw_vline(10, 0, 300, 0xFFFF),
+    'draw_pixel': lambda d: d.draw_pixel(5, 5, 0xFFFF),
+    'draw_line': lambda d: d.draw_line(0, 0, 239, 319, 0xFFFF),
+    'draw_rectangle': lambda d: d.draw_rectangle(5, 5, 100, 100, 0xFFFF),
+    'draw_circle': lambda d: d.draw_circle(120, 160, 50, 0xFFFF),
+    'fill_circle': lambda d: d.fill_circle(120, 160, 50, 0xFFFF),
+    'draw_ellipse': lambda d: d.draw_ellipse(120, 160, 60, 30, 0xFFFF),
+    'fill_ellipse': lambda d: d.fill_ellipse(120, 160, 60, 30, 0xFFFF),
+    'fill_triangle': lambda d: d.fill_triangle(10, 10, 200, 50, 100, 300,
+                                               0xFFFF),
+    'fill_round_rectangle': lambda d: d.fill_round_rectangle(10, 10, 150,
+                                                             100, 12, 0xFFFF),
+    'write_cmd': lambda d: d.write_cmd(d.MADCTL, d.rotation),
+}
+
+
+class NullSPI(object):
+    """SPI bus that discards writes, keeping the simulator out of the count.
+
+    With record set, the buffers written are kept in written.
+    """
+
+    def __init__(self):
+        self.record = False
+        self.written = []
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def deinit(self):
+        pass
+
+    def write(self, buf):
+        if self.record:
+            self.written.append(buf)
+
+
+@pytest.fixture
+def display():
+    return Display(NullSPI(), cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                   width=240, height=320)
+
+
+@pytest.mark.parametrize('name', sorted(PRIMITIVES))
+def test_primitive_allocates_nothing(display, name):
+    draw = PRIMITIVES[name]
+    for _ in range(3):  # Warm up caches and scratch buffers
+        draw(display)
+    assert allocated(lambda: draw(display)) <= BUDGET
+
+
+@pytest.mark.parametrize('name', sorted(PRIMITIVES))
+def test_primitive_writes_preallocated_buffers(display, name):
+    draw = PRIMITIVES[name]
+    spi = display.spi
+    draw(display)
+    spi.record = True
+    draw(display)
+    first = spi.written
+    spi.written = []
+    draw(display)
+    spi.record = False
+    for buf in spi.written:
+        assert any(buf is old for old in first), buf
+
+
+@pytest.mark.parametrize('x, y, w, h', [
+    (0, 0, 240, 320), (3, 5, 200, 50), (3, 5, 17, 300), (7, 9, 1, 1),
+    (230, 310, 31, 13)])
+def test_solid_fills_draw_the_rectangle(x, y, w, h):
+    panel = Ili9341Sim(SPI(1), cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(SPI(1), cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    for fill, color in ((display.fill_hrect, 0xF800),
+                        (display.fill_vrect, 0x07E0),
+                        (display.fill_rectangle, 0x001F)):
+        display.clear()
+        fill(x, y, w, h, color)
+        x2 = min(x + w, 240) - 1
+        y2 = min(y + h, 320) - 1
+        if display.is_off_grid(x, y, x + w - 1, y + h - 1) and \
+                fill is not display.fill_rectangle:
+            assert panel.pixel(x, y) == 0
+            continue
+        for px, py in ((x, y), (x2, y), (x, y2), (x2, y2)):
+            assert panel.pixel(px, py) == color
+        for px, py in ((x - 1, y), (x2 + 1, y2), (x, y2 + 1)):
+            if 0 <= px < 240 and 0 <= py < 320:
+                assert panel.pixel(px, py) == 0
+    display.clear(0x1234)
+    assert panel.pixel(0, 0) == panel.pixel(239, 319) == 0x1234
@@ -0,0 +1,67 @@
+"""Banded rendering from a recorded display list."""
+import pytest
+from machine import Pin, SPI
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+
+
+def scene(display):
+    display.fill_rectangle(0, 0, 240, 320, 0x0010)
+    display.fill_rectangle(20, 30, 150, 200, 0xF800)
+    display.draw_circle(120, 160, 70, 0xFFFF)
+    display.draw_text8x8(8, 300, 'Banded', 0x07E0, 0x0000)
+    sprite = bytearray(16 * 16 * 2)
+    for i in range(0, len(sprite), 2):
+        sprite[i] = i & 0xFF
+    display.draw_sprite(sprite, 200, 10, 16, 16)
+
+
+def setup():
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    return panel, display
+
+
+@pytest.mark.parametrize('band_height', [16, 24, 320])
+def test_bands_match_direct_drawing(band_height):
+    panel, display = setup()
+    scene(display)
+    direct = bytes(panel.gram)
+    display.clear(0x1234)
+    display.framebuffer(band_height=band_height)  # 24 leaves a short band
+    scene(display)
+    display.show()
+    assert bytes(panel.gram) == direct
+
+
+def test_full_screen_fill_discards_older_ops():
+    panel, display = setup()
+    display.framebuffer(band_height=16)
+    display.fill_rectangle(10, 10, 5, 5, 0xF800)
+    display.draw_pixel(3, 3, 0xF800)
+    assert len(display._fb.ops) == 2
+    display.fill_rectangle(0, 0, 240, 320, 0x001F)
+    assert len(display._fb.ops) == 1
+
+
+def test_mutable_blit_source_is_copied():
+    panel, display = setup()
+    display.framebuffer(band_height=16)
+    sprite = bytearray(b'\xf8\x00' * 64)
+    display.draw_sprite(sprite, 40, 40, 8, 8)
+    sprite[:] = bytes(128)  # Reused before the frame is shown
+    display.show()
+    assert panel.pixel(40, 40) == panel.pixel(47, 47) == 0xF800
+
+
+def test_each_frame_starts_from_the_background():
+    panel, display = setup()
+    display.framebuffer(band_height=32, background=0x07E0)
+    display.fill_rectangle(0, 0, 10, 10, 0xF800)
+    display.show()
+    assert panel.pixel(0, 0) == 0xF800
+    assert panel.pixel(239, 319) == 0x07E0
+    display.show()  # The display list was cleared by the first show
+    assert panel.pixel(0, 0) == 0x07E0
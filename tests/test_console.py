@@ -0,0 +1,122 @@
+"""ScrollingConsole on the panel's hardware vertical scroll."""
+import pytest
+from machine import Pin, SPI
+from console import ScrollingConsole
+from font import Font
+from font_converter import build
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+
+RED = 0xF800
+BLUE = 0x001F
+HEADER = 20
+FOOTER = 13
+LINE = 8  # Rows per line; letters are 6 rows high
+
+
+def setup(rotation):
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320, rotation=rotation)
+    return panel, display
+
+
+def block_font():
+    """Return a font whose 'A' is a solid 5x6 block."""
+    return Font(build(6, {65: [[255] * 5] * 6}, 1))
+
+
+def shown(panel, x, y):
+    """Return the color the glass shows at logical x, y."""
+    px, py = panel._physical(x, y)
+    top, area, _ = panel.scroll_def
+    if top <= py < top + area:
+        py = top + (panel.scroll_start - top + py - top) % area
+    return panel.pixel(px, py, physical=True)
+
+
+def check_line(panel, y, letters):
+    """Assert the text line at row y holds letters blocks of 'A'."""
+    end = letters * 6 - 1  # Last letter's spacing is background
+    assert shown(panel, 0, y) == RED
+    assert shown(panel, end - 1, y + 5) == RED
+    assert shown(panel, end, y) == BLUE
+    assert shown(panel, 239, y) == BLUE
+    assert shown(panel, 0, y + 6) == shown(panel, 0, y + 7) == BLUE
+
+
+@pytest.fixture(params=[0, 180])  # MADCTL MY set for 0, clear for 180
+def rig(request):
+    panel, display = setup(request.param)
+    display.fill_rectangle(0, 0, 240, HEADER, 0x07E0)
+    display.fill_rectangle(0, 320 - FOOTER, 240, FOOTER, 0xFFE0)
+    console = ScrollingConsole(display, block_font(), RED, BLUE, HEADER,
+                               FOOTER, line_height=LINE)
+    return panel, display, console
+
+
+def check_margins(panel):
+    for y in (0, HEADER - 1):
+        assert shown(panel, 100, y) == 0x07E0
+    # The partial line left over (7 rows) joins the footer
+    assert shown(panel, 100, HEADER + 35 * LINE) == 0
+    for y in (320 - FOOTER, 319):
+        assert shown(panel, 100, y) == 0xFFE0
+
+
+def test_scroll_area_definition(rig):
+    panel, display, console = rig
+    assert (console.lines, console.area, console.footer) == (35, 280, 20)
+    if console.flipped:
+        assert panel.scroll_def == (20, 280, 20)  # Footer is on top
+        assert panel.scroll_start == 20
+    else:
+        assert panel.scroll_def == (HEADER, 280, 20)
+        assert panel.scroll_start == HEADER
+
+
+def test_lines_fill_then_scroll(rig):
+    panel, display, console = rig
+    for i in range(35):
+        console.write('A' * (i % 39 + 1))
+    start = panel.scroll_start
+    for i in range(35):
+        check_line(panel, HEADER + i * LINE, i + 1)
+    check_margins(panel)
+    for i in range(35, 40):
+        panel.reset_counters()
+        console.write('A' * (i % 39 + 1))
+        assert panel.pixels_written == 240 * LINE  # Only the new line
+    # Five lines scrolled off: the start address moved five lines
+    moved = 5 * LINE if not console.flipped else 280 - 5 * LINE
+    assert panel.scroll_start == 20 + (start - 20 + moved) % 280
+    for line in range(35):
+        check_line(panel, HEADER + line * LINE, (line + 5) % 39 + 1)
+    check_margins(panel)
+
+
+def test_long_lines_wrap(rig):
+    panel, display, console = rig
+    console.write('A' * 50 + '\n' + 'AAA')
+    assert console.count == 3
+    check_line(panel, HEADER, 40)  # 40 letters fill the 240 pixels
+    check_line(panel, HEADER + LINE, 10)
+    check_line(panel, HEADER + 2 * LINE, 3)
+
+
+def test_builtin_font_wraps_at_30_columns():
+    panel, display = setup(180)
+    console = ScrollingConsole(display, header=8)
+    console.write('x' * 70)
+    assert console.count == 3
+    assert console._wrap('x' * 70) == ['x' * 30, 'x' * 30, 'x' * 10]
+
+
+def test_close_restores_the_whole_screen(rig):
+    panel, display, console = rig
+    for i in range(40):
+        console.write('A')
+    console.close()
+    assert panel.scroll_def == (0, 320, 0)
+    assert panel.scroll_start == 0
@@ -0,0 +1,45 @@
+"""Filled shapes split into rectangles."""
+import pytest
+from machine import Pin, SPI
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+
+POLYGONS = [(3, 50, 0), (4, 60, 45), (5, 80, 0), (6, 60, 0), (6, 60, 30),
+            (8, 100, 22.5), (12, 100, 0), (7, 90, 10)]
+
+
+def setup():
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    return spi, panel, display
+
+
+def by_rows(display, *args):
+    """Fill a polygon with one rectangle per run of equal rows."""
+    display._fill_convex = display._fill_spans
+    display.fill_polygon(*args)
+    del display._fill_convex
+
+
+@pytest.mark.parametrize('sides, r, rotate', POLYGONS)
+@pytest.mark.parametrize('x0, y0', [(120, 160), (20, 300)])  # Clipped
+def test_polygon_matches_row_spans(sides, r, rotate, x0, y0):
+    spi, panel, display = setup()
+    by_rows(display, sides, x0, y0, r, 0xF800, rotate)
+    rows = bytes(panel.gram)
+    display.clear()
+    display.fill_polygon(sides, x0, y0, r, 0xF800, rotate)
+    assert bytes(panel.gram) == rows
+
+
+@pytest.mark.parametrize('sides, rotate', [(5, 0), (6, 0), (8, 0)])
+def test_sloped_sides_use_columns(sides, rotate):
+    spi, panel, display = setup()
+    spi.reset_counters()
+    by_rows(display, sides, 120, 160, 60, 0xF800, rotate)
+    rows = spi.transfers
+    spi.reset_counters()
+    display.fill_polygon(sides, 120, 160, 60, 0xF800, rotate)
+    assert spi.transfers < rows * 0.8
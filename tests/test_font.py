@@ -0,0 +1,117 @@
+"""TFNT fonts from tools/font_converter.py drawn with draw_text."""
+import sys
+
+import pytest
+from machine import Pin, SPI
+from font import Font
+from font_converter import build, main
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+
+# 'B' is left out to check missing letters
+GLYPHS = {
+    'A': ['.##..',
+          '#..#.',
+          '####.',
+          '#..#.',
+          '#..#.',
+          '.....'],
+    'C': ['.###',
+          '#...',
+          '#...',
+          '.###',
+          '....',
+          '..#.'],  # Descender
+}
+ASCENT = 4
+DESCENT = 2
+
+
+def bdf():
+    """Return a BDF font holding GLYPHS, one cell per glyph."""
+    lines = ['STARTFONT 2.1', 'FONT test', 'SIZE 6 75 75',
+             'FONTBOUNDINGBOX 5 6 0 -2', 'STARTPROPERTIES 2',
+             'FONT_ASCENT %d' % ASCENT, 'FONT_DESCENT %d' % DESCENT,
+             'ENDPROPERTIES', 'CHARS %d' % len(GLYPHS)]
+    for char, rows in sorted(GLYPHS.items()):
+        w = len(rows[0])
+        lines += ['STARTCHAR %s' % char, 'ENCODING %d' % ord(char),
+                  'DWIDTH %d 0' % w, 'BBX %d %d 0 %d' % (w, len(rows),
+                                                        -DESCENT),
+                  'BITMAP']
+        for row in rows:
+            bits = int(row.replace('.', '0').replace('#', '1'), 2)
+            lines.append('%02X' % (bits << (8 - w)))
+        lines.append('ENDCHAR')
+    lines.append('ENDFONT')
+    return '\n'.join(lines) + '\n'
+
+
+@pytest.fixture(params=['file', 'bytes'])
+def source(request, tmp_path, monkeypatch):
+    """Return a function converting the BDF font to a Font at bpp."""
+    (tmp_path / 'test.bdf').write_text(bdf())
+
+    def convert(bpp):
+        output = tmp_path / ('test.fnt' if request.param == 'file' else
+                             'test_font.py')
+        monkeypatch.setattr(sys, 'argv', [
+            'font_converter.py', str(tmp_path / 'test.bdf'), str(output),
+            '--bpp', str(bpp), '--first', '65', '--last', '90'])
+        main()
+        if request.param == 'file':
+            return Font(str(output))
+        module = {}
+        exec(output.read_text(), module)
+        return Font(module['FONT'])
+    return convert
+
+
+def setup():
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    return panel, display
+
+
+@pytest.mark.parametrize('bpp', [1, 4])
+def test_round_trip(source, bpp):
+    font = source(bpp)
+    assert (font.bpp, font.height, font.first) == (bpp, 6, 65)
+    assert font.get_width('A') == 5 and font.get_width('B') == 0
+    assert font.measure_text('CA') == 11
+    panel, display = setup()
+    display.draw_text(10, 20, 'CAC', font, 0xF800, 0x001F)
+    x = 10
+    for char in 'CAC':
+        rows = GLYPHS[char]
+        for r, row in enumerate(rows):
+            for c, cell in enumerate(row + '.'):  # One pixel of spacing
+                want = 0xF800 if cell == '#' else 0x001F
+                assert panel.pixel(x + c, 20 + r) == want, (char, r, c)
+        x += len(rows[0]) + 1
+    assert panel.pixel(x, 20) == 0
+    font.close()
+
+
+def test_landscape_round_trip(source):
+    font = source(1)
+    panel, display = setup()
+    display.draw_text(50, 100, 'A', font, 0xFFFF, 0, landscape=True)
+    # Letters run upwards from y: glyph column c lands on row y - 1 - c
+    for r, row in enumerate(GLYPHS['A']):
+        for c, cell in enumerate(row):
+            want = 0xFFFF if cell == '#' else 0
+            assert panel.pixel(50 + r, 99 - c) == want
+
+
+def test_four_bpp_blends_coverage():
+    levels = [0, 51, 102, 153, 204, 255]
+    font = Font(build(1, {65: [levels]}, 4))
+    panel, display = setup()
+    display.draw_text(0, 0, 'A', font, 0xFFFF, 0x0000)
+    reds = [panel.pixel(c, 0) >> 11 for c in range(len(levels))]
+    assert reds[0] == 0 and reds[-1] == 31
+    assert reds == sorted(reds) and len(set(reds)) == len(levels)
+    assert panel.pixel(2, 0) == 0x632C  # 6 / 15 of white
@@ -0,0 +1,102 @@
+"""Frame buffer show/flush report the bytes actually sent."""
+import asyncio
+
+import pytest
+from machine import Pin, SPI
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+
+
+def draw(display):
+    display.fill_rectangle(0, 0, 240, 320, 0x001F)
+    display.fill_rectangle(10, 20, 50, 30, 0xF800)
+    display.draw_line(200, 10, 230, 300, 0x07E0)
+
+
+def send(display, flush):
+    if flush:
+        return asyncio.run(display.flush(rows=16))
+    return display.show()
+
+
+@pytest.mark.parametrize('flush', [False, True])
+@pytest.mark.parametrize('band_height', [0, 16])
+def test_frame_bytes_match_the_wire(band_height, flush):
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    display.framebuffer(band_height=band_height)
+    for _ in range(2):  # Second frame starts from a cached window
+        draw(display)
+        start = spi.bytes_written
+        sent = send(display, flush)
+        assert sent == spi.bytes_written - start
+        assert display.frame_bytes == sent
+    assert panel.pixel(10, 20) == 0xF800
+    assert panel.pixel(239, 0) == 0x001F
+
+
+@pytest.mark.parametrize('band_height', [0, 16])
+def test_flush_yields_between_strips(band_height):
+    spi = SPI(1, baudrate=40000000, latency=True)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    display.framebuffer(band_height=band_height)
+    draw(display)
+    strips = []
+    ticks = []
+    write_block = display._write_block
+
+    def counted_write_block(*args):
+        strips.append(len(ticks))
+        return write_block(*args)
+
+    display._write_block = counted_write_block
+
+    async def ticker(flushing):
+        while not flushing.done():
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    async def main():
+        flushing = asyncio.ensure_future(display.flush(rows=16))
+        await ticker(flushing)
+
+    asyncio.run(main())
+    assert len(strips) == 20
+    assert strips == sorted(set(strips))  # Another task ran between strips
+    timing = display.frame_timing()
+    assert timing['transfer_us'] > 0
+    assert timing['flush_us'] >= timing['transfer_us']
+    assert timing['bytes'] == display.frame_bytes
+    assert panel.pixel(10, 20) == panel.pixel(59, 49) == 0xF800
+    assert panel.pixel(239, 0) == panel.pixel(0, 319) == 0x001F
+    assert panel.pixel(215, 155) == 0x07E0  # On the line
+
+
+def test_drawing_during_full_frame_flush_does_not_tear():
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    display.framebuffer()
+    display.fill_rectangle(0, 0, 240, 320, 0x001F)
+
+    async def main():
+        flushing = asyncio.ensure_future(display.flush(rows=16))
+        await asyncio.sleep(0)  # First strip sent
+        display.fill_rectangle(0, 0, 240, 320, 0xF800)  # Next frame
+        display.draw_pixel(5, 5, 0x07E0)
+        assert display._flush_strips is None
+        assert panel.pixel(239, 319) == 0x001F  # Old frame sent in full
+        return await flushing
+
+    sent = asyncio.run(main())
+    assert sent > 240 * 320 * 2  # The whole frame, counted once
+    assert display.frame_bytes == sent
+    assert panel.pixel(0, 0) == 0x001F
+    display.show()
+    assert panel.pixel(0, 0) == panel.pixel(239, 319) == 0xF800
+    assert panel.pixel(5, 5) == 0x07E0
@@ -0,0 +1,75 @@
+"""Off-screen frame buffer mode and its dirty rectangles."""
+import pytest
+from machine import Pin, SPI
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+
+
+@pytest.fixture
+def rig():
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    display.framebuffer()
+    return spi, panel, display
+
+
+def test_nothing_is_sent_until_show(rig):
+    spi, panel, display = rig
+    spi.reset_counters()
+    display.fill_rectangle(10, 10, 20, 20, 0xF800)
+    display.draw_pixel(100, 100, 0x07E0)
+    assert spi.bytes_written == 0
+    assert panel.pixel(10, 10) == 0
+    display.show()
+    assert panel.pixel(10, 10) == panel.pixel(29, 29) == 0xF800
+    assert panel.pixel(100, 100) == 0x07E0
+    assert display.show() == 0  # Nothing left to send
+
+
+@pytest.mark.parametrize('second, merged', [
+    ((15, 15, 30, 30), [[10, 10, 44, 44]]),  # Overlapping
+    ((30, 10, 10, 20), [[10, 10, 39, 29]]),  # Touching on the right
+    ((12, 12, 4, 4), [[10, 10, 29, 29]]),  # Inside
+    ((100, 100, 5, 5), [[10, 10, 29, 29], [100, 100, 104, 104]]),
+])
+def test_dirty_rectangles_merge(rig, second, merged):
+    spi, panel, display = rig
+    display.fill_rectangle(10, 10, 20, 20, 0xF800)
+    display.fill_rectangle(*second, 0x07E0)
+    assert display._dirty == merged
+
+
+def test_dirty_list_collapses_after_eight(rig):
+    spi, panel, display = rig
+    for i in range(8):
+        display.fill_rectangle(i * 20, i * 30, 5, 5, 0xF800)
+    assert len(display._dirty) == 8
+    display.fill_rectangle(200, 300, 5, 5, 0xF800)
+    assert display._dirty == [[0, 0, 204, 304]]
+
+
+def test_dirty_rectangles_are_clipped(rig):
+    spi, panel, display = rig
+    display.fill_rectangle(-10, 310, 30, 30, 0xF800)
+    assert display._dirty == [[0, 310, 19, 319]]
+
+
+def test_show_sends_only_dirty_pixels(rig):
+    spi, panel, display = rig
+    display.fill_rectangle(50, 60, 10, 4, 0x001F)
+    panel.reset_counters()
+    display.show()
+    assert panel.pixels_written == 40
+    assert panel.pixel(50, 60) == 0x001F
+    assert panel.pixel(60, 60) == 0
+
+
+def test_disabling_shows_pending_changes(rig):
+    spi, panel, display = rig
+    display.draw_hline(0, 5, 240, 0xFFFF)
+    display.framebuffer(False)
+    assert panel.pixel(239, 5) == 0xFFFF
+    display.draw_pixel(1, 1, 0xF800)  # Straight to the panel again
+    assert panel.pixel(1, 1) == 0xF800
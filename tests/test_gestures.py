@@ -0,0 +1,102 @@
+"""StrokeTracker strokes and gestures from simulated pen traces."""
+import pytest
+from machine import Pin, SPI
+import gestures
+from gestures import (StrokeTracker, TAP, HOLD, SWIPE_LEFT, SWIPE_RIGHT,
+                      SWIPE_UP, SWIPE_DOWN)
+from xpt2046 import Touch
+from xpt2046_sim import Xpt2046Sim
+
+
+@pytest.fixture
+def rig(monkeypatch):
+    """Tracker on a Touch whose raw readings are screen coordinates."""
+    pen = Xpt2046Sim(SPI(2), cs=Pin(33))
+    touch = Touch(SPI(2), cs=Pin(33), matrix=((1, 0, 0), (0, 1, 0)))
+    clock = [gestures.ticks_ms()]
+    monkeypatch.setattr(gestures, 'ticks_ms', lambda: clock[0])
+    log = []
+    tracker = StrokeTracker(
+        touch,
+        on_move=lambda *segment: log.append(('move',) + segment),
+        on_gesture=lambda *gesture: log.append(gesture),
+        on_down=lambda x, y: log.append(('down', x, y)),
+        on_up=lambda x, y: log.append(('up', x, y)))
+
+    def stroke(points, step_ms=30):
+        """Drag the pen through points, updating the tracker each step."""
+        for x, y in points:
+            pen.press(x, y)
+            tracker.update()
+            clock[0] += step_ms
+        pen.release()
+        tracker.update()
+        clock[0] += step_ms
+
+    return pen, touch, tracker, clock, log, stroke
+
+
+def test_tap(rig):
+    pen, touch, tracker, clock, log, stroke = rig
+    stroke([(100, 100), (102, 101), (101, 100)])
+    assert log == [('down', 100, 100), ('move', 100, 100, 102, 101),
+                   ('up', 102, 101), (TAP, 100, 100)]
+    assert not tracker.down
+
+
+def test_hold_replaces_the_tap(rig):
+    pen, touch, tracker, clock, log, stroke = rig
+    stroke([(50, 60)] * 25)  # 750 ms still
+    assert log == [('down', 50, 60), (HOLD, 50, 60), ('up', 50, 60)]
+
+
+def test_hold_waits_for_hold_ms(rig):
+    pen, touch, tracker, clock, log, stroke = rig
+    stroke([(50, 60)] * 20)  # Last update 570 ms in
+    assert log[-1] == (TAP, 50, 60)
+
+
+@pytest.mark.parametrize('dx, dy, gesture', [
+    (1, 0, SWIPE_RIGHT), (-1, 0, SWIPE_LEFT), (0, 1, SWIPE_DOWN),
+    (0, -1, SWIPE_UP), (1, 1, SWIPE_RIGHT)])  # Diagonals go horizontal
+def test_swipes(rig, dx, dy, gesture):
+    pen, touch, tracker, clock, log, stroke = rig
+    stroke([(120 + dx * i, 160 + dy * i) for i in range(0, 61, 15)])
+    moves = [entry[1:] for entry in log if entry[0] == 'move']
+    assert len(moves) == 4
+    for a, b in zip(moves, moves[1:]):
+        assert a[2:] == b[:2]  # Segments join into one stroke
+    assert log[-1] == (gesture, 120, 160)
+
+
+def test_wandering_stroke_is_no_gesture(rig):
+    pen, touch, tracker, clock, log, stroke = rig
+    stroke([(100, 100), (120, 100), (100, 100)])
+    assert log[-1] == ('up', 100, 100)
+
+
+def test_small_moves_are_not_reported(rig):
+    pen, touch, tracker, clock, log, stroke = rig
+    stroke([(100, 100), (101, 100), (101, 101), (102, 101)])
+    assert [entry[0] for entry in log] == ['down', 'move', 'up', TAP]
+
+
+def test_polls_are_spaced_by_interval_ms(rig, monkeypatch):
+    pen, touch, tracker, clock, log, stroke = rig
+    polls = []
+    poll = touch.poll
+
+    def counted_poll(raw=False):
+        polls.append(clock[0])
+        return poll(raw)
+
+    monkeypatch.setattr(touch, 'poll', counted_poll)
+    pen.press(100, 100)
+    for _ in range(10):
+        assert tracker.update()
+        clock[0] += 7
+    # Updates at 0, 7, ... 63 ms poll at 0, 21, 42 and 63
+    assert [t - polls[0] for t in polls] == [0, 21, 42, 63]
+    pen.release()
+    clock[0] += 20
+    assert not tracker.update()
@@ -0,0 +1,106 @@
+"""Rendered glyphs served from the LRU glyph cache."""
+import pytest
+from machine import Pin, SPI
+from font import Font
+from font_converter import build
+from ili9341 import Display, GlyphCache
+from ili9341_sim import Ili9341Sim
+
+
+def setup(glyph_cache=4096):
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320, glyph_cache=glyph_cache)
+    return panel, display
+
+
+def font():
+    """Return a small 4 bpp font whose glyphs differ per character."""
+    cells = {}
+    for code in range(ord('A'), ord('Z') + 1):
+        w = 4 + code % 5
+        cells[code] = [[(code * 7 + r * 31 + c * 17) % 256 for c in range(w)]
+                       for r in range(10)]
+    return Font(build(10, cells, 4))
+
+
+def test_hits_and_misses():
+    cache = GlyphCache(1024)
+    assert cache.get('a') is None
+    assert cache.put('a', 'A', 100) == 'A'
+    assert cache.get('a') == 'A'
+    assert (cache.hits, cache.misses, cache.size) == (1, 1, 100)
+    cache.put('a', 'A2', 50)  # Replacing an entry recharges its size
+    assert cache.get('a') == 'A2'
+    assert cache.size == 50
+
+
+def test_least_recently_used_is_evicted():
+    cache = GlyphCache(300)
+    cache.put('a', 'A', 128)
+    cache.put('b', 'B', 128)
+    cache.get('a')  # b is now the oldest
+    cache.put('c', 'C', 128)
+    assert cache.size == 256 <= cache.budget
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A' and cache.get('c') == 'C'
+
+
+@pytest.mark.parametrize('budget, nbytes', [(100, 128), (0, 1)])
+def test_entries_over_budget_are_not_kept(budget, nbytes):
+    cache = GlyphCache(budget)
+    assert cache.put('a', 'A', nbytes) == 'A'
+    assert cache.get('a') is None
+    assert cache.size == 0
+
+
+def test_repeated_text_hits_the_cache():
+    panel, display = setup()
+    display.draw_text8x8(0, 0, 'ABAB', 0xF800)
+    assert display.glyph_cache.misses == 2
+    assert display.glyph_cache.hits == 2
+    first = bytes(panel.gram)
+    display.clear()
+    display.draw_text8x8(0, 0, 'ABAB', 0xF800)
+    assert display.glyph_cache.misses == 2
+    assert bytes(panel.gram) == first
+
+
+def test_small_budget_keeps_the_latest_glyphs():
+    panel, display = setup(glyph_cache=3 * 128)
+    display.draw_text8x8(0, 0, 'ABCDE', 0xFFFF, 0x001F)
+    assert display.glyph_cache.size == 3 * 128
+    display.glyph_cache.hits = display.glyph_cache.misses = 0
+    display.draw_text8x8(0, 10, 'CDEAB', 0xFFFF, 0x001F)
+    assert display.glyph_cache.hits == 3
+    assert display.glyph_cache.misses == 2
+
+
+@pytest.mark.parametrize('rotate', [0, 90, 180, 270])
+def test_text8x8_matches_uncached(rotate):
+    panel, display = setup(glyph_cache=0)
+    for _ in range(2):
+        display.draw_text8x8(40, 100, 'Cache me', 0x07E0, 0x1234, rotate)
+    uncached = bytes(panel.gram)
+    panel, display = setup(glyph_cache=512)  # Evicts while drawing
+    for _ in range(2):
+        display.draw_text8x8(40, 100, 'Cache me', 0x07E0, 0x1234, rotate)
+    assert bytes(panel.gram) == uncached
+
+
+@pytest.mark.parametrize('landscape, rotate_180', [
+    (False, False), (True, False), (False, True)])
+def test_font_text_matches_uncached(landscape, rotate_180):
+    panel, display = setup(glyph_cache=0)
+    f = font()
+    for color in (0xF800, 0x07E0, 0xF800):  # Colors are part of the key
+        display.draw_text(60, 80, 'ABBA', f, color, 0x0010,
+                          landscape, rotate_180)
+    uncached = bytes(panel.gram)
+    panel, display = setup()
+    for color in (0xF800, 0x07E0, 0xF800):
+        display.draw_text(60, 80, 'ABBA', f, color, 0x0010,
+                          landscape, rotate_180)
+    assert display.glyph_cache.hits > 0
+    assert bytes(panel.gram) == uncached
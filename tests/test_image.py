@@ -0,0 +1,85 @@
+"""draw_image with raw and RLE files from tools/image_converter.py."""
+import sys
+from struct import pack
+
+import pytest
+from machine import Pin, SPI
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+from image_converter import main
+
+W = 150
+H = 40
+
+
+def pixels():
+    """Return raw RGB565 pixels mixing long runs and literal stretches."""
+    out = bytearray()
+    for y in range(H):
+        for x in range(W):
+            if y < 10:
+                c = 0xF800  # Runs longer than a packet, across rows
+            elif x < 60:
+                c = (x * 1031 + y * 257) & 0xFFFF  # Literals
+            else:
+                c = 0x07E0 if (x // 7 + y) % 2 else 0x001F
+            out += pack('>H', c)
+    return out
+
+
+@pytest.fixture(params=['raw', 'rle'])
+def image(request, tmp_path, monkeypatch):
+    raw = tmp_path / 'image.raw'
+    raw.write_bytes(pixels())
+    if request.param == 'raw':
+        return str(raw)
+    rle = tmp_path / 'image.rle'
+    monkeypatch.setattr(sys, 'argv', [
+        'image_converter.py', str(raw), str(rle), '--rle',
+        '--raw', '%dx%d' % (W, H)])
+    main()
+    assert rle.stat().st_size < W * H  # Actually compressed
+    return str(rle)
+
+
+def setup(image_buffer=4096):
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320, image_buffer=image_buffer)
+    return panel, display
+
+
+def check(panel, x, y):
+    """Assert the panel shows the image at x, y and nothing else."""
+    src = pixels()
+    for py in range(320):
+        for px in range(240):
+            ix, iy = px - x, py - y
+            if 0 <= ix < W and 0 <= iy < H:
+                i = (iy * W + ix) * 2
+                want = src[i] << 8 | src[i + 1]
+            else:
+                want = 0
+            assert panel.pixel(px, py) == want, (px, py)
+
+
+@pytest.mark.parametrize('x, y', [
+    (20, 30),  # On the display
+    (-37, -13),  # Clipped left and top
+    (170, 295),  # Clipped right and bottom
+    (-20, 100),  # Clipped left only, so each row is cut
+])
+@pytest.mark.parametrize('image_buffer', [4096, 64])  # 64: under a row
+def test_image_is_decoded_and_clipped(image, x, y, image_buffer):
+    panel, display = setup(image_buffer)
+    display.draw_image(image, x, y, W, H)
+    check(panel, x, y)
+
+
+def test_image_off_the_display_sends_nothing(image):
+    panel, display = setup()
+    panel.reset_counters()
+    display.draw_image(image, 240, 0, W, H)
+    display.draw_image(image, 0, -H, W, H)
+    assert panel.pixels_written == 0
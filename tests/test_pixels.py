@@ -0,0 +1,47 @@
+"""Outline primitives stream their pixels as runs."""
+import pytest
+from machine import Pin, SPI
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+
+SHAPES = {
+    'line': lambda d: d.draw_line(120, 160, 168, 184, 0xF800),
+    'steep_line': lambda d: d.draw_line(120, 160, 96, 208, 0xF800),
+    'circle': lambda d: d.draw_circle(120, 160, 50, 0x07E0),
+    'clipped_circle': lambda d: d.draw_circle(10, 300, 40, 0x07E0),
+    'ellipse': lambda d: d.draw_ellipse(120, 160, 80, 40, 0x001F),
+    'tall_ellipse': lambda d: d.draw_ellipse(120, 160, 20, 90, 0x001F),
+    'polygon': lambda d: d.draw_polygon(6, 120, 160, 60, 0xFFFF, 15),
+}
+
+
+def setup():
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    return spi, panel, display
+
+
+@pytest.mark.parametrize('name', sorted(SHAPES))
+def test_streamed_pixels_match_frame_buffer(name):
+    spi, panel, display = setup()
+    SHAPES[name](display)
+    direct = bytes(panel.gram)
+    display.clear()
+    display.framebuffer()
+    SHAPES[name](display)
+    display.show()
+    assert bytes(panel.gram) == direct
+
+
+@pytest.mark.parametrize('name, pixels', [('circle', 292), ('ellipse', 360)])
+def test_outline_runs_share_windows(name, pixels):
+    spi, panel, display = setup()
+    SHAPES[name](display)
+    spi.reset_counters()
+    panel.reset_counters()
+    SHAPES[name](display)
+    assert panel.pixels_written <= pixels
+    # One address window per pixel would be about 5 transfers a pixel
+    assert spi.transfers < 3 * pixels
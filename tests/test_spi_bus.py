@@ -0,0 +1,109 @@
+"""Display and Touch sharing one SPI bus."""
+import asyncio
+
+import pytest
+from machine import Pin, SPI
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+from spi_bus import SharedSPI
+from xpt2046 import Touch
+from xpt2046_sim import Xpt2046Sim
+
+
+@pytest.fixture
+def rig():
+    """Display and Touch on SPI(1), logging the device of each transfer."""
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    pen = Xpt2046Sim(spi, cs=Pin(33), irq=Pin(36))
+    bus = SharedSPI(spi)
+    lcd = bus.device(Pin(15), 40000000)
+    tp = bus.device(Pin(33), 1000000)
+    display = Display(lcd, cs=lcd.cs, dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    touches = []
+    touch = Touch(tp, cs=tp.cs, int_pin=Pin(36),
+                  int_handler=lambda x, y: touches.append((x, y)))
+    log = []
+    write, write_readinto = spi.write, spi.write_readinto
+
+    def who():
+        return 'lcd' if not Pin(15).value() else 'tp'
+
+    def logged_write(buf):
+        log.append(who())
+        write(buf)
+
+    def logged_write_readinto(tx, rx):
+        log.append(who())
+        write_readinto(tx, rx)
+
+    spi.write = logged_write
+    spi.write_readinto = logged_write_readinto
+    yield panel, pen, bus, display, touch, touches, log
+    del spi.write, spi.write_readinto
+
+
+def frame_traffic(log):
+    """Return the slice of log from the first to the last display write."""
+    first = log.index('lcd')
+    last = len(log) - log[::-1].index('lcd')
+    return log[first:last]
+
+
+def test_pen_interrupt_waits_for_banded_show(rig):
+    panel, pen, bus, display, touch, touches, log = rig
+    display.framebuffer(band_height=16)
+    display.fill_rectangle(0, 0, 240, 320, 0x07E0)
+    strips = []
+    write_block = display._write_block
+
+    def pressing_write_block(*args):
+        strips.append(len(touches))
+        if len(strips) == 3:
+            pen.press(1000, 1000)  # Pen interrupt mid-frame
+        return write_block(*args)
+
+    display._write_block = pressing_write_block
+    log.clear()
+    display.show()
+    assert len(strips) == 20
+    assert not any(strips)  # No touch callback ran inside the frame
+    assert 'tp' not in frame_traffic(log)
+    assert 'tp' in log  # The deferred sample ran once the frame was sent
+    assert len(touches) == 1
+    assert not bus.locked()
+    assert panel.pixel(239, 319) == 0x07E0
+
+
+@pytest.mark.parametrize('band_height', [0, 16])
+def test_poll_waits_for_flush(rig, band_height):
+    panel, pen, bus, display, touch, touches, log = rig
+    display.framebuffer(band_height=band_height)
+    display.fill_rectangle(0, 0, 240, 320, 0xF800)
+    pen.press(1000, 1000)
+    touch.poll()  # Pen down before the frame
+    polls = []
+
+    async def poller(flushing):
+        while not flushing.done():
+            polls.append(touch.poll())
+            await asyncio.sleep(0)
+        polls.append(touch.poll())
+
+    async def main():
+        flushing = asyncio.ensure_future(display.flush(rows=16))
+        await asyncio.sleep(0)  # Let the flush send its first strip
+        await poller(flushing)
+        return flushing.result()
+
+    log.clear()
+    sent = asyncio.run(main())
+    assert sent > 0
+    assert len(polls) > 2  # Polls ran between strips
+    assert all(p is None for p in polls[:-1])
+    assert polls[-1] is not None
+    assert 'tp' not in frame_traffic(log)
+    assert log[-1] == 'tp'
+    assert touch.pen_down
+    assert panel.pixel(0, 0) == 0xF800
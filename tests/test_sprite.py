@@ -0,0 +1,111 @@
+"""SpriteSheet frames drawn from precomputed opaque runs."""
+import sys
+from struct import pack
+
+import pytest
+from machine import Pin, SPI
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+from image_converter import main
+from sprite import SpriteSheet
+
+FW = 12
+FH = 10
+COLUMNS = 3
+ROWS = 2
+KEY = 0xF81F
+
+
+def atlas():
+    """Return raw atlas pixels; each frame has its own transparent shape."""
+    out = bytearray()
+    for y in range(FH * ROWS):
+        for x in range(FW * COLUMNS):
+            index = y // FH * COLUMNS + x // FW
+            fx, fy = x % FW, y % FH
+            if (fx * (index + 1) + fy * 3) % (index + 4) == 0 or \
+                    fx == FW - 1 - index:
+                c = KEY
+            else:
+                c = (index * 0x1111 + fx * 97 + fy * 1031) & 0xFFFF
+                c = c if c != KEY else 0
+            out += pack('>H', c)
+    return out
+
+
+@pytest.fixture(params=['raw', 'rle'])
+def path(request, tmp_path, monkeypatch):
+    raw = tmp_path / 'sheet.raw'
+    raw.write_bytes(atlas())
+    if request.param == 'raw':
+        return str(raw)
+    rle = tmp_path / 'sheet.rle'
+    monkeypatch.setattr(sys, 'argv', [
+        'image_converter.py', str(raw), str(rle), '--rle',
+        '--raw', '%dx%d' % (FW * COLUMNS, FH * ROWS)])
+    main()
+    return str(rle)
+
+
+@pytest.fixture
+def rig():
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    return panel, display
+
+
+def drawn(panel, display, draw, x, y):
+    """Return the pixels around x, y after draw() on a gray background."""
+    display.fill_rectangle(x - 2, y - 2, FW + 4, FH + 4, 0x0841)
+    draw()
+    display.show()  # Does nothing unless buffered
+    return [panel.pixel(px, py)
+            for py in range(max(y - 2, 0), min(y + FH + 2, 320))
+            for px in range(max(x - 2, 0), min(x + FW + 2, 240))]
+
+
+def check(panel, display, sheet, index, x, y, flip_h=False, flip_v=False):
+    """Assert sheet.draw gives the same pixels as draw_sprite."""
+    got = drawn(panel, display, lambda: sheet.draw(
+        display, index, x, y, flip_h, flip_v), x, y)
+    frame = bytes(sheet.frame(index, flip_h, flip_v))
+    want = drawn(panel, display, lambda: display.draw_sprite(
+        frame, x, y, FW, FH, sheet.key), x, y)
+    assert got == want
+
+
+@pytest.mark.parametrize('flip_h, flip_v', [
+    (False, False), (True, False), (False, True), (True, True)])
+def test_runs_match_draw_sprite(rig, path, flip_h, flip_v):
+    panel, display = rig
+    sheet = SpriteSheet(path, FW, FH, FW * COLUMNS, key=KEY)
+    assert sheet.count == COLUMNS * ROWS
+    for index in range(sheet.count):
+        for x, y in ((100, 100), (-5, 50), (234, 50), (50, -4), (50, 315),
+                     (-7, -6), (235, 314)):
+            check(panel, display, sheet, index, x, y, flip_h, flip_v)
+
+
+def test_runs_send_only_opaque_pixels(rig, path):
+    panel, display = rig
+    sheet = SpriteSheet(path, FW, FH, FW * COLUMNS, key=KEY)
+    for index in range(sheet.count):
+        runs = sheet.runs[index]
+        opaque = sum(runs[i] for i in range(2, len(runs), 3))
+        assert opaque < FW * FH
+        panel.reset_counters()
+        sheet.draw(display, index, 20, 20)
+        assert panel.pixels_written == opaque
+
+
+@pytest.mark.parametrize('buffered', [False, True])
+@pytest.mark.parametrize('key', [None, KEY])
+def test_opaque_and_buffered_frames_match(rig, path, key, buffered):
+    panel, display = rig
+    if buffered:
+        display.framebuffer()
+    sheet = SpriteSheet(path, FW, FH, FW * COLUMNS, key=key)
+    check(panel, display, sheet, 5, -3, 312, flip_h=True)
+    check(panel, display, sheet, 2, 60, 60, flip_v=True)
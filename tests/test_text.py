@@ -0,0 +1,39 @@
+"""Text drawn as composed strips."""
+import pytest
+from machine import Pin, SPI
+from font import Font
+from font_converter import build
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+
+
+def setup():
+    spi = SPI(1)
+    panel = Ili9341Sim(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(spi, cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    return panel, display
+
+
+def block_font():
+    """Return a font of solid 6x8 blocks for 'A' and 'C' ('B' missing)."""
+    return Font(build(8, {65: [[255] * 6] * 8, 67: [[255] * 6] * 8}, 1))
+
+
+@pytest.mark.parametrize('text', ['ABA', 'A\u00e9A'])  # Missing, out of range
+def test_text_stops_quietly_at_a_missing_letter(capsys, text):
+    panel, display = setup()
+    display.draw_text(0, 0, text, block_font(), 0xF800, 0x001F)
+    assert capsys.readouterr().out == ''
+    assert panel.pixel(0, 0) == panel.pixel(5, 7) == 0xF800
+    assert panel.pixel(6, 0) == 0x001F  # Spacing after the first letter
+    assert panel.pixel(7, 0) == 0
+
+
+def test_text_stops_quietly_off_the_display(capsys):
+    panel, display = setup()
+    display.draw_text(230, 0, 'AAAA', block_font(), 0xF800, 0x001F)
+    assert capsys.readouterr().out == ''
+    assert panel.pixel(230, 0) == 0xF800
+    assert panel.pixel(236, 0) == 0x001F
+    assert panel.pixel(239, 7) == 0xF800  # Second letter is clipped
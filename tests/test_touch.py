@@ -0,0 +1,197 @@
+"""Touch coordinate mapping against the simulated panel."""
+import pytest
+from machine import Pin, SPI
+from ili9341 import Display
+from ili9341_sim import Ili9341Sim
+import xpt2046
+from xpt2046 import Touch
+from xpt2046_sim import Xpt2046Sim
+
+X_MIN, X_MAX, Y_MIN, Y_MAX = 100, 1962, 100, 1900
+
+# (width, height, rotation) as the apps pass them to Display and Touch
+APP_SETUPS = [
+    (240, 320, 0),  # tetris, touch_calibrate
+    (320, 240, 90),  # paint, display_test2
+    (240, 320, 180),
+    (320, 240, 270),  # display_test
+]
+
+
+def raw_reading(panel, x, y):
+    """Raw X/Y a press on logical pixel x, y reads with the default range."""
+    gx, gy = panel._physical(x, y)
+    # Rotation 0 (MADCTL MY) puts native row 0 at the bottom of GRAM
+    nx = gx + .5
+    ny = Ili9341Sim.HEIGHT - 1 - gy + .5
+    return (int(X_MIN + nx * (X_MAX - X_MIN) / Ili9341Sim.WIDTH),
+            int(Y_MIN + ny * (Y_MAX - Y_MIN) / Ili9341Sim.HEIGHT))
+
+
+@pytest.mark.parametrize('mirror', [False, True])
+@pytest.mark.parametrize('width, height, rotation', APP_SETUPS)
+def test_raw_corners_map_to_logical_corners(width, height, rotation, mirror):
+    panel = Ili9341Sim(SPI(1), cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(SPI(1), cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=width, height=height, rotation=rotation,
+                      mirror=mirror)
+    touch = Touch(SPI(2), cs=Pin(33), width=display.width,
+                  height=display.height, rotation=rotation, mirror=mirror,
+                  x_min=X_MIN, x_max=X_MAX, y_min=Y_MIN, y_max=Y_MAX)
+    corners = [(0, 0), (width - 1, 0), (0, height - 1),
+               (width - 1, height - 1)]
+    for x, y in corners:
+        assert touch.normalize(*raw_reading(panel, x, y)) == (x, y)
+
+
+@pytest.mark.parametrize('rotation', [0, 90, 180, 270])
+@pytest.mark.parametrize('width, height', [(240, 320), (320, 240)])
+def test_extents_are_taken_as_given(width, height, rotation):
+    touch = Touch(SPI(2), cs=Pin(33), width=width, height=height,
+                  rotation=rotation)
+    points = set(touch.normalize(x, y) for x in (X_MIN, X_MAX)
+                 for y in (Y_MIN, Y_MAX))
+    assert points == {(0, 0), (width - 1, 0), (0, height - 1),
+                      (width - 1, height - 1)}
+
+
+@pytest.mark.parametrize('irq', [False, True])
+def test_first_press_after_calibration_is_an_event(monkeypatch, irq):
+    panel = Ili9341Sim(SPI(1), cs=Pin(15), dc=Pin(2), rst=Pin(0))
+    display = Display(SPI(1), cs=Pin(15), dc=Pin(2), rst=Pin(0),
+                      width=240, height=320)
+    pen = Xpt2046Sim(SPI(2), cs=Pin(33), irq=Pin(36))
+    touches = []
+    touch = Touch(SPI(2), cs=Pin(33), int_pin=Pin(36) if irq else None,
+                  int_handler=lambda x, y: touches.append((x, y)))
+    crosshair = touch._crosshair
+
+    def pressing_crosshair(display, x, y, color, size=8):
+        crosshair(display, x, y, color, size)
+        if color:  # Target shown: touch it
+            pen.press(*raw_reading(panel, x, y))
+
+    clock = [xpt2046.ticks_ms()]
+
+    def lifting_sleep(seconds):
+        clock[0] += 1000  # The pen lifts a while later
+        pen.release()
+
+    monkeypatch.setattr(touch, '_crosshair', pressing_crosshair)
+    monkeypatch.setattr(xpt2046, 'sleep', lifting_sleep)
+    monkeypatch.setattr(xpt2046, 'ticks_ms', lambda: clock[0])
+    touch.calibrate(display)
+    assert pen.state is None
+    assert not touch.pen_down
+    assert touch.get_event() is None
+    del touches[:]
+    clock[0] += 1000
+    pen.press(*raw_reading(panel, 60, 200))
+    if not irq:
+        touch.poll()
+    event = touch.get_event()
+    assert event is not None and event[2] > 0  # Pen down
+    assert abs(event[0] - 60) <= 1 and abs(event[1] - 200) <= 1
+    assert len(touches) == (1 if irq else 0)
+
+
+@pytest.fixture
+def pen_irq(monkeypatch):
+    """Touch on its interrupt pin, with a clock the test advances."""
+    pen = Xpt2046Sim(SPI(2), cs=Pin(33), irq=Pin(36))
+    clock = [xpt2046.ticks_ms()]
+    monkeypatch.setattr(xpt2046, 'ticks_ms', lambda: clock[0])
+    touches = []
+    touch = Touch(SPI(2), cs=Pin(33), int_pin=Pin(36), queue_size=4,
+                  int_handler=lambda x, y: touches.append((x, y)))
+
+    def tap(x, y, wait=100):
+        clock[0] += wait
+        pen.press(x, y)
+        clock[0] += 20
+        pen.release()
+
+    return pen, touch, touches, clock, tap
+
+
+def test_press_and_release_queue_events(pen_irq):
+    pen, touch, touches, clock, tap = pen_irq
+    pen.press(1000, 1000)
+    assert touch.pen_down
+    assert len(touches) == 1
+    x, y = touches[0]
+    pen.press(1200, 1000)  # Moving sends no edge
+    pen.release()
+    assert not touch.pen_down
+    assert len(touches) == 1  # Only presses call the handler
+    down = touch.get_event()
+    assert down[:2] == (x, y) and down[2] > 0
+    up = touch.get_event()
+    assert up[:3] == (x, y, 0)  # Pen up at the last position
+    assert touch.get_event() is None
+
+
+def test_bounce_after_a_press_is_ignored(pen_irq):
+    pen, touch, touches, clock, tap = pen_irq
+    tap(1000, 1000)
+    clock[0] += touch.debounce_ms - 30  # Within debounce of the press
+    pen.press(1000, 1000)
+    assert not touch.pen_down
+    assert len(touches) == 1
+    pen.release()  # No press to end
+    clock[0] += 30
+    pen.press(1000, 1000)
+    assert touch.pen_down
+    assert len(touches) == 2
+    events = [touch.get_event()[2] > 0 for _ in range(3)]
+    assert events == [True, False, True]
+
+
+def test_edges_wait_for_a_pending_sample(pen_irq, monkeypatch):
+    pen, touch, touches, clock, tap = pen_irq
+    scheduled = []
+
+    def schedule(func, arg):
+        scheduled.append((func, arg))
+
+    monkeypatch.setattr(xpt2046, 'schedule', schedule)
+    pen.press(1000, 1000)
+    assert len(scheduled) == 1 and touch._sample_pending
+    clock[0] += 100
+    pen.release()
+    pen.press(1000, 1000)
+    assert len(scheduled) == 1  # One sample covers the burst of edges
+    func, arg = scheduled.pop()
+    func(arg)
+    assert not touch._sample_pending
+    assert touch.pen_down and len(touches) == 1
+
+
+def test_full_schedule_queue_drops_the_press(pen_irq, monkeypatch):
+    pen, touch, touches, clock, tap = pen_irq
+
+    def schedule(func, arg):
+        raise RuntimeError('schedule queue full')
+
+    monkeypatch.setattr(xpt2046, 'schedule', schedule)
+    pen.press(1000, 1000)
+    assert not touch._sample_pending
+    assert touch.get_event() is None
+    # Once the queue has room the next edge is sampled again
+    monkeypatch.setattr(xpt2046, 'schedule', lambda func, arg: func(arg))
+    pen.release()
+    clock[0] += 100
+    pen.press(1000, 1000)
+    assert touch.pen_down
+
+
+def test_full_ring_drops_the_oldest_events(pen_irq):
+    pen, touch, touches, clock, tap = pen_irq
+    for x in (500, 1000, 1500):
+        tap(x, 1000)
+    xs = [touch.normalize(x, 1000)[0] for x in (1000, 1500)]
+    events = [touch.get_event() for _ in range(4)]
+    assert [(e[0], e[2] > 0) for e in events] == [
+        (xs[0], True), (xs[0], False), (xs[1], True), (xs[1], False)]
+    assert events == sorted(events, key=lambda e: e[3])
+    assert touch.get_event() is None
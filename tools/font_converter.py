@@ -0,0 +1,198 @@
+"""Convert BDF or TrueType fonts for drivers/font.py (runs on CPython).
+
+BDF fonts are read directly; TrueType/OpenType fonts are rendered with
+Pillow (pip install pillow), which is only imported when needed.
+
+    python3 tools/font_converter.py unifont.bdf unifont.fnt
+    python3 tools/font_converter.py DejaVuSans.ttf dejavu16.fnt \\
+        --size 16 --bpp 4
+    python3 tools/font_converter.py DejaVuSans.ttf dejavu16.py --size 16
+
+Writing a .py file produces a module with the font as a FONT bytes
+constant, which can be frozen into the firmware and passed to
+Font(FONT) so the glyphs are read from flash instead of a file.
+See drivers/font.py for the file layout.
+"""
+from argparse import ArgumentParser
+from struct import pack
+import sys
+
+MAGIC = b'TFNT'
+VERSION = 1
+
+
+def read_bdf(path, first, last):
+    """Read a BDF font.
+
+    Args:
+        path (string): BDF file.
+        first, last (int): Range of character codes to keep.
+    Returns:
+        (height, glyphs) where glyphs maps a character code to a list of
+        rows of 0-255 coverage values, one per pixel.
+    """
+    ascent = descent = None
+    box = None
+    glyphs = {}
+    code = advance = bbx = None
+    bitmap = None
+    with open(path, encoding='latin-1') as f:
+        for line in f:
+            words = line.split()
+            if not words:
+                continue
+            key = words[0]
+            if bitmap is not None:
+                if key == 'ENDCHAR':
+                    if first <= code <= last:
+                        glyphs[code] = (advance, bbx, bitmap)
+                    bitmap = None
+                else:
+                    bitmap.append((int(words[0], 16), len(words[0]) * 4))
+            elif key == 'FONTBOUNDINGBOX':
+                box = [int(v) for v in words[1:5]]
+            elif key == 'FONT_ASCENT':
+                ascent = int(words[1])
+            elif key == 'FONT_DESCENT':
+                descent = int(words[1])
+            elif key == 'ENCODING':
+                code = int(words[1])
+            elif key == 'DWIDTH':
+                advance = int(words[1])
+            elif key == 'BBX':
+                bbx = [int(v) for v in words[1:5]]
+            elif key == 'BITMAP':
+                bitmap = []
+    if ascent is None or descent is None:
+        if box is None:
+            raise ValueError('BDF font has no FONTBOUNDINGBOX.')
+        ascent, descent = box[1] + box[3], -box[3]
+    height = ascent + descent
+    cells = {}
+    for code, (advance, (bw, bh, bx, by), bitmap) in glyphs.items():
+        width = max(advance or 0, bx + bw)
+        rows = [[0] * width for _ in range(height)]
+        top = ascent - (by + bh)
+        for r, (bits, row_bits) in enumerate(bitmap):
+            y = top + r
+            if not 0 <= y < height:
+                continue
+            for c in range(bw):
+                x = bx + c
+                if 0 <= x < width and bits >> (row_bits - 1 - c) & 1:
+                    rows[y][x] = 255
+        cells[code] = rows
+    return height, cells
+
+
+def read_truetype(path, size, first, last):
+    """Render a TrueType/OpenType font with Pillow.
+
+    Args:
+        path (string): Font file.
+        size (int): Font size in pixels.
+        first, last (int): Range of character codes to keep.
+    Returns:
+        (height, glyphs) as read_bdf.
+    """
+    try:
+        from PIL import Image, ImageDraw, ImageFont
+    except ImportError:
+        sys.exit('Pillow is required for TrueType fonts: pip install pillow')
+    font = ImageFont.truetype(path, size)
+    ascent, descent = font.getmetrics()
+    height = ascent + descent
+    cells = {}
+    for code in range(first, last + 1):
+        char = chr(code)
+        if code != 32 and not font.getmask(char).getbbox():
+            continue  # Not in the font
+        width = max(int(round(font.getlength(char))), 1)
+        image = Image.new('L', (width, height), 0)
+        ImageDraw.Draw(image).text((0, 0), char, fill=255, font=font)
+        pixels = list(image.getdata())
+        cells[code] = [pixels[y * width:(y + 1) * width]
+                       for y in range(height)]
+    return height, cells
+
+
+def pack_glyph(rows, bpp):
+    """Pack coverage rows into bytes, leftmost pixel in the high bits."""
+    levels = (1 << bpp) - 1
+    data = bytearray()
+    for row in rows:
+        bits = 0
+        count = 0
+        for value in row:
+            bits = (bits << bpp) | ((value * levels + 127) // 255)
+            count += bpp
+            if count == 8:
+                data.append(bits)
+                bits = count = 0
+        if count:
+            data.append(bits << (8 - count))
+    return data
+
+
+def build(height, cells, bpp):
+    """Return the font file contents for the given glyphs."""
+    if not cells:
+        raise ValueError('No glyphs in the selected range.')
+    if height > 255:
+        raise ValueError('Fonts taller than 255 pixels are not supported.')
+    first = min(cells)
+    count = max(cells) - first + 1
+    index = bytearray()
+    data = bytearray()
+    for code in range(first, first + count):
+        rows = cells.get(code)
+        width = len(rows[0]) if rows else 0
+        if width > 255:
+            raise ValueError('Glyph %d is wider than 255 pixels.' % code)
+        if not width:
+            index += pack('<I', 0)
+            continue
+        index += pack('<I', len(data) | (width << 24))
+        data += pack_glyph(rows, bpp)
+    if len(data) >= 1 << 24:
+        raise ValueError('Glyph data exceeds 16 MB.')
+    header = pack('<4sBBBxHH', MAGIC, VERSION, bpp, height, first, count)
+    return header + index + data
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('source', help='BDF, TTF or OTF font')
+    parser.add_argument('output', help='.fnt file, or .py for a module')
+    parser.add_argument('--bpp', type=int, choices=(1, 4), default=1,
+                        help='bits per pixel, 4 for anti-aliasing')
+    parser.add_argument('--size', type=int, default=16,
+                        help='pixel size of TrueType fonts')
+    parser.add_argument('--first', type=int, default=32,
+                        help='first character code (default 32)')
+    parser.add_argument('--last', type=int, default=126,
+                        help='last character code (default 126)')
+    args = parser.parse_args()
+    if args.source.lower().endswith('.bdf'):
+        height, cells = read_bdf(args.source, args.first, args.last)
+    else:
+        height, cells = read_truetype(args.source, args.size, args.first,
+                                      args.last)
+    font = build(height, cells, args.bpp)
+    if args.output.endswith('.py'):
+        with open(args.output, 'w') as f:
+            f.write('# Generated by tools/font_converter.py from %s\n' %
+                    args.source.replace('\\', '/').split('/')[-1])
+            f.write('FONT = (\n')
+            for i in range(0, len(font), 32):
+                f.write('    %r\n' % bytes(font[i:i + 32]))
+            f.write(')\n')
+    else:
+        with open(args.output, 'wb') as f:
+            f.write(font)
+    print('%s: %d glyphs, %d pixels high, %d bpp, %d bytes' % (
+        args.output, len(cells), height, args.bpp, len(font)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Convert images for Display.draw_image (runs on CPython).
+
+Images are read with Pillow (pip install pillow) and written as raw
+RGB565 pixels, high byte first, or with --rle as a run-length
+compressed file that draw_image decodes while streaming.  Existing raw
+RGB565 files can be compressed without Pillow by giving their size:
+
+    python3 tools/image_converter.py photo.png photo.raw
+    python3 tools/image_converter.py logo.png logo.rle --rle --size 120x80
+    python3 tools/image_converter.py old.raw old.rle --rle --raw 320x240
+
+Colors are packed like ili9341.color565 (red and blue swapped for the
+panel's BGR order); pass --rgb for panels set up in RGB order.
+
+RLE files start with b'R565' and the width and height ('<4sHH').  Then
+come packets of a control byte n followed by one pixel repeated
+(n & 0x7F) + 1 times when bit 7 is set, or by n + 1 literal pixels.
+Packets run on across rows.
+"""
+from argparse import ArgumentParser
+from struct import pack
+import sys
+
+RLE_MAGIC = b'R565'
+
+
+def load_image(path, size, rgb):
+    """Read an image with Pillow and return (width, height, pixels).
+
+    Args:
+        path (string): Image file.
+        size (tuple): (width, height) to resize to, or None.
+        rgb (bool): Pack red in the high bits instead of blue.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        sys.exit('Pillow is required to read images: pip install pillow')
+    image = Image.open(path).convert('RGB')
+    if size:
+        image = image.resize(size)
+    w, h = image.size
+    pixels = bytearray()
+    for r, g, b in image.getdata():
+        if rgb:
+            c = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+        else:
+            c = ((b & 0xF8) << 8) | ((g & 0xFC) << 3) | (r >> 3)
+        pixels += pack('>H', c)
+    return w, h, pixels
+
+
+def encode_rle(w, h, pixels):
+    """Return the RLE file contents for raw RGB565 pixels."""
+    out = bytearray(pack('<4sHH', RLE_MAGIC, w, h))
+    count = len(pixels) // 2
+    literal = []  # Start offsets of pending literal pixels
+
+    def flush_literal():
+        while literal:
+            n = min(len(literal), 128)
+            out.append(n - 1)
+            for i in literal[:n]:
+                out.extend(pixels[i:i + 2])
+            del literal[:n]
+
+    i = 0
+    while i < count:
+        p = pixels[i * 2:i * 2 + 2]
+        run = 1
+        while i + run < count and run < 128 and \
+                pixels[(i + run) * 2:(i + run) * 2 + 2] == p:
+            run += 1
+        if run > 1:
+            flush_literal()
+            out.append(0x80 | (run - 1))
+            out += p
+        else:
+            literal.append(i * 2)
+        i += run
+    flush_literal()
+    return out
+
+
+def parse_size(text):
+    """Parse WxH into a (width, height) tuple."""
+    w, _, h = text.lower().partition('x')
+    return int(w), int(h)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('source', help='image, or raw RGB565 with --raw')
+    parser.add_argument('output', help='raw or RLE file for draw_image')
+    parser.add_argument('--rle', action='store_true',
+                        help='write a run-length compressed file')
+    parser.add_argument('--size', type=parse_size,
+                        help='resize to WxH (Pillow images only)')
+    parser.add_argument('--raw', type=parse_size, metavar='WxH',
+                        help='source is a raw RGB565 file of this size')
+    parser.add_argument('--rgb', action='store_true',
+                        help='RGB instead of BGR pixel order')
+    args = parser.parse_args()
+    if args.raw:
+        w, h = args.raw
+        with open(args.source, 'rb') as f:
+            pixels = f.read()
+        if len(pixels) != w * h * 2:
+            sys.exit('%s is %d bytes, expected %d for %dx%d' % (
+                args.source, len(pixels), w * h * 2, w, h))
+    else:
+        w, h, pixels = load_image(args.source, args.size, args.rgb)
+    data = encode_rle(w, h, pixels) if args.rle else pixels
+    with open(args.output, 'wb') as f:
+        f.write(data)
+    print('%s: %dx%d, %d bytes (raw %d)' % (args.output, w, h, len(data),
+                                            w * h * 2))
+
+
+if __name__ == '__main__':
+    main()